@@ -1,8 +1,17 @@
 from models import db, Attendance, Employee
-from flask_restful import Resource, reqparse
+from flask_restful import Resource, reqparse, inputs
 from flask import request, jsonify
 from datetime import date, datetime, timedelta
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from calendar import monthrange
+from sqlalchemy import func
+from flask_jwt_extended import get_jwt_identity
+from Services.authz import role_required
+from Services.pagination import list_parser, paginate, page_headers, iso_date
+from Services.upsert import insert_ignore
+from Services.attendance_rollup import attendance_rollup, MAX_ROLLUP_DAYS
+
+# Punches closer together than this are treated as a repeated clock-in
+PUNCH_DEBOUNCE_SECONDS = 60
 
 class AttendanceResource(Resource):
     """
@@ -10,91 +19,107 @@ class AttendanceResource(Resource):
     Provides methods for clock-in, clock-out, and retrieving attendance records.
     """
     
-    @jwt_required()
+    @role_required()
     def get(self, id=None):
         """
-        Retrieve attendance records.
-        If no ID is provided, returns all records.
+        Retrieve attendance records, one page at a time.
+        If no ID is provided, returns records for all employees.
         If an ID is provided, returns records for that specific employee.
+        Supports limit, after, employee_id, department_id, from and to query parameters.
         """
         current_user_id = get_jwt_identity()
+        args = list_parser().parse_args()
         
         if id is None:
             # Fetch all attendance records (might want to restrict this to admin only)
-            attendances = Attendance.query.all()
-            return [attendance.to_dict() for attendance in attendances], 200
+            attendances, next_cursor = paginate(
+                Attendance.query, Attendance, Attendance.attendance_id, Attendance.date, args
+            )
+            return [attendance.to_dict() for attendance in attendances], 200, page_headers(next_cursor)
         
         # Fetch attendance records for a specific employee
-        attendances = Attendance.query.filter_by(employee_id=id).all()
+        args['employee_id'] = id
+        attendances, next_cursor = paginate(
+            Attendance.query, Attendance, Attendance.attendance_id, Attendance.date, args
+        )
         if attendances:
-            return [attendance.to_dict() for attendance in attendances], 200
+            return [attendance.to_dict() for attendance in attendances], 200, page_headers(next_cursor)
         
         return {'message': 'No attendance records found'}, 404
 
-    @jwt_required()
+    @role_required()
     def post(self):
         """
         Handle clock-in and clock-out operations.
-        Automatically determines whether it's a clock-in or clock-out based on existing records.
+        Clock-in is an INSERT that is skipped if today's record already
+        exists, and clock-out is a conditional UPDATE, so concurrent punches
+        never create duplicate rows or read-then-write races.
         """
         current_user_id = get_jwt_identity()
         
         try:
-            # Check if there's an existing attendance record for today
             today = date.today()
-            existing_attendance = Attendance.query.filter_by(
-                employee_id=current_user_id, 
-                date=today
-            ).first()
-            
+            now = datetime.now().replace(microsecond=0)
             # Current time for clock-in/out
-            current_time = datetime.now().strftime('%H:%M:%S')
+            current_time = now.time()
             
-            if not existing_attendance:
-                # Clock-in operation
-                new_attendance = Attendance(
-                    employee_id=current_user_id,
-                    date=today,
-                    clock_in_time=current_time,
-                    clock_out_time=None,  # Use None instead of empty string
-                    status='Present'
-                )
-                db.session.add(new_attendance)
+            # Clock-in operation: does nothing if a record for today exists
+            clock_in = insert_ignore(
+                Attendance.__table__, ['employee_id', 'date']
+            ).values(
+                employee_id=current_user_id,
+                date=today,
+                clock_in_time=current_time,
+                clock_out_time=None,
+                status='Present'
+            )
+            if db.session.execute(clock_in).rowcount:
                 db.session.commit()
+                new_attendance = Attendance.query.filter_by(employee_id=current_user_id, date=today).first()
                 return {
                     'message': 'Clocked in successfully', 
                     'attendance': new_attendance.to_dict()
                 }, 201
             
-            elif existing_attendance.clock_out_time is None:
-                # Clock-out operation
-                # Calculate total work hours
-                clock_in_time = datetime.strptime(existing_attendance.clock_in_time, '%H:%M:%S')
-                clock_out_time = datetime.now()
-                
-                # Calculate work duration
-                work_duration = clock_out_time - datetime.combine(today, clock_in_time.time())
-                
-                # Update attendance record
-                existing_attendance.clock_out_time = current_time
-                existing_attendance.status = 'Completed'
-                
-                # Optional: You might want to add work hours to the model
-                # This would require adding a new column to the Attendance model
-                # existing_attendance.work_hours = work_duration.total_seconds() / 3600  # Convert to hours
-                
+            # Clock-out operation: only applies to an open record whose clock-in
+            # is older than the debounce window, so a double punch is not a clock-out
+            debounce_cutoff = max(now - timedelta(seconds=PUNCH_DEBOUNCE_SECONDS),
+                                  datetime.combine(today, datetime.min.time()))
+            clock_out = db.update(Attendance).where(
+                Attendance.employee_id == current_user_id,
+                Attendance.date == today,
+                Attendance.clock_out_time.is_(None),
+                Attendance.clock_in_time <= debounce_cutoff.time()
+            ).values(clock_out_time=current_time, status='Completed')
+            clocked_out = db.session.execute(clock_out).rowcount
+            
+            existing_attendance = Attendance.query.filter_by(employee_id=current_user_id, date=today).first()
+            
+            if clocked_out:
+                # Calculate and store total work hours in the same transaction
+                work_duration = now - datetime.combine(today, existing_attendance.clock_in_time)
+                existing_attendance.work_hours = round(work_duration.total_seconds() / 3600, 4)
                 db.session.commit()
+                
                 return {
                     'message': 'Clocked out successfully', 
                     'attendance': existing_attendance.to_dict(),
                     'work_duration': str(work_duration)  # Return work duration to frontend
                 }, 200
             
-            else:
-                # Already clocked out for the day
+            db.session.commit()
+            
+            if existing_attendance.clock_out_time is None:
+                # Repeated clock-in within the debounce window
                 return {
-                    'message': 'You have already clocked in and out for today'
-                }, 400
+                    'message': 'Already clocked in',
+                    'attendance': existing_attendance.to_dict()
+                }, 200
+            
+            # Already clocked out for the day
+            return {
+                'message': 'You have already clocked in and out for today'
+            }, 400
         
         except Exception as e:
             db.session.rollback()
@@ -107,27 +132,95 @@ class AttendanceSummaryResource(Resource):
     """
     Resource for retrieving attendance summaries.
     """
-    @jwt_required()
+    parser = reqparse.RequestParser()
+    parser.add_argument('month', type=str, location='args', help='Month in format YYYY-MM')
+    parser.add_argument('from', type=iso_date, location='args', help='From date must be in format YYYY-MM-DD')
+    parser.add_argument('to', type=iso_date, location='args', help='To date must be in format YYYY-MM-DD')
+    parser.add_argument('include_records', type=inputs.boolean, location='args', default=True,
+                        help='include_records must be true or false')
+
+    @role_required()
     def get(self):
         """
         Get attendance summary for the current user.
+        Defaults to the current month; accepts month=YYYY-MM or a from/to range.
+        Totals are counted in SQL over a date range on the (employee_id, date) index.
         """
         current_user_id = get_jwt_identity()
+        data = self.parser.parse_args()
         
-        # Get attendance records for the current month
-        current_month = datetime.now().month
-        current_year = datetime.now().year
+        # Work out the date range to summarise
+        if data['from'] or data['to']:
+            if not (data['from'] and data['to']):
+                return {'message': 'Provide both from and to dates'}, 400
+            start_date, end_date = data['from'], data['to']
+            if end_date < start_date:
+                return {'message': 'End date cannot be before start date'}, 400
+        else:
+            try:
+                month_start = datetime.strptime(data['month'], '%Y-%m').date() if data['month'] \
+                    else date.today().replace(day=1)
+            except ValueError:
+                return {'message': 'Month must be in format YYYY-MM'}, 400
+            start_date = month_start
+            end_date = month_start.replace(day=monthrange(month_start.year, month_start.month)[1])
         
-        monthly_attendance = Attendance.query.filter(
+        in_range = (
             Attendance.employee_id == current_user_id,
-            db.extract('month', Attendance.date) == current_month,
-            db.extract('year', Attendance.date) == current_year
-        ).all()
+            Attendance.date >= start_date,
+            Attendance.date <= end_date
+        )
+        
+        totals = db.session.query(
+            Attendance.status, func.count(Attendance.attendance_id), func.sum(Attendance.work_hours)
+        ).filter(*in_range).group_by(Attendance.status).all()
+        status_counts = {status: count for status, count, _ in totals}
         
         summary = {
-            'total_days': len(monthly_attendance),
-            'present_days': len([a for a in monthly_attendance if a.status == 'Completed']),
-            'attendance_records': [record.to_dict() for record in monthly_attendance]
+            'from': start_date.isoformat(),
+            'to': end_date.isoformat(),
+            'total_days': sum(status_counts.values()),
+            'present_days': status_counts.get('Completed', 0),
+            'total_hours': round(sum(hours or 0.0 for _, _, hours in totals), 2),
+            'status_counts': status_counts
         }
+        if data['include_records']:
+            summary['attendance_records'] = [
+                record.to_dict()
+                for record in Attendance.query.filter(*in_range).order_by(Attendance.date)
+            ]
+        
+        return summary, 200
+
+
+class AttendanceRollupResource(Resource):
+    """
+    Resource for daily present/late/on leave/absent counts per department.
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('department_id', type=int, location='args', help='Department ID must be an integer')
+    parser.add_argument('from', type=iso_date, location='args', help='From date must be in format YYYY-MM-DD')
+    parser.add_argument('to', type=iso_date, location='args', help='To date must be in format YYYY-MM-DD')
+
+    @role_required('admin', 'hr', 'manager', message='Access denied. Only supervisors can view the attendance rollup')
+    def get(self):
+        """
+        Get one row per department per working day between from and to
+        (default: today). Past days are served from cache after the first request.
+        """
+        data = self.parser.parse_args()
+        
+        start_date = data['from'] or date.today()
+        end_date = data['to'] or start_date
+        if end_date < start_date:
+            return {'message': 'End date cannot be before start date'}, 400
+        if (end_date - start_date).days >= MAX_ROLLUP_DAYS:
+            return {'message': f'Date range cannot be longer than {MAX_ROLLUP_DAYS} days'}, 400
+        
+        days = attendance_rollup(start_date, end_date, data['department_id'])
         
-        return summary, 200
\ No newline at end of file
+        return [
+            {'date': day.isoformat(), 'department_id': department_id, **counts}
+            for day, departments in sorted(days.items())
+            for department_id, counts in sorted(departments.items(), key=lambda item: item[0] or 0)
+        ], 200
@@ -2,9 +2,18 @@ from flask_restful import Resource, reqparse
 from flask import request
 from models import db, User, Employee, Department
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity, get_jwt
-from flask_bcrypt import generate_password_hash, check_password_hash
 import re
+import csv
 from datetime import datetime
+from Services.token_blocklist import token_blocklist
+from Services.password_hashing import password_hasher, HasherBusy
+from Services.authz import role_required
+from Services.payroll_import import parse_csv
+from Services.employee_import import import_employees, MAX_IMPORT_ROWS
+
+
+def busy_response(error):
+    return {'message': 'Server is busy, please try again shortly'}, 503, {'Retry-After': str(error.retry_after)}
 
 class UserResource(Resource):
     """
@@ -44,8 +53,11 @@ class UserResource(Resource):
         if data['password'] != data['confirm_password']:
             return {'message': "Passwords do not match"}, 422
         
-        # Hash the password
-        hashed_password = generate_password_hash(data['password']).decode('utf-8')
+        # Hash the password on the bounded hashing pool
+        try:
+            hashed_password = password_hasher.hash(data['password'])
+        except HasherBusy as e:
+            return busy_response(e)
 
         # Create username from first and last name
         display_name = f"{data['first_name'].capitalize()} {data['last_name'].capitalize()}"
@@ -152,8 +164,22 @@ class LoginResource(Resource):
         if user is None:
             return {"message": "User not found. Please create an account"}, 404
         
-        # Use Bcrypt's check_password_hash instead of comparing directly
-        if check_password_hash(user.password, data['password']):
+        # Check the password on the bounded hashing pool instead of the request thread
+        try:
+            password_ok = password_hasher.verify(user.password, data['password'])
+        except HasherBusy as e:
+            return busy_response(e)
+        
+        if password_ok:
+            # Upgrade the stored hash when the configured bcrypt cost has changed
+            if password_hasher.needs_rehash(user.password):
+                try:
+                    user.password = password_hasher.hash(data['password'])
+                    db.session.commit()
+                except Exception:
+                    # Keep the old hash; the next login tries again
+                    db.session.rollback()
+            
             # Get the employee's position
             employee = Employee.query.filter_by(employee_id=user.employee_id).first()
             
@@ -178,4 +204,64 @@ class LoginResource(Resource):
                 'message': 'Logged in successfully'
             }, 200
         else:
-            return {'message': 'Invalid credentials'}, 401
\ No newline at end of file
+            return {'message': 'Invalid credentials'}, 401
+
+class LogoutResource(Resource):
+    """
+    Logout resource that revokes the token used to call it.
+    """
+
+    @jwt_required()
+    def post(self):
+        jti = get_jwt()['jti']
+        token = request.headers.get('Authorization', '').replace('Bearer ', '', 1) or jti
+
+        try:
+            token_blocklist.revoke(jti, token)
+        except Exception as e:
+            db.session.rollback()
+            return {'message': 'Error logging out', 'error': str(e)}, 500
+
+        return {'message': 'Logged out successfully'}, 200
+
+
+class UserBatchResource(Resource):
+    """
+    Registers many employees with user accounts from a JSON array or a CSV upload.
+    Bad rows are reported individually and do not stop the rest of the batch.
+    """
+
+    @role_required('admin', message='Access denied. Only admins can register employees in bulk')
+    def post(self):
+        # CSV arrives as a multipart upload or a raw text/csv body
+        upload = request.files.get('file')
+        try:
+            if upload is not None:
+                records = parse_csv(upload.read().decode('utf-8-sig'))
+            elif request.mimetype == 'text/csv':
+                records = parse_csv(request.get_data(as_text=True))
+            else:
+                records = request.get_json(silent=True)
+                if isinstance(records, dict):
+                    records = records.get('records')
+        except (UnicodeDecodeError, csv.Error):
+            return {'message': 'Could not read the uploaded CSV file'}, 400
+
+        if not isinstance(records, list) or not records:
+            return {'message': 'Provide a non-empty JSON array of employees or a CSV file'}, 400
+        if len(records) > MAX_IMPORT_ROWS:
+            return {'message': f'A batch can contain at most {MAX_IMPORT_ROWS} employees'}, 400
+
+        try:
+            created, results = import_employees(records)
+        except Exception as e:
+            db.session.rollback()
+            return {'message': 'Error registering employees', 'error': str(e)}, 500
+
+        failed = len(results) - created
+        return {
+            'message': f'{created} employees registered, {failed} failed',
+            'created': created,
+            'failed': failed,
+            'results': results
+        }, 201 if created else 400
@@ -1,20 +1,30 @@
 from flask_restful import Resource, reqparse, inputs
 from models import Employee, Bonus, db
 from flask import request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import get_jwt_identity
+from Services.authz import role_required
+from sqlalchemy.orm import joinedload
+from Services.pagination import list_parser, paginate, page_headers
 from datetime import datetime
+from Services.employee_lookup import resolve_employee_reference, EmployeeLookupError
 
 class BonusResource(Resource):
     parser = reqparse.RequestParser()
     parser.add_argument('bonus_amount', type=float, required=True, help='The bonus amount is required')
-    parser.add_argument('employee_name', type=str, required=True, help='Employee name is required')
+    parser.add_argument('employee_id', type=int, required=False, help='Employee ID must be an integer')
+    parser.add_argument('employee_name', type=str, required=False,
+                        help='Employee name, required when no employee ID is given')
     parser.add_argument('reason', type=str, required=True, help='The reason for the bonus is required')
     # bonus_date will be auto-set to current date
 
-    @jwt_required()
+    @role_required()
     def get(self, id=None):
         if id is None:
-            bonuses = Bonus.query.all()
+            # Load employees in the same query to avoid one SELECT per row
+            bonuses, next_cursor = paginate(
+                Bonus.query.options(joinedload(Bonus.employee)),
+                Bonus, Bonus.bonus_id, Bonus.bonus_date, list_parser().parse_args()
+            )
             return [
                 {
                     **bonus.to_dict(), 
@@ -22,7 +32,7 @@ class BonusResource(Resource):
                     if bonus.employee else None
                 } 
                 for bonus in bonuses
-            ], 200
+            ], 200, page_headers(next_cursor)
         
         bonus = Bonus.query.filter_by(bonus_id=id).first()
         if bonus is None:
@@ -36,7 +46,7 @@ class BonusResource(Resource):
         
         return bonus_dict, 200
 
-    @jwt_required()
+    @role_required()
     def post(self):
         data = self.parser.parse_args()
         
@@ -45,27 +55,17 @@ class BonusResource(Resource):
             if data['bonus_amount'] <= 0:
                 return {'message': 'Bonus amount must be greater than zero'}, 400
 
-            # Get employee by name (search by first and last name)
-            employee_name = data['employee_name']
-            names = employee_name.split()
-            
-            if len(names) < 2:
-                return {'message': 'Please provide both first and last name'}, 400
-                
-            first_name = names[0]
-            last_name = ' '.join(names[1:])  # Handle multi-word last names
-            
-            employee = Employee.query.filter(
-                Employee.first_name == first_name, 
-                Employee.last_name == last_name
-            ).first()
-            
-            if not employee:
-                return {'message': 'Employee not found'}, 404
+            # Resolve the employee by ID, or by name (first and last name) without one
+            try:
+                employee_id, first_name, last_name = resolve_employee_reference(
+                    data['employee_id'], data['employee_name']
+                )
+            except EmployeeLookupError as e:
+                return {'message': e.message}, e.status
             
             # Create bonus with current date
             bonus = Bonus(
-                employee_id=employee.employee_id,  # Assign the employee ID of the found employee
+                employee_id=employee_id,  # Assign the employee ID of the found employee
                 bonus_amount=data['bonus_amount'],
                 bonus_date=datetime.now().date(),  # Automatically set to current date
                 reason=data['reason']
@@ -76,7 +76,7 @@ class BonusResource(Resource):
             
             # Prepare response with employee details
             response = bonus.to_dict()
-            response['employee_name'] = f"{employee.first_name} {employee.last_name}"
+            response['employee_name'] = f"{first_name} {last_name}"
             
             return response, 201
         
@@ -84,7 +84,7 @@ class BonusResource(Resource):
             db.session.rollback()
             return {'message': 'Error creating the bonus', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required()
     def put(self, id):
         # For PUT we'll create a different parser that uses employee_id
         put_parser = reqparse.RequestParser()
@@ -126,7 +126,7 @@ class BonusResource(Resource):
             db.session.rollback()
             return {'message': 'Error updating the bonus', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required()
     def patch(self, id):
         parser = reqparse.RequestParser()
         parser.add_argument('bonus_amount', type=float)
@@ -167,7 +167,7 @@ class BonusResource(Resource):
             db.session.rollback()
             return {'message': 'Error updating the bonus', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required()
     def delete(self, id):
         try:
             bonus = Bonus.query.filter_by(bonus_id=id).first()
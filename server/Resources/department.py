@@ -1,17 +1,21 @@
 from flask_restful import Resource, reqparse, inputs
 from models import Employee, Department, User, db
 from flask import request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import get_jwt_identity
+from Services.authz import role_required
+from sqlalchemy.orm import joinedload
+from Services.department_stats import department_stats
 
 class DepartmentResource(Resource):
     parser = reqparse.RequestParser()
     parser.add_argument('department_name', type=str, required=False, help='Department name')
     parser.add_argument('manager_id', type=int, required=False, help='Manager ID for the department')
 
-    @jwt_required()
+    @role_required()
     def get(self, id=None):
         if id is None:
-            departments = Department.query.all()
+            # Load managers in the same query to avoid one SELECT per row
+            departments = Department.query.options(joinedload(Department.manager)).all()
             return [
                 {
                     **department.to_dict(), 
@@ -33,7 +37,7 @@ class DepartmentResource(Resource):
         
         return dept_dict, 200
 
-    @jwt_required()
+    @role_required()
     def post(self):
         data = self.parser.parse_args()
         
@@ -87,7 +91,7 @@ class DepartmentResource(Resource):
             db.session.rollback()
             return {'message': 'Error creating the department', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required()
     def put(self, id):
         data = self.parser.parse_args()
         
@@ -140,7 +144,7 @@ class DepartmentResource(Resource):
             db.session.rollback()
             return {'message': 'Error updating the department', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required()
     def patch(self, id):
         data = self.parser.parse_args()
         
@@ -197,15 +201,18 @@ class DepartmentResource(Resource):
             db.session.rollback()
             return {'message': 'Error updating the department', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required()
     def delete(self, id):
         try:
             department = Department.query.filter_by(department_id=id).first()
             if not department:
                 return {'message': 'Department not found'}, 404
             
-            # Check if department has any employees
-            if department.employees:
+            # Check if department has any employees without loading them
+            has_employees = db.session.query(
+                Employee.query.filter(Employee.department_id == id).exists()
+            ).scalar()
+            if has_employees:
                 return {'message': 'Cannot delete department with existing employees'}, 400
             
             db.session.delete(department)
@@ -215,4 +222,18 @@ class DepartmentResource(Resource):
         
         except Exception as e:
             db.session.rollback()
-            return {'message': 'Error deleting the department', 'error': str(e)}, 500
\ No newline at end of file
+            return {'message': 'Error deleting the department', 'error': str(e)}, 500
+
+class DepartmentStatsResource(Resource):
+    """
+    Resource for headcount and cost figures per department.
+    """
+
+    @role_required('admin', message='Access denied. Only admins can view department costs')
+    def get(self):
+        """
+        Headcount, total annual salary and the payroll cost of the latest pay
+        period for every department, from SQL aggregates cached until
+        employees or payroll change.
+        """
+        return department_stats(), 200
@@ -0,0 +1,82 @@
+from flask_restful import Resource
+from models import Payroll, Attendance, Tax, Bonus, db
+from flask import Response, stream_with_context
+from Services.authz import role_required
+from Services.pagination import list_parser, apply_filters
+import csv
+import io
+import json
+
+# Rows fetched from the database cursor per batch
+EXPORT_BATCH_SIZE = 1000
+
+# Dataset name -> (model, primary key, date column, from/to converter)
+EXPORT_DATASETS = {
+    'payroll': (Payroll, Payroll.payroll_id, Payroll.pay_date, None),
+    'attendance': (Attendance, Attendance.attendance_id, Attendance.date, None),
+    'tax': (Tax, Tax.tax_id, Tax.year, lambda value: value.year),
+    'bonus': (Bonus, Bonus.bonus_id, Bonus.bonus_date, None),
+}
+
+
+class ExportResource(Resource):
+    """
+    Streams full history of a dataset as NDJSON or CSV.
+    Rows are read through a server-side cursor in fixed size batches and
+    written to the response as they arrive, so memory use does not depend
+    on the size of the export.
+    """
+
+    @role_required('admin', message='Access denied. Only admins can export records')
+    def get(self, dataset):
+        if dataset not in EXPORT_DATASETS:
+            return {'message': f'Unknown export {dataset}',
+                    'available': sorted(EXPORT_DATASETS)}, 404
+
+        parser = list_parser()
+        parser.add_argument('format', type=str, location='args', default='ndjson',
+                            choices=('ndjson', 'csv'), help='Format must be ndjson or csv')
+        args = parser.parse_args()
+
+        model, pk_column, date_column, date_value = EXPORT_DATASETS[dataset]
+        query = apply_filters(db.select(model.__table__), model, date_column, args, date_value)
+        if args['after'] is not None:
+            # Resume an interrupted export after the last primary key received
+            query = query.filter(pk_column > args['after'])
+        query = query.order_by(pk_column).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+        # Result rows expose columns as attributes, so the model's compiled
+        # serializer formats them without building ORM objects
+        serialize = model._compiled_serializer
+
+        def generate_ndjson():
+            result = db.session.execute(query)
+            for batch in result.partitions():
+                yield ''.join(json.dumps(serialize(row)) + '\n' for row in batch)
+
+        def generate_csv():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(serialize.fields)
+            result = db.session.execute(query)
+            for batch in result.partitions():
+                for row in batch:
+                    record = serialize(row)
+                    writer.writerow([record[key] for key in serialize.fields])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+
+        if args['format'] == 'csv':
+            return Response(
+                stream_with_context(generate_csv()),
+                mimetype='text/csv',
+                headers={'Content-Disposition': f'attachment; filename={dataset}.csv'}
+            )
+
+        return Response(
+            stream_with_context(generate_ndjson()),
+            mimetype='application/x-ndjson',
+            headers={'Content-Disposition': f'attachment; filename={dataset}.ndjson'}
+        )
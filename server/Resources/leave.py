@@ -1,22 +1,45 @@
 from flask_restful import Resource, reqparse, inputs
-from models import Employee, Leave, db
+from models import Employee, Leave, LeaveBalance, db
 from flask import request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
+from flask_jwt_extended import get_jwt_identity
+from Services.authz import role_required, current_role
+from sqlalchemy.orm import joinedload
+from Services.pagination import list_parser, paginate, page_headers, iso_date
+from datetime import date, datetime, timedelta
+from Services.employee_lookup import resolve_employee_reference, EmployeeLookupError
+from Services.leave_intervals import find_overlapping_leave, leave_calendar, lock_leave_dates, INACTIVE_STATUSES
+from Services.leave_balance import apply_leave_change, get_balance, snapshot
+
+# Default and longest window for the leave calendar, in days
+CALENDAR_DEFAULT_DAYS = 30
+CALENDAR_MAX_DAYS = 366
+
+
+def overlap_response(conflict):
+    return {
+        'message': 'Leave overlaps an existing leave request',
+        'conflicting_leave': conflict.to_dict()
+    }, 409
 
 class LeaveResource(Resource):
     parser = reqparse.RequestParser()
-    parser.add_argument('employee_name', type=str, required=True, help='Employee name is required')
+    parser.add_argument('employee_id', type=int, required=False, help='Employee ID must be an integer')
+    parser.add_argument('employee_name', type=str, required=False,
+                        help='Employee name, required when no employee ID is given')
     parser.add_argument('leave_type', type=str, required=True, help='Leave type is required')
     parser.add_argument('start_date', type=str, required=True, help='Start date is required')
     parser.add_argument('end_date', type=str, required=True, help='End date is required')
     parser.add_argument('status', type=str, required=False, default='Pending', 
                         help='Status (defaults to Pending if not provided)')
 
-    @jwt_required()
+    @role_required()
     def get(self, id=None):
         if id is None:
-            leaves = Leave.query.all()
+            # Load employees in the same query to avoid one SELECT per row
+            leaves, next_cursor = paginate(
+                Leave.query.options(joinedload(Leave.employee)),
+                Leave, Leave.leave_id, Leave.start_date, list_parser().parse_args()
+            )
             return [
                 {
                     **leave.to_dict(), 
@@ -24,7 +47,7 @@ class LeaveResource(Resource):
                     if leave.employee else None
                 } 
                 for leave in leaves
-            ], 200
+            ], 200, page_headers(next_cursor)
         
         leave = Leave.query.filter_by(leave_id=id).first()
         if leave is None:
@@ -38,7 +61,7 @@ class LeaveResource(Resource):
         
         return leave_dict, 200
 
-    @jwt_required()
+    @role_required()
     def post(self):
         data = self.parser.parse_args()
         
@@ -54,27 +77,26 @@ class LeaveResource(Resource):
             if end_date < start_date:
                 return {'message': 'End date cannot be before start date'}, 400
 
-            # Get employee by name (search by first and last name)
-            employee_name = data['employee_name']
-            names = employee_name.split()
-            
-            if len(names) < 2:
-                return {'message': 'Please provide both first and last name'}, 400
-                
-            first_name = names[0]
-            last_name = ' '.join(names[1:])  # Handle multi-word last names
+            # Resolve the employee by ID, or by name (first and last name) without one
+            try:
+                employee_id, first_name, last_name = resolve_employee_reference(
+                    data['employee_id'], data['employee_name']
+                )
+            except EmployeeLookupError as e:
+                return {'message': e.message}, e.status
             
-            employee = Employee.query.filter(
-                Employee.first_name == first_name, 
-                Employee.last_name == last_name
-            ).first()
-            
-            if not employee:
-                return {'message': 'Employee not found'}, 404
+            # Reject ranges that overlap another active leave of this employee,
+            # holding the lock until the insert commits
+            if data['status'] not in INACTIVE_STATUSES:
+                lock_leave_dates(employee_id)
+                conflict = find_overlapping_leave(employee_id, start_date, end_date)
+                if conflict:
+                    db.session.rollback()
+                    return overlap_response(conflict)
             
             # Create leave request with current date as application date
             leave = Leave(
-                employee_id=employee.employee_id,
+                employee_id=employee_id,
                 leave_type=data['leave_type'],
                 application_date=datetime.now().date(),  # Automatically set to current date
                 start_date=start_date,
@@ -83,11 +105,12 @@ class LeaveResource(Resource):
             )
             
             db.session.add(leave)
+            apply_leave_change(None, snapshot(leave))
             db.session.commit()
             
             # Prepare response with employee details
             response = leave.to_dict()
-            response['employee_name'] = f"{employee.first_name} {employee.last_name}"
+            response['employee_name'] = f"{first_name} {last_name}"
             
             return response, 201
         
@@ -95,7 +118,7 @@ class LeaveResource(Resource):
             db.session.rollback()
             return {'message': 'Error creating the leave request', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required()
     def put(self, id):
         # For PUT we'll create a different parser that uses employee_id
         put_parser = reqparse.RequestParser()
@@ -111,6 +134,7 @@ class LeaveResource(Resource):
             leave = Leave.query.filter_by(leave_id=id).first()
             if not leave:
                 return {'message': 'Leave request not found'}, 404
+            before = snapshot(leave)
 
             # Parse dates
             try:
@@ -128,6 +152,15 @@ class LeaveResource(Resource):
             if not employee:
                 return {'message': 'Employee not found'}, 404
             
+            # Reject ranges that overlap another active leave of this employee,
+            # holding the lock until the update commits
+            if data['status'] not in INACTIVE_STATUSES:
+                lock_leave_dates(data['employee_id'])
+                conflict = find_overlapping_leave(data['employee_id'], start_date, end_date, exclude_leave_id=id)
+                if conflict:
+                    db.session.rollback()
+                    return overlap_response(conflict)
+            
             # Update fields
             leave.employee_id = data['employee_id']
             leave.leave_type = data['leave_type']
@@ -136,6 +169,7 @@ class LeaveResource(Resource):
             leave.status = data['status']
             # Note: We don't update the application_date as it should remain when the leave was originally requested
             
+            apply_leave_change(before, snapshot(leave))
             db.session.commit()
             
             # Prepare response with employee details
@@ -148,7 +182,7 @@ class LeaveResource(Resource):
             db.session.rollback()
             return {'message': 'Error updating the leave request', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required()
     def patch(self, id):
         parser = reqparse.RequestParser()
         parser.add_argument('employee_id', type=int)
@@ -163,6 +197,7 @@ class LeaveResource(Resource):
             leave = Leave.query.filter_by(leave_id=id).first()
             if not leave:
                 return {'message': 'Leave request not found'}, 404
+            before = snapshot(leave)
             
             # Partial update - only update fields that are provided
             if data['employee_id'] is not None:
@@ -194,6 +229,19 @@ class LeaveResource(Resource):
             if data['status'] is not None:
                 leave.status = data['status']
             
+            # Reject ranges that overlap another active leave of this employee,
+            # holding the lock until the update commits
+            if leave.status not in INACTIVE_STATUSES:
+                lock_leave_dates(leave.employee_id)
+                with db.session.no_autoflush:
+                    conflict = find_overlapping_leave(
+                        leave.employee_id, leave.start_date, leave.end_date, exclude_leave_id=id
+                    )
+                if conflict:
+                    db.session.rollback()
+                    return overlap_response(conflict)
+            
+            apply_leave_change(before, snapshot(leave))
             db.session.commit()
             
             # Prepare response with employee details
@@ -207,18 +255,104 @@ class LeaveResource(Resource):
             db.session.rollback()
             return {'message': 'Error updating the leave request', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required()
     def delete(self, id):
         try:
             leave = Leave.query.filter_by(leave_id=id).first()
             if not leave:
                 return {'message': 'Leave request not found'}, 404
+            before = snapshot(leave)
             
             db.session.delete(leave)
+            apply_leave_change(before, None)
             db.session.commit()
             
             return {'message': 'Leave request deleted successfully'}, 200
         
         except Exception as e:
             db.session.rollback()
-            return {'message': 'Error deleting the leave request', 'error': str(e)}, 500
\ No newline at end of file
+            return {'message': 'Error deleting the leave request', 'error': str(e)}, 500
+
+class LeaveCalendarResource(Resource):
+    """
+    Resource for seeing who is on leave across a date window.
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('department_id', type=int, location='args', help='Department ID must be an integer')
+    parser.add_argument('from', type=iso_date, location='args', help='From date must be in format YYYY-MM-DD')
+    parser.add_argument('to', type=iso_date, location='args', help='To date must be in format YYYY-MM-DD')
+    parser.add_argument('status', type=str, location='args', help='Only include leaves with this status')
+
+    @role_required()
+    def get(self):
+        """
+        List every leave overlapping from..to (default: the next 30 days),
+        optionally for one department, in a single query.
+        Rejected and cancelled leaves are left out unless status asks for them.
+        """
+        data = self.parser.parse_args()
+        
+        start_date = data['from'] or date.today()
+        end_date = data['to'] or start_date + timedelta(days=CALENDAR_DEFAULT_DAYS - 1)
+        if end_date < start_date:
+            return {'message': 'End date cannot be before start date'}, 400
+        if (end_date - start_date).days >= CALENDAR_MAX_DAYS:
+            return {'message': f'Date range cannot be longer than {CALENDAR_MAX_DAYS} days'}, 400
+        
+        leaves = leave_calendar(start_date, end_date, data['department_id'], data['status'])
+        
+        return {
+            'from': start_date.isoformat(),
+            'to': end_date.isoformat(),
+            'leaves': [
+                {
+                    'leave_id': leave.leave_id,
+                    'employee_id': leave.employee_id,
+                    'employee_name': f"{leave.first_name} {leave.last_name}",
+                    'department_id': leave.department_id,
+                    'leave_type': leave.leave_type,
+                    'start_date': leave.start_date.isoformat(),
+                    'end_date': leave.end_date.isoformat(),
+                    'status': leave.status
+                }
+                for leave in leaves
+            ]
+        }, 200
+
+
+class LeaveBalanceResource(Resource):
+    """
+    Resource for reading leave balances from the ledger.
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('employee_id', type=int, location='args', help='Employee ID must be an integer')
+    parser.add_argument('leave_type', type=str, location='args', help='Leave type to look up')
+
+    @staticmethod
+    def balance_dict(balance):
+        return {
+            **balance.to_dict(),
+            'available_days': round(balance.accrued_days - balance.used_days - balance.pending_days, 4)
+        }
+
+    @role_required()
+    def get(self):
+        """
+        Get the balances of an employee (defaults to the current user).
+        Only admins can read another employee's balances.
+        With leave_type this is a single primary key read.
+        """
+        data = self.parser.parse_args()
+        current_user_id = int(get_jwt_identity())
+        employee_id = data['employee_id'] or current_user_id
+        if employee_id != current_user_id and current_role() != 'admin':
+            return {'message': 'Access denied. You can only view your own leave balance'}, 403
+        
+        if data['leave_type']:
+            balance = get_balance(employee_id, data['leave_type'])
+            if balance is None:
+                return {'message': 'No leave balance found'}, 404
+            return self.balance_dict(balance), 200
+        
+        balances = LeaveBalance.query.filter_by(employee_id=employee_id).order_by(LeaveBalance.leave_type)
+        return [self.balance_dict(balance) for balance in balances], 200
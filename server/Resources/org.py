@@ -0,0 +1,36 @@
+from flask_restful import Resource, reqparse, inputs
+from Services.authz import role_required
+from Services.org_chart import subtree_summary, subtree_reports, MAX_ORG_DEPTH
+
+class OrgSubtreeResource(Resource):
+    """
+    Org hierarchy resource.
+    Returns everyone who reports to an employee, directly or transitively.
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('include_reports', type=inputs.boolean, location='args', default=True,
+                        help='include_reports must be true or false')
+    parser.add_argument('max_depth', type=inputs.positive, location='args', default=MAX_ORG_DEPTH,
+                        help='max_depth must be a positive integer')
+
+    @role_required('admin', message='Access denied. Only admins can view the org hierarchy')
+    def get(self, employee_id):
+        """
+        Get the span of control, number of reports and rolled-up salary cost
+        of an employee's subtree, plus every report with include_reports.
+        Each form is a single recursive query.
+        """
+        data = self.parser.parse_args()
+        max_depth = min(data['max_depth'], MAX_ORG_DEPTH)
+        
+        if not data['include_reports']:
+            summary = subtree_summary(employee_id, max_depth)
+            if summary is None:
+                return {'message': 'Employee not found'}, 404
+            return summary, 200
+        
+        summary, reports = subtree_reports(employee_id, max_depth)
+        if summary is None:
+            return {'message': 'Employee not found'}, 404
+        
+        return {**summary, 'reports': reports}, 200
@@ -1,31 +1,35 @@
 from flask_restful import Resource, reqparse, inputs
-from models import Employee, Payroll,User, db
+from models import Employee, Payroll, db
 from flask import request
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from datetime import datetime
+import csv
+from Services.payroll_run import run_payroll
+from Services.payroll_import import import_payroll, parse_csv, MAX_IMPORT_ROWS
+from Services.authz import role_required, current_role
+from Services.pagination import list_parser, paginate, page_headers
+from Services.employee_lookup import resolve_employee_reference, EmployeeLookupError
 
 class PayrollResource(Resource):
     parser = reqparse.RequestParser()
-    parser.add_argument('employee_name', type=str, required=True, help='Employee name is required')
+    parser.add_argument('employee_id', type=int, required=False, help='Employee ID must be an integer')
+    parser.add_argument('employee_name', type=str, required=False,
+                        help='Employee name, required when no employee ID is given')
     parser.add_argument('pay_date', type=str, required=True, help='Pay date is required')
     parser.add_argument('base_salary', type=float, required=True, help='Base salary is required')
     parser.add_argument('overtime', type=float, required=False, default=0.0, help='Overtime pay (defaults to 0.0 if not provided)')
     parser.add_argument('deductions', type=float, required=False, default=0.0, help='Deductions (defaults to 0.0 if not provided)')
     parser.add_argument('bonuses', type=float, required=False, default=0.0, help='Bonuses (defaults to 0.0 if not provided)')
 
-    @jwt_required()
+    @role_required()
     def get(self, id=None):
-        # Get current user's identity and claims
+        # Get current user's identity
         current_user_id = get_jwt_identity()
-        claims = get_jwt()
 
-        # Get the current user
-        current_user = User.query.get(current_user_id)
-        if not current_user:
-            return {'message': 'User not found'}, 404
-
-        # Check if user is admin
-        is_admin = current_user.role == 'admin'
+        # Check if user is admin (role comes from the signed token claims)
+        is_admin = current_role() == 'admin'
         
         # Admin can access all records
         if is_admin:
@@ -44,7 +48,11 @@ class PayrollResource(Resource):
                 return payroll_dict, 200
             # Otherwise get all records
             else:
-                payrolls = Payroll.query.all()
+                # Load employees in the same query to avoid one SELECT per row
+                payrolls, next_cursor = paginate(
+                    Payroll.query.options(joinedload(Payroll.employee)),
+                    Payroll, Payroll.payroll_id, Payroll.pay_date, list_parser().parse_args()
+                )
                 return [
                     {
                         **payroll.to_dict(), 
@@ -52,7 +60,7 @@ class PayrollResource(Resource):
                         if payroll.employee else None
                     } 
                     for payroll in payrolls
-                ], 200
+                ], 200, page_headers(next_cursor)
         
         # For non-admin users, always return their own payroll records
         # Get the employee record for the logged-in user
@@ -72,8 +80,14 @@ class PayrollResource(Resource):
             
             return payroll_dict, 200
         
-        # Otherwise return all payroll records for this employee
-        payrolls = Payroll.query.filter_by(employee_id=current_user_id).all()
+        # Otherwise return a page of payroll records for this employee
+        args = list_parser().parse_args()
+        args['employee_id'] = None
+        args['department_id'] = None
+        payrolls, next_cursor = paginate(
+            Payroll.query.filter_by(employee_id=current_user_id),
+            Payroll, Payroll.payroll_id, Payroll.pay_date, args
+        )
         
         # Format the response
         payroll_list = []
@@ -90,23 +104,10 @@ class PayrollResource(Resource):
                 'employee_id': employee.employee_id
             },
             'payroll_records': payroll_list
-        }, 200
+        }, 200, page_headers(next_cursor)
 
-    @jwt_required()
+    @role_required('admin', message='Access denied. Only admins can create payroll records')
     def post(self):
-        # Get current user's identity and claims
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        # Get the current user
-        current_user = User.query.get(current_user_id)
-        if not current_user:
-            return {'message': 'User not found'}, 404
-
-        # Check if user is admin
-        is_admin = current_user.role == 'admin'
-        
-        if not is_admin:
-            return {'message': 'Access denied. Only admins can create payroll records'}, 403
             
         data = self.parser.parse_args()
         
@@ -117,23 +118,13 @@ class PayrollResource(Resource):
             except ValueError:
                 return {'message': 'Pay date must be in format YYYY-MM-DD'}, 400
                 
-            # Get employee by name (search by first and last name)
-            employee_name = data['employee_name']
-            names = employee_name.split()
-            
-            if len(names) < 2:
-                return {'message': 'Please provide both first and last name'}, 400
-                
-            first_name = names[0]
-            last_name = ' '.join(names[1:])  # Handle multi-word last names
-            
-            employee = Employee.query.filter(
-                Employee.first_name == first_name, 
-                Employee.last_name == last_name
-            ).first()
-            
-            if not employee:
-                return {'message': 'Employee not found'}, 404
+            # Resolve the employee by ID, or by name (first and last name) without one
+            try:
+                employee_id, first_name, last_name = resolve_employee_reference(
+                    data['employee_id'], data['employee_name']
+                )
+            except EmployeeLookupError as e:
+                return {'message': e.message}, e.status
             
             # Calculate total pay
             base_salary = data['base_salary']
@@ -144,7 +135,7 @@ class PayrollResource(Resource):
             
             # Create payroll record
             payroll = Payroll(
-                employee_id=employee.employee_id,
+                employee_id=employee_id,
                 pay_date=pay_date,
                 base_salary=base_salary,
                 overtime=overtime,
@@ -158,30 +149,20 @@ class PayrollResource(Resource):
             
             # Prepare response with employee details
             response = payroll.to_dict()
-            response['employee_name'] = f"{employee.first_name} {employee.last_name}"
+            response['employee_name'] = f"{first_name} {last_name}"
             response['message'] = 'Payroll record added successfully'
             
             return response, 201
         
+        except IntegrityError:
+            db.session.rollback()
+            return {'message': 'A payroll record already exists for this employee and pay date'}, 409
         except Exception as e:
             db.session.rollback()
             return {'message': 'Error creating the payroll record', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required('admin', message='Access denied. Only admins can update payroll records')
     def put(self, id):
-        # Get current user's identity and claims
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        # Get the current user
-        current_user = User.query.get(current_user_id)
-        if not current_user:
-            return {'message': 'User not found'}, 404
-
-        # Check if user is admin
-        is_admin = current_user.role == 'admin'
-        
-        if not is_admin:
-            return {'message': 'Access denied. Only admins can create payroll records'}, 403
         # For PUT we'll create a different parser that uses employee_id
         put_parser = reqparse.RequestParser()
         put_parser.add_argument('employee_id', type=int, required=True, help='Employee ID is required')
@@ -234,25 +215,15 @@ class PayrollResource(Resource):
             
             return response, 200
         
+        except IntegrityError:
+            db.session.rollback()
+            return {'message': 'A payroll record already exists for this employee and pay date'}, 409
         except Exception as e:
             db.session.rollback()
             return {'message': 'Error updating the payroll record', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required('admin', message='Access denied. Only admins can update payroll records')
     def patch(self, id):
-        # Get current user's identity and claims
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        # Get the current user
-        current_user = User.query.get(current_user_id)
-        if not current_user:
-            return {'message': 'User not found'}, 404
-
-        # Check if user is admin
-        is_admin = current_user.role == 'admin'
-        
-        if not is_admin:
-            return {'message': 'Access denied. Only admins can create payroll records'}, 403
         parser = reqparse.RequestParser()
         parser.add_argument('employee_id', type=int)
         parser.add_argument('pay_date', type=str)
@@ -315,25 +286,15 @@ class PayrollResource(Resource):
             response['message'] = 'Payroll record updated successfully'
             return response, 200
         
+        except IntegrityError:
+            db.session.rollback()
+            return {'message': 'A payroll record already exists for this employee and pay date'}, 409
         except Exception as e:
             db.session.rollback()
             return {'message': 'Error updating the payroll record', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required('admin', message='Access denied. Only admins can delete payroll records')
     def delete(self, id):
-        # Get current user's identity and claims
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        # Get the current user
-        current_user = User.query.get(current_user_id)
-        if not current_user:
-            return {'message': 'User not found'}, 404
-
-        # Check if user is admin
-        is_admin = current_user.role == 'admin'
-        
-        if not is_admin:
-            return {'message': 'Access denied. Only admins can create payroll records'}, 403
         try:
             payroll = Payroll.query.filter_by(payroll_id=id).first()
             if not payroll:
@@ -346,4 +307,77 @@ class PayrollResource(Resource):
         
         except Exception as e:
             db.session.rollback()
-            return {'message': 'Error deleting the payroll record', 'error': str(e)}, 500
\ No newline at end of file
+            return {'message': 'Error deleting the payroll record', 'error': str(e)}, 500
+
+class PayrollRunResource(Resource):
+    """
+    Runs payroll for every employee in a pay period in a single request.
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('pay_date', type=str, required=True, help='Pay date is required')
+    parser.add_argument('department_id', type=int, required=False, help='Limit the run to one department')
+    parser.add_argument('dry_run', type=inputs.boolean, required=False, default=False,
+                        help='Compute the run without saving it')
+
+    @role_required('admin', message='Access denied. Only admins can run payroll')
+    def post(self):
+        data = self.parser.parse_args()
+
+        try:
+            pay_date = datetime.strptime(data['pay_date'], '%Y-%m-%d').date()
+        except ValueError:
+            return {'message': 'Pay date must be in format YYYY-MM-DD'}, 400
+
+        try:
+            summary, rows = run_payroll(pay_date, data['department_id'], dry_run=data['dry_run'])
+        except Exception as e:
+            return {'message': 'Error running payroll', 'error': str(e)}, 500
+
+        if data['dry_run']:
+            summary['payroll_records'] = [
+                {**row, 'pay_date': row['pay_date'].isoformat()} for row in rows
+            ]
+            return summary, 200
+
+        summary['message'] = f"Payroll run completed for {summary['created']} employees"
+        return summary, 201
+
+class PayrollBatchResource(Resource):
+    """
+    Imports many payroll records from a JSON array or a CSV upload.
+    Bad rows are reported individually and do not stop the rest of the batch.
+    """
+
+    @role_required('admin', message='Access denied. Only admins can import payroll records')
+    def post(self):
+        # CSV arrives as a multipart upload or a raw text/csv body
+        upload = request.files.get('file')
+        try:
+            if upload is not None:
+                records = parse_csv(upload.read().decode('utf-8-sig'))
+            elif request.mimetype == 'text/csv':
+                records = parse_csv(request.get_data(as_text=True))
+            else:
+                records = request.get_json(silent=True)
+                if isinstance(records, dict):
+                    records = records.get('records')
+        except (UnicodeDecodeError, csv.Error):
+            return {'message': 'Could not read the uploaded CSV file'}, 400
+
+        if not isinstance(records, list) or not records:
+            return {'message': 'Provide a non-empty JSON array of records or a CSV file'}, 400
+        if len(records) > MAX_IMPORT_ROWS:
+            return {'message': f'A batch can contain at most {MAX_IMPORT_ROWS} records'}, 400
+
+        try:
+            created, results = import_payroll(records)
+        except Exception as e:
+            return {'message': 'Error importing payroll records', 'error': str(e)}, 500
+
+        failed = len(results) - created
+        return {
+            'message': f'{created} payroll records imported, {failed} failed',
+            'created': created,
+            'failed': failed,
+            'results': results
+        }, 201 if created else 400
@@ -0,0 +1,24 @@
+from flask_restful import Resource
+from Services.authz import role_required
+from Services.query_stats import get_query_stats, reset_query_stats
+
+class QueryStatsResource(Resource):
+    """
+    SQL statistics per resource and method for this worker process.
+    """
+
+    @role_required('admin', message='Access denied. Only admins can view query statistics')
+    def get(self):
+        """
+        Requests, statement counts, database time and the slowest statement
+        recorded for every resource and HTTP method served so far.
+        """
+        return get_query_stats(), 200
+
+    @role_required('admin', message='Access denied. Only admins can reset query statistics')
+    def delete(self):
+        """
+        Start counting from zero, e.g. before a benchmark run.
+        """
+        reset_query_stats()
+        return {'message': 'Query statistics reset'}, 200
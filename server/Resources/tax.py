@@ -1,32 +1,44 @@
 from flask_restful import Resource, reqparse, inputs
-from models import Employee, Tax, User, db
+from models import Employee, Tax, db
 from flask import request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy.orm import joinedload
+from Services.pagination import list_parser, paginate, page_headers
+from Services.authz import role_required, current_role
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from Services.employee_lookup import resolve_employee_reference, EmployeeLookupError
+from Services.tax_brackets import get_tax_table, set_tax_brackets, clear_tax_tables
+from Services.tax_rollover import rollover_tax
 
 class TaxResource(Resource):
     parser = reqparse.RequestParser()
-    parser.add_argument('employee_name', type=str, required=True, help='Employee name is required')
-    parser.add_argument('tax_percentage', type=float, required=True, help='Tax percentage is required')
-    parser.add_argument('tax_amount', type=float, required=True, help='Tax amount is required')
+    parser.add_argument('employee_id', type=int, required=False, help='Employee ID must be an integer')
+    parser.add_argument('employee_name', type=str, required=False,
+                        help='Employee name, required when no employee ID is given')
+    parser.add_argument('tax_percentage', type=float, required=False,
+                        help='Tax percentage (derived from the tax brackets if omitted)')
+    parser.add_argument('tax_amount', type=float, required=False,
+                        help='Tax amount (derived from the tax brackets if omitted)')
     parser.add_argument('year', type=int, required=True, help='Tax year is required')
 
-    @jwt_required()
+    @role_required()
     def get(self, id=None):
         # Get current user ID from JWT token
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
         
-        if not current_user:
-            return {'message': 'User not found'}, 404
-        
-        # Check if current user is admin
-        is_admin = current_user.role == 'admin'
+        # Check if current user is admin (role comes from the signed token claims)
+        is_admin = current_role() == 'admin'
         
         # For admin users - return all records or specific record by ID
         if is_admin:
             if id is None:
-                tax_records = Tax.query.all()
+                # Load employees in the same query to avoid one SELECT per row
+                tax_records, next_cursor = paginate(
+                    Tax.query.options(joinedload(Tax.employee)),
+                    Tax, Tax.tax_id, Tax.year, list_parser().parse_args(),
+                    date_value=lambda value: value.year
+                )
                 return {
                     'message': 'Successfully retrieved all tax records',
                     'data': [
@@ -37,7 +49,7 @@ class TaxResource(Resource):
                         } 
                         for tax in tax_records
                     ]
-                }, 200
+                }, 200, page_headers(next_cursor)
             
             tax_record = Tax.query.filter_by(tax_id=id).first()
             if tax_record is None:
@@ -63,12 +75,19 @@ class TaxResource(Resource):
                 return {'message': 'Employee record not found for current user'}, 404
             
             if id is None:
-                # Return all tax records for this employee
-                tax_records = Tax.query.filter_by(employee_id=employee.employee_id).all()
+                # Return a page of tax records for this employee
+                args = list_parser().parse_args()
+                args['employee_id'] = None
+                args['department_id'] = None
+                tax_records, next_cursor = paginate(
+                    Tax.query.filter_by(employee_id=employee.employee_id),
+                    Tax, Tax.tax_id, Tax.year, args,
+                    date_value=lambda value: value.year
+                )
                 return {
                     'message': 'Successfully retrieved your tax records',
                     'data': [tax.to_dict() for tax in tax_records]
-                }, 200
+                }, 200, page_headers(next_cursor)
             
             # Return specific tax record for this employee
             tax_record = Tax.query.filter_by(tax_id=id, employee_id=employee.employee_id).first()
@@ -81,18 +100,9 @@ class TaxResource(Resource):
                 'data': tax_record.to_dict()
             }, 200
 
-    @jwt_required()
+    @role_required('admin', message='Permission denied. Only admin users can create tax records')
     def post(self):
         # Only admin can create tax records
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
-        
-        if not current_user:
-            return {'message': 'User not found'}, 404
-        
-        if current_user.role != 'admin':
-            return {'message': 'Permission denied. Only admin users can create tax records'}, 403
-        
         data = self.parser.parse_args()
         
         try:
@@ -102,54 +112,50 @@ class TaxResource(Resource):
                 return {'message': f'Year must be between 2000 and {current_year + 1}'}, 400
                 
             # Validate tax percentage
-            if data['tax_percentage'] < 0 or data['tax_percentage'] > 100:
+            if data['tax_percentage'] is not None and (data['tax_percentage'] < 0 or data['tax_percentage'] > 100):
                 return {'message': 'Tax percentage must be between 0 and 100'}, 400
                 
             # Validate tax amount
-            if data['tax_amount'] < 0:
+            if data['tax_amount'] is not None and data['tax_amount'] < 0:
                 return {'message': 'Tax amount cannot be negative'}, 400
 
-            # Get employee by name (search by first and last name)
-            employee_name = data['employee_name']
-            names = employee_name.split()
-            
-            if len(names) < 2:
-                return {'message': 'Please provide both first and last name'}, 400
-                
-            first_name = names[0]
-            last_name = ' '.join(names[1:])  # Handle multi-word last names
-            
-            employee = Employee.query.filter(
-                Employee.first_name == first_name, 
-                Employee.last_name == last_name
-            ).first()
-            
-            if not employee:
-                return {'message': 'Employee not found'}, 404
-            
-            # Check if a tax record already exists for this employee and year
-            existing_record = Tax.query.filter_by(
-                employee_id=employee.employee_id,
-                year=data['year']
-            ).first()
-            
-            if existing_record:
-                return {'message': f'Tax record already exists for {employee_name} for year {data["year"]}'}, 409
+            # Resolve the employee by ID, or by name (first and last name) without one
+            try:
+                employee_id, first_name, last_name = resolve_employee_reference(
+                    data['employee_id'], data['employee_name']
+                )
+            except EmployeeLookupError as e:
+                return {'message': e.message}, e.status
+            employee_name = f"{first_name} {last_name}"
+            
+            # Derive whatever was left out from the year's tax brackets and the salary
+            if data['tax_amount'] is None or data['tax_percentage'] is None:
+                salary = db.session.query(Employee.salary).filter(Employee.employee_id == employee_id).scalar()
+                tax_table = get_tax_table(data['year'])
+                if data['tax_amount'] is None:
+                    data['tax_amount'] = round(tax_table.tax(salary), 2)
+                if data['tax_percentage'] is None:
+                    data['tax_percentage'] = tax_table.effective_percentage(salary)
             
             # Create new tax record
             tax_record = Tax(
-                employee_id=employee.employee_id,
+                employee_id=employee_id,
                 tax_percentage=data['tax_percentage'],
                 tax_amount=data['tax_amount'],
                 year=data['year']
             )
             
+            # The unique (employee_id, year) index rejects a second record for the year
             db.session.add(tax_record)
-            db.session.commit()
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                return {'message': f'Tax record already exists for {employee_name} for year {data["year"]}'}, 409
             
             # Prepare response with employee details
             response = tax_record.to_dict()
-            response['employee_name'] = f"{employee.first_name} {employee.last_name}"
+            response['employee_name'] = f"{first_name} {last_name}"
             
             return {
                 'message': f'Tax record successfully created for {employee_name} for year {data["year"]}',
@@ -160,18 +166,9 @@ class TaxResource(Resource):
             db.session.rollback()
             return {'message': 'Error creating the tax record', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required('admin', message='Permission denied. Only admin users can update tax records')
     def put(self, id):
         # Only admin can update tax records
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
-        
-        if not current_user:
-            return {'message': 'User not found'}, 404
-        
-        if current_user.role != 'admin':
-            return {'message': 'Permission denied. Only admin users can update tax records'}, 403
-        
         # For PUT we'll create a different parser that uses employee_id
         put_parser = reqparse.RequestParser()
         put_parser.add_argument('employee_id', type=int, required=True, help='Employee ID is required')
@@ -204,23 +201,17 @@ class TaxResource(Resource):
             if not employee:
                 return {'message': 'Employee not found'}, 404
             
-            # Check if updating to a different year would create a duplicate
-            if tax_record.employee_id == data['employee_id'] and tax_record.year != data['year']:
-                existing_record = Tax.query.filter_by(
-                    employee_id=data['employee_id'],
-                    year=data['year']
-                ).first()
-                
-                if existing_record and existing_record.tax_id != tax_record.tax_id:
-                    return {'message': f'Tax record already exists for this employee for year {data["year"]}'}, 409
-            
             # Update fields
             tax_record.employee_id = data['employee_id']
             tax_record.tax_percentage = data['tax_percentage']
             tax_record.tax_amount = data['tax_amount']
             tax_record.year = data['year']
             
-            db.session.commit()
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                return {'message': f'Tax record already exists for this employee for year {data["year"]}'}, 409
             
             # Prepare response with employee details
             response = tax_record.to_dict()
@@ -235,18 +226,9 @@ class TaxResource(Resource):
             db.session.rollback()
             return {'message': 'Error updating the tax record', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required('admin', message='Permission denied. Only admin users can update tax records')
     def patch(self, id):
         # Only admin can partially update tax records
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
-        
-        if not current_user:
-            return {'message': 'User not found'}, 404
-        
-        if current_user.role != 'admin':
-            return {'message': 'Permission denied. Only admin users can update tax records'}, 403
-        
         parser = reqparse.RequestParser()
         parser.add_argument('employee_id', type=int)
         parser.add_argument('tax_percentage', type=float)
@@ -291,16 +273,6 @@ class TaxResource(Resource):
                 if data['year'] < 2000 or data['year'] > current_year + 1:
                     return {'message': f'Year must be between 2000 and {current_year + 1}'}, 400
                 
-                # Check if changing year would create a duplicate
-                if tax_record.year != data['year']:
-                    existing_record = Tax.query.filter_by(
-                        employee_id=tax_record.employee_id,
-                        year=data['year']
-                    ).first()
-                    
-                    if existing_record and existing_record.tax_id != tax_record.tax_id:
-                        return {'message': f'Tax record already exists for this employee for year {data["year"]}'}, 409
-                
                 tax_record.year = data['year']
                 updated_fields.append('year')
             
@@ -308,7 +280,12 @@ class TaxResource(Resource):
             if not updated_fields:
                 return {'message': 'No fields provided for update'}, 400
             
-            db.session.commit()
+            tax_year = tax_record.year
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                return {'message': f'Tax record already exists for this employee for year {tax_year}'}, 409
             
             # Prepare response with employee details
             response = tax_record.to_dict()
@@ -327,18 +304,9 @@ class TaxResource(Resource):
             db.session.rollback()
             return {'message': 'Error updating the tax record', 'error': str(e)}, 500
 
-    @jwt_required()
+    @role_required('admin', message='Permission denied. Only admin users can delete tax records')
     def delete(self, id):
         # Only admin can delete tax records
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
-        
-        if not current_user:
-            return {'message': 'User not found'}, 404
-        
-        if current_user.role != 'admin':
-            return {'message': 'Permission denied. Only admin users can delete tax records'}, 403
-        
         try:
             tax_record = Tax.query.filter_by(tax_id=id).first()
             if not tax_record:
@@ -358,4 +326,145 @@ class TaxResource(Resource):
         
         except Exception as e:
             db.session.rollback()
-            return {'message': 'Error deleting the tax record', 'error': str(e)}, 500
\ No newline at end of file
+            return {'message': 'Error deleting the tax record', 'error': str(e)}, 500
+
+class TaxRolloverResource(Resource):
+    """
+    Resource for creating every employee's tax record for a year in one batch.
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('year', type=int, location='args', required=True, help='Tax year is required')
+    parser.add_argument('overwrite', type=inputs.boolean, location='args', default=True,
+                        help='overwrite must be true or false')
+
+    @role_required('admin', message='Permission denied. Only admin users can roll over tax records')
+    def post(self):
+        """
+        Upsert a tax record for the year for every employee hired by its end,
+        derived from the year's tax brackets.
+        overwrite=false keeps records that already exist.
+        """
+        data = self.parser.parse_args()
+        
+        current_year = datetime.now().year
+        if data['year'] < 2000 or data['year'] > current_year + 1:
+            return {'message': f'Year must be between 2000 and {current_year + 1}'}, 400
+        
+        try:
+            summary = rollover_tax(data['year'], overwrite=data['overwrite'])
+        except Exception as e:
+            return {'message': 'Error rolling over the tax records', 'error': str(e)}, 500
+        
+        return {
+            'message': f'Tax records rolled over for {summary["employees"]} employees for year {data["year"]}',
+            **summary
+        }, 200
+
+
+class TaxBracketResource(Resource):
+    """
+    Resource for reading and replacing a year's progressive tax brackets.
+    """
+
+    @role_required()
+    def get(self, year):
+        tax_table = get_tax_table(year)
+        return {
+            'year': year,
+            'source': tax_table.source,
+            'brackets': tax_table.to_list()
+        }, 200
+
+    @role_required('admin', message='Permission denied. Only admin users can change tax brackets')
+    def put(self, year):
+        """
+        Replace the brackets of a year.
+        Expects {"brackets": [{"lower_bound": 0, "tax_percentage": 0}, ...]}.
+        """
+        data = request.get_json(silent=True) or {}
+        brackets = data.get('brackets')
+        if not isinstance(brackets, list) or not brackets:
+            return {'message': 'Provide a non-empty brackets list'}, 400
+        
+        try:
+            rows = [(bracket['lower_bound'], bracket['tax_percentage']) for bracket in brackets]
+        except (TypeError, KeyError):
+            return {'message': 'Each bracket needs lower_bound and tax_percentage'}, 400
+        
+        try:
+            tax_table = set_tax_brackets(year, rows)
+            db.session.commit()
+            clear_tax_tables(year)
+        except (TypeError, ValueError) as e:
+            db.session.rollback()
+            return {'message': str(e)}, 400
+        except Exception as e:
+            db.session.rollback()
+            return {'message': 'Error saving the tax brackets', 'error': str(e)}, 500
+        
+        return {
+            'year': year,
+            'source': tax_table.source,
+            'brackets': tax_table.to_list()
+        }, 200
+
+
+def _is_int(value):
+    # bool is an int subclass, but true/false in JSON is not a number
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class TaxWithholdingResource(Resource):
+    """
+    Resource for computing tax withholding in bulk from the tax brackets.
+    """
+
+    @role_required('admin', message='Permission denied. Only admin users can compute withholding')
+    def post(self):
+        """
+        Compute withholding for many pays in one call.
+        With gross_pays, returns the tax to withhold from each per-period pay.
+        Without it, returns the annual tax of every employee (optionally one
+        department) from their salaries.
+        """
+        data = request.get_json(silent=True) or {}
+        year = data.get('year', datetime.now().year)
+        periods = data.get('periods', 12)
+        if not _is_int(year) or not _is_int(periods) or periods < 1:
+            return {'message': 'year and periods must be positive integers'}, 400
+        department_id = data.get('department_id')
+        if department_id is not None and not _is_int(department_id):
+            return {'message': 'department_id must be an integer'}, 400
+        
+        tax_table = get_tax_table(year)
+        
+        if 'gross_pays' in data:
+            gross_pays = data['gross_pays']
+            if not isinstance(gross_pays, list) or not all(
+                isinstance(pay, (int, float)) and not isinstance(pay, bool) for pay in gross_pays
+            ):
+                return {'message': 'gross_pays must be a list of numbers'}, 400
+            return {
+                'year': year,
+                'periods': periods,
+                'withholding': tax_table.withholding_many(gross_pays, periods)
+            }, 200
+        
+        employees = db.session.query(Employee.employee_id, Employee.salary)
+        if department_id is not None:
+            employees = employees.filter(Employee.department_id == department_id)
+        employees = employees.order_by(Employee.employee_id).all()
+        
+        taxes = tax_table.tax_many(salary for _, salary in employees)
+        return {
+            'year': year,
+            'employees': [
+                {
+                    'employee_id': employee_id,
+                    'salary': salary,
+                    'tax_amount': round(tax, 2),
+                    'tax_percentage': round(tax / salary * 100, 2) if salary > 0 else 0.0
+                }
+                for (employee_id, salary), tax in zip(employees, taxes)
+            ]
+        }, 200
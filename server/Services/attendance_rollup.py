@@ -0,0 +1,216 @@
+"""
+Daily attendance rollup per department.
+
+Present and late counts come from one GROUP BY over Attendance joined to
+Employee. On leave counts employees with approved leave covering the day,
+from one interval query over Leave. Absent is the department headcount on
+that day minus everyone present or on leave. Weekends are not working
+days and are left out.
+
+Days before today never change once they are over, so their counts are
+kept in an in-process LRU cache and only uncached days are queried.
+Attendance, Employee or Leave writes made through the ORM drop the
+affected cache entries.
+"""
+from collections import OrderedDict
+from datetime import date, time, timedelta
+from threading import Lock
+from sqlalchemy import case, event, func, select
+from sqlalchemy.orm.attributes import get_history
+from models import db, Attendance, Employee, Leave
+from Services.leave_balance import APPROVED_STATUS
+from Services.leave_intervals import overlapping
+from Services.metrics import record_cache
+
+# Clock-ins after this time count as late
+LATE_AFTER = time(9, 0)
+# date.weekday() values of non-working days
+WEEKEND_DAYS = (5, 6)
+# Longest date window one request may cover
+MAX_ROLLUP_DAYS = 366
+# Cached (day, department filter) entries
+ROLLUP_CACHE_SIZE = 20000
+
+_cache = OrderedDict()
+_lock = Lock()
+
+
+def _cached(key):
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+    record_cache('attendance_rollup', entry is not None)
+    return entry
+
+
+def _store(key, counts):
+    with _lock:
+        _cache[key] = counts
+        _cache.move_to_end(key)
+        while len(_cache) > ROLLUP_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def clear_rollup_cache(day=None, end_date=None):
+    """
+    Forget cached rollups, for one day, for the days from day to end_date,
+    or for every day.
+    """
+    with _lock:
+        if day is None:
+            _cache.clear()
+        else:
+            end_date = end_date or day
+            for key in [key for key in _cache if day <= key[0] <= end_date]:
+                del _cache[key]
+
+
+def _headcounts(start_date, end_date, department_id):
+    """
+    Employees per department per day, from one GROUP BY on hire date.
+    """
+    query = db.session.query(
+        Employee.department_id, Employee.hire_date, func.count(Employee.employee_id)
+    ).filter(Employee.hire_date <= end_date)
+    if department_id is not None:
+        query = query.filter(Employee.department_id == department_id)
+
+    hired_before = {}
+    hired_on = {}
+    for dept_id, hire_date, count in query.group_by(Employee.department_id, Employee.hire_date):
+        if hire_date < start_date:
+            hired_before[dept_id] = hired_before.get(dept_id, 0) + count
+        else:
+            hired_on.setdefault(hire_date, []).append((dept_id, count))
+
+    headcounts = {}
+    running = dict(hired_before)
+    day = start_date
+    while day <= end_date:
+        for dept_id, count in hired_on.get(day, ()):
+            running[dept_id] = running.get(dept_id, 0) + count
+        headcounts[day] = dict(running)
+        day += timedelta(days=1)
+    return headcounts
+
+
+def _on_leave(start_date, end_date, department_id):
+    """
+    {(department_id, day): employee ids} for employees on approved leave,
+    from one interval query joined to Employee.
+    """
+    query = db.session.query(
+        Employee.department_id, Leave.employee_id, Leave.start_date, Leave.end_date
+    ).join(Employee, Leave.employee_id == Employee.employee_id).filter(Leave.status == APPROVED_STATUS)
+    query = overlapping(query, start_date, end_date)
+    if department_id is not None:
+        query = query.filter(Employee.department_id == department_id)
+
+    on_leave = {}
+    for dept_id, employee_id, leave_start, leave_end in query:
+        day = max(leave_start, start_date)
+        while day <= min(leave_end, end_date):
+            on_leave.setdefault((dept_id, day), set()).add(employee_id)
+            day += timedelta(days=1)
+    return on_leave
+
+
+def _query_days(start_date, end_date, department_id):
+    """
+    Compute {day: {department_id: counts}} for every day in the range.
+    """
+    is_late = case((Attendance.clock_in_time > LATE_AFTER, 1), else_=0)
+    # Someone who clocked in during approved leave is present, not on leave
+    attended_on_leave = case((select(Leave.leave_id).where(
+        Leave.employee_id == Attendance.employee_id,
+        Leave.status == APPROVED_STATUS,
+        Leave.start_date <= Attendance.date,
+        Leave.end_date >= Attendance.date
+    ).exists(), 1), else_=0)
+    query = db.session.query(
+        Employee.department_id,
+        Attendance.date,
+        func.count(Attendance.attendance_id),
+        func.sum(is_late),
+        func.sum(attended_on_leave)
+    ).join(Employee, Attendance.employee_id == Employee.employee_id).filter(
+        Attendance.date >= start_date,
+        Attendance.date <= end_date
+    )
+    if department_id is not None:
+        query = query.filter(Employee.department_id == department_id)
+
+    attended = {}
+    for dept_id, day, present, late, present_on_leave in query.group_by(Employee.department_id, Attendance.date):
+        attended[(dept_id, day)] = (present, int(late or 0), int(present_on_leave or 0))
+    on_leave = _on_leave(start_date, end_date, department_id)
+
+    days = {}
+    for day, departments in _headcounts(start_date, end_date, department_id).items():
+        days[day] = {}
+        for dept_id, headcount in departments.items():
+            present, late, present_on_leave = attended.get((dept_id, day), (0, 0, 0))
+            away = len(on_leave.get((dept_id, day), ())) - present_on_leave
+            days[day][dept_id] = {
+                'present': present,
+                'late': late,
+                'on_leave': away,
+                'absent': max(headcount - present - away, 0)
+            }
+    return days
+
+
+def attendance_rollup(start_date, end_date, department_id=None):
+    """
+    Return {day: {department_id: {'present', 'late', 'on_leave', 'absent'}}}
+    for every working day from start_date to end_date. Only days missing
+    from the cache hit the database, with one query span covering all of them.
+    """
+    today = date.today()
+    days = {}
+    missing = []
+    day = start_date
+    while day <= end_date:
+        if day.weekday() in WEEKEND_DAYS:
+            day += timedelta(days=1)
+            continue
+        counts = _cached((day, department_id)) if day < today else None
+        if counts is None:
+            missing.append(day)
+        else:
+            days[day] = counts
+        day += timedelta(days=1)
+
+    if missing:
+        computed = _query_days(missing[0], missing[-1], department_id)
+        for day in missing:
+            days[day] = computed[day]
+            if day < today:
+                _store((day, department_id), computed[day])
+
+    return days
+
+
+@event.listens_for(Attendance, 'after_insert')
+@event.listens_for(Attendance, 'after_update')
+@event.listens_for(Attendance, 'after_delete')
+def _invalidate_day(mapper, connection, target):
+    clear_rollup_cache(target.date)
+
+
+@event.listens_for(Employee, 'after_insert')
+@event.listens_for(Employee, 'after_update')
+@event.listens_for(Employee, 'after_delete')
+def _invalidate_headcounts(mapper, connection, target):
+    clear_rollup_cache()
+
+
+@event.listens_for(Leave, 'after_insert')
+@event.listens_for(Leave, 'after_update')
+@event.listens_for(Leave, 'after_delete')
+def _invalidate_leave_days(mapper, connection, target):
+    # An update may have moved the leave, so drop its old days as well
+    start_dates = [target.start_date, *get_history(target, 'start_date').deleted]
+    end_dates = [target.end_date, *get_history(target, 'end_date').deleted]
+    clear_rollup_cache(min(start_dates), max(end_dates))
@@ -0,0 +1,81 @@
+"""
+Claims-based authorization.
+
+Access tokens issued by LoginResource and UserResource carry the user's
+role as a signed claim, so resources do not need to load the User row to
+authorize a request. Setting AUTH_ROLE_CACHE_TTL to a number of seconds
+makes the role come from the database instead, cached per user for that
+long, so demotions take effect before the token expires. Tokens without
+a role claim always fall back to the database.
+"""
+from functools import wraps
+from threading import Lock
+import time
+from flask import current_app
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from models import db, User
+from Services.metrics import record_cache
+
+_role_cache = {}
+_role_lock = Lock()
+
+
+def _lookup_role(user_id, ttl):
+    key = str(user_id)
+    now = time.monotonic()
+    if ttl:
+        with _role_lock:
+            entry = _role_cache.get(key)
+        hit = entry is not None and entry[1] > now
+        record_cache('auth_roles', hit)
+        if hit:
+            return entry[0]
+
+    row = db.session.query(User.role).filter(User.user_id == user_id).first()
+    role = row[0] if row else None
+
+    if ttl:
+        with _role_lock:
+            _role_cache[key] = (role, now + ttl)
+    return role
+
+
+def clear_role_cache(user_id=None):
+    """
+    Forget cached roles, for one user or for everyone.
+    """
+    with _role_lock:
+        if user_id is None:
+            _role_cache.clear()
+        else:
+            _role_cache.pop(str(user_id), None)
+
+
+def current_role():
+    """
+    Role of the user making the request, or None if the user no longer exists.
+    """
+    ttl = current_app.config.get('AUTH_ROLE_CACHE_TTL', 0)
+    role = get_jwt().get('role')
+    if ttl or role is None:
+        role = _lookup_role(get_jwt_identity(), ttl)
+    return role
+
+
+def role_required(*roles, message='Access denied'):
+    """
+    Require a valid access token and, when roles are given, one of those roles.
+    Without roles any authenticated user is allowed through.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        @jwt_required()
+        def wrapper(*args, **kwargs):
+            role = current_role()
+            if role is None:
+                return {'message': 'User not found'}, 404
+            if roles and role not in roles:
+                return {'message': message}, 403
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,31 @@
+"""
+Connection settings for SQLite.
+
+SQLite's default rollback journal blocks readers while a write commits and
+fails immediately with "database is locked" under concurrent writers.
+WAL mode lets readers continue during writes, and busy_timeout makes
+writers wait for the lock instead of failing.
+"""
+import sqlite3
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SQLITE_BUSY_TIMEOUT_MS = 5000
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+    cursor.close()
+
+
+def init_db_tuning(app):
+    """
+    Apply the SQLite pragmas to every new connection.
+    """
+    if not event.contains(Engine, 'connect', _set_sqlite_pragmas):
+        event.listen(Engine, 'connect', _set_sqlite_pragmas)
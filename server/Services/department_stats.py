@@ -0,0 +1,124 @@
+"""
+Department headcount and cost rollup.
+
+Headcount and annual salary come from one GROUP BY over Employee, and the
+payroll cost of the latest pay period from one GROUP BY over Payroll
+joined to Employee. The result is cached in-process until a transaction
+that wrote Employee, Payroll or Department rows commits, whether through
+the ORM or through bulk statements such as the payroll run, and for at
+most DEPARTMENT_STATS_TTL seconds to bound staleness from other workers.
+"""
+from threading import Lock
+import time
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session, object_session
+from models import db, Department, Employee, Payroll
+from Services.metrics import record_cache
+
+DEPARTMENT_STATS_TTL = 60
+
+_DIRTY_KEY = 'department_stats_dirty'
+_WATCHED_TABLES = {Employee.__tablename__, Payroll.__tablename__, Department.__tablename__}
+
+_stats = None
+_lock = Lock()
+
+
+def clear_department_stats():
+    global _stats
+    with _lock:
+        _stats = None
+
+
+def _compute():
+    headcounts = db.session.query(
+        Employee.department_id, func.count(Employee.employee_id), func.sum(Employee.salary)
+    ).group_by(Employee.department_id).all()
+
+    last_pay_date = db.session.query(func.max(Payroll.pay_date)).scalar()
+    payroll_costs = {}
+    if last_pay_date is not None:
+        payroll_costs = dict(
+            db.session.query(Employee.department_id, func.sum(Payroll.total_pay)).join(
+                Employee, Payroll.employee_id == Employee.employee_id
+            ).filter(Payroll.pay_date == last_pay_date).group_by(Employee.department_id).all()
+        )
+
+    departments = db.session.query(Department.department_id, Department.department_name).order_by(
+        Department.department_id
+    ).all()
+    employees = {department_id: (count, salary) for department_id, count, salary in headcounts}
+
+    rows = []
+    for department_id, department_name in departments + [(None, None)]:
+        count, salary = employees.get(department_id, (0, None))
+        if department_id is None and not count:
+            continue
+        rows.append({
+            'department_id': department_id,
+            'department_name': department_name,
+            'headcount': count,
+            'total_annual_salary': round(salary or 0.0, 2),
+            'last_period_payroll_cost': round(payroll_costs.get(department_id) or 0.0, 2)
+        })
+    return {
+        'last_pay_date': last_pay_date.isoformat() if last_pay_date else None,
+        'departments': rows
+    }
+
+
+def department_stats():
+    """
+    Stats for every department, plus employees without a department.
+    """
+    global _stats
+    now = time.monotonic()
+    with _lock:
+        cached = _stats
+    hit = cached is not None and cached[1] > now
+    record_cache('department_stats', hit)
+    if hit:
+        return cached[0]
+
+    stats = _compute()
+    with _lock:
+        _stats = (stats, now + DEPARTMENT_STATS_TTL)
+    return stats
+
+
+def _mark_dirty(session):
+    if session is not None:
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Employee, 'after_insert')
+@event.listens_for(Employee, 'after_update')
+@event.listens_for(Employee, 'after_delete')
+@event.listens_for(Payroll, 'after_insert')
+@event.listens_for(Payroll, 'after_update')
+@event.listens_for(Payroll, 'after_delete')
+@event.listens_for(Department, 'after_insert')
+@event.listens_for(Department, 'after_update')
+@event.listens_for(Department, 'after_delete')
+def _row_written(mapper, connection, target):
+    _mark_dirty(object_session(target))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _bulk_statement(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if getattr(table, 'name', None) in _WATCHED_TABLES:
+        _mark_dirty(orm_execute_state.session)
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    if session.info.pop(_DIRTY_KEY, False):
+        clear_department_stats()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop(_DIRTY_KEY, None)
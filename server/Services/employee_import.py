@@ -0,0 +1,227 @@
+"""
+Bulk employee onboarding.
+
+Validates a batch of employee rows, checks email and phone uniqueness for
+the whole batch with one query per LOOKUP_CHUNK_SIZE rows, hashes every
+password on the process pool and inserts Employee and User rows with one
+executemany each per chunk. Each chunk is its own transaction, so a
+failed chunk only fails its rows and earlier chunks stay committed. Every
+input row gets an entry in the returned report.
+"""
+from datetime import datetime
+import re
+from sqlalchemy import insert, literal
+from models import db, Department, Employee, User
+from Services.attendance_rollup import clear_rollup_cache
+from Services.employee_lookup import clear_employee_cache, LOOKUP_CHUNK_SIZE
+from Services.password_hashing import password_hasher
+
+IMPORT_CHUNK_SIZE = 500
+MAX_IMPORT_ROWS = 10000
+
+REQUIRED_FIELDS = ('first_name', 'last_name', 'date_of_birth', 'phone', 'email', 'gender',
+                   'address', 'hire_date', 'position', 'salary', 'password')
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_PATTERN = re.compile(r'^\+?\d{7,12}$')
+
+# Same position to role mapping as single registration
+ROLE_MAPPING = {
+    'admin': 'admin',
+    'manager': 'manager',
+    'hr': 'hr'
+}
+
+# Admin accounts are only created one at a time through /register
+BATCH_ROLES = ('employee', 'manager', 'hr')
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _validate(record):
+    """
+    Return (values, None) for a valid record or (None, error message).
+    """
+    if not isinstance(record, dict):
+        return None, 'Row must be an object'
+
+    for field in REQUIRED_FIELDS:
+        if _blank(record.get(field)):
+            return None, f'{field} is required'
+
+    values = {field: str(record[field]).strip() for field in REQUIRED_FIELDS if field != 'password'}
+    values['password'] = str(record['password'])
+
+    if not _blank(record.get('confirm_password')) and record['confirm_password'] != record['password']:
+        return None, 'Passwords do not match'
+    if not EMAIL_PATTERN.match(values['email']):
+        return None, 'Invalid email address'
+    if not PHONE_PATTERN.match(values['phone']):
+        return None, 'Invalid phone number'
+
+    try:
+        values['date_of_birth'] = datetime.strptime(values['date_of_birth'], '%Y-%m-%d').date()
+        values['hire_date'] = datetime.strptime(values['hire_date'], '%Y-%m-%d').date()
+    except ValueError:
+        return None, 'Invalid date format. Use YYYY-MM-DD'
+
+    try:
+        values['salary'] = float(values['salary'])
+    except ValueError:
+        return None, 'Salary must be a number'
+
+    values['department_id'] = None
+    if not _blank(record.get('department_id')):
+        try:
+            values['department_id'] = int(record['department_id'])
+        except (TypeError, ValueError):
+            return None, 'Department ID must be an integer'
+    if values['position'].lower() == 'manager' and values['department_id'] is None:
+        return None, 'Department ID is required for manager position'
+
+    values['role'] = str(record['role']).strip().lower() if not _blank(record.get('role')) \
+        else ROLE_MAPPING.get(values['position'].lower(), 'employee')
+    if values['role'] == 'admin':
+        return None, 'Admin accounts cannot be registered in bulk'
+    if values['role'] not in BATCH_ROLES:
+        return None, f"Role must be one of: {', '.join(BATCH_ROLES)}"
+    return values, None
+
+
+def _taken_contacts(emails, phones):
+    """
+    (emails, phones) already used by an employee or a user, one query per chunk.
+    """
+    emails, phones = list(emails), list(phones)
+    taken = {'email': set(), 'phone': set()}
+    for offset in range(0, max(len(emails), len(phones)), LOOKUP_CHUNK_SIZE):
+        email_chunk = emails[offset:offset + LOOKUP_CHUNK_SIZE]
+        phone_chunk = phones[offset:offset + LOOKUP_CHUNK_SIZE]
+        employee_emails = db.session.query(literal('email'), Employee.email).filter(Employee.email.in_(email_chunk))
+        user_emails = db.session.query(literal('email'), User.email).filter(User.email.in_(email_chunk))
+        employee_phones = db.session.query(literal('phone'), Employee.phone).filter(Employee.phone.in_(phone_chunk))
+        for field, value in employee_emails.union_all(user_emails, employee_phones):
+            taken[field].add(value)
+    return taken['email'], taken['phone']
+
+
+def _managed_departments(department_ids):
+    """
+    {department_id: manager_id} for the referenced departments that exist.
+    """
+    department_ids = list(department_ids)
+    managers = {}
+    for offset in range(0, len(department_ids), LOOKUP_CHUNK_SIZE):
+        managers.update(
+            db.session.query(Department.department_id, Department.manager_id).filter(
+                Department.department_id.in_(department_ids[offset:offset + LOOKUP_CHUNK_SIZE])
+            )
+        )
+    return managers
+
+
+def import_employees(records, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Register employees with user accounts. Returns (created count, per-row results).
+    """
+    results = [None] * len(records)
+
+    def fail(index, error):
+        results[index] = {'row': index, 'status': 'error', 'error': error}
+
+    valid = []
+    for index, record in enumerate(records):
+        values, error = _validate(record)
+        if error:
+            fail(index, error)
+        else:
+            valid.append((index, values))
+
+    taken_emails, taken_phones = _taken_contacts(
+        {values['email'] for _, values in valid}, {values['phone'] for _, values in valid}
+    )
+    departments = _managed_departments({
+        values['department_id'] for _, values in valid if values['department_id'] is not None
+    })
+
+    pending = []
+    seen_emails, seen_phones, new_managers = set(), set(), set()
+    for index, values in valid:
+        if values['phone'] in taken_phones:
+            fail(index, 'Phone number already exists')
+        elif values['email'] in taken_emails:
+            fail(index, 'Email address already exists')
+        elif values['phone'] in seen_phones:
+            fail(index, 'Phone number appears earlier in the batch')
+        elif values['email'] in seen_emails:
+            fail(index, 'Email address appears earlier in the batch')
+        elif values['department_id'] is not None and values['department_id'] not in departments:
+            fail(index, 'Invalid department ID')
+        elif values['position'].lower() == 'manager' and (
+                departments[values['department_id']] is not None or values['department_id'] in new_managers):
+            fail(index, 'Department already has a manager')
+        else:
+            seen_emails.add(values['email'])
+            seen_phones.add(values['phone'])
+            if values['position'].lower() == 'manager':
+                new_managers.add(values['department_id'])
+            pending.append((index, values))
+
+    hashes = password_hasher.hash_many(values.pop('password') for _, values in pending)
+    for (_, values), password_hash in zip(pending, hashes):
+        values['password_hash'] = password_hash
+
+    employee_columns = ('first_name', 'last_name', 'date_of_birth', 'phone', 'email', 'gender',
+                        'address', 'hire_date', 'position', 'salary', 'department_id')
+    insert_employees = insert(Employee).returning(Employee.employee_id, sort_by_parameter_order=True)
+    insert_users = insert(User).returning(User.user_id, sort_by_parameter_order=True)
+
+    created = 0
+    for offset in range(0, len(pending), chunk_size):
+        chunk = pending[offset:offset + chunk_size]
+        try:
+            employee_ids = db.session.scalars(
+                insert_employees, [{column: values[column] for column in employee_columns} for _, values in chunk]
+            ).all()
+            user_ids = db.session.scalars(insert_users, [
+                {
+                    'username': f"{values['first_name'].capitalize()} {values['last_name'].capitalize()}",
+                    'email': values['email'],
+                    'password': values['password_hash'],
+                    'role': values['role'],
+                    'employee_id': employee_id
+                }
+                for (_, values), employee_id in zip(chunk, employee_ids)
+            ]).all()
+            for (_, values), employee_id in zip(chunk, employee_ids):
+                if values['position'].lower() == 'manager':
+                    db.session.execute(
+                        db.update(Department).where(
+                            Department.department_id == values['department_id'],
+                            Department.manager_id.is_(None)
+                        ).values(manager_id=employee_id)
+                    )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            for index, _ in chunk:
+                fail(index, str(e))
+            continue
+
+        for (index, values), employee_id, user_id in zip(chunk, employee_ids, user_ids):
+            results[index] = {
+                'row': index,
+                'status': 'created',
+                'employee_id': employee_id,
+                'user_id': user_id,
+                'role': values['role']
+            }
+        created += len(chunk)
+
+    # Bulk inserts bypass the ORM events that keep these caches current
+    if created:
+        clear_employee_cache()
+        clear_rollup_cache()
+
+    return created, results
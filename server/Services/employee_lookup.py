@@ -0,0 +1,242 @@
+"""
+Employee name resolution.
+
+Write endpoints accept an employee by "First Last" name. Resolving a name
+hits the (first_name, last_name) index once and the resulting employee
+IDs are kept in an in-process LRU cache. Names that match nobody are
+not cached, so an employee registered through another worker resolves
+at once. Entries are dropped when a transaction that inserted, renamed
+or deleted an Employee with that name commits in this process, and
+expire after NAME_CACHE_TTL seconds, which bounds staleness from writes
+made by other workers.
+"""
+from collections import OrderedDict
+from threading import Lock
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+from models import db, Employee
+from Services.metrics import record_cache
+
+NAME_CACHE_SIZE = 10000
+NAME_CACHE_TTL = 300
+LOOKUP_CHUNK_SIZE = 500
+
+_NAMES_KEY = 'employee_names_written'
+
+
+class EmployeeLookupError(Exception):
+    """
+    Raised when an employee name cannot be resolved to exactly one employee.
+    Carries the message and HTTP status the resources return.
+    """
+    status = 400
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+class InvalidEmployeeName(EmployeeLookupError):
+    status = 400
+
+
+class EmployeeNotFound(EmployeeLookupError):
+    status = 404
+
+
+class AmbiguousEmployeeName(EmployeeLookupError):
+    status = 409
+
+
+_cache = OrderedDict()
+_lock = Lock()
+
+
+def split_employee_name(employee_name):
+    """
+    Split "First Last" into (first_name, last_name). Everything after the
+    first word is the last name, so multi-word last names are kept.
+    """
+    names = (employee_name or '').split()
+    if len(names) < 2:
+        raise InvalidEmployeeName('Please provide both first and last name')
+    return names[0], ' '.join(names[1:])
+
+
+def _lookup(key):
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            record_cache('employee_names', False)
+            return None
+        employee_ids, expires_at = entry
+        if expires_at < time.monotonic():
+            del _cache[key]
+            record_cache('employee_names', False)
+            return None
+        _cache.move_to_end(key)
+    record_cache('employee_names', True)
+    return employee_ids
+
+
+def _store(key, employee_ids):
+    if not employee_ids:
+        return
+    with _lock:
+        _cache[key] = (employee_ids, time.monotonic() + NAME_CACHE_TTL)
+        _cache.move_to_end(key)
+        while len(_cache) > NAME_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def find_employee_ids(first_name, last_name):
+    """
+    Return the IDs of every employee with exactly this name.
+    """
+    key = (first_name, last_name)
+    employee_ids = _lookup(key)
+    if employee_ids is None:
+        employee_ids = tuple(
+            employee_id for (employee_id,) in db.session.query(Employee.employee_id).filter(
+                Employee.first_name == first_name,
+                Employee.last_name == last_name
+            ).order_by(Employee.employee_id)
+        )
+        _store(key, employee_ids)
+    return employee_ids
+
+
+def resolve_employee(employee_name):
+    """
+    Resolve "First Last" to (employee_id, first_name, last_name).
+    Raises an EmployeeLookupError subclass when the name is malformed,
+    unknown, or shared by several employees.
+    """
+    first_name, last_name = split_employee_name(employee_name)
+    employee_ids = find_employee_ids(first_name, last_name)
+
+    if not employee_ids:
+        raise EmployeeNotFound('Employee not found')
+    if len(employee_ids) > 1:
+        raise AmbiguousEmployeeName(
+            f'{len(employee_ids)} employees are named {first_name} {last_name}; '
+            'use the employee ID instead'
+        )
+    return employee_ids[0], first_name, last_name
+
+
+def resolve_employee_reference(employee_id=None, employee_name=None):
+    """
+    Resolve an employee given by ID or, when no ID is given, by "First Last"
+    name. Returns (employee_id, first_name, last_name) like resolve_employee.
+    """
+    if employee_id is None:
+        if not employee_name:
+            raise InvalidEmployeeName('Employee ID or employee name is required')
+        return resolve_employee(employee_name)
+
+    employee = db.session.query(Employee.first_name, Employee.last_name).filter(
+        Employee.employee_id == employee_id
+    ).first()
+    if employee is None:
+        raise EmployeeNotFound('Employee not found')
+    return employee_id, employee.first_name, employee.last_name
+
+
+def resolve_employees(employee_names):
+    """
+    Resolve many "First Last" names with one query per LOOKUP_CHUNK_SIZE
+    names that are not cached. Returns a dict mapping each name to either
+    (employee_id, first_name, last_name) or the EmployeeLookupError for it.
+    """
+    results = {}
+    keys = {}
+    for employee_name in set(employee_names):
+        try:
+            keys[employee_name] = split_employee_name(employee_name)
+        except EmployeeLookupError as e:
+            results[employee_name] = e
+
+    found = {key: _lookup(key) for key in set(keys.values())}
+    missing = [key for key, employee_ids in found.items() if employee_ids is None]
+    matches = {key: [] for key in missing}
+    # Chunked to stay under the database's bound parameter limit
+    for offset in range(0, len(missing), LOOKUP_CHUNK_SIZE):
+        chunk = missing[offset:offset + LOOKUP_CHUNK_SIZE]
+        rows = db.session.query(
+            Employee.employee_id, Employee.first_name, Employee.last_name
+        ).filter(
+            Employee.first_name.in_({first for first, _ in chunk}),
+            Employee.last_name.in_({last for _, last in chunk})
+        ).order_by(Employee.employee_id)
+        for employee_id, first_name, last_name in rows:
+            key = (first_name, last_name)
+            if key in matches and employee_id not in matches[key]:
+                matches[key].append(employee_id)
+    for key, employee_ids in matches.items():
+        found[key] = tuple(sorted(employee_ids))
+        _store(key, found[key])
+
+    for employee_name, (first_name, last_name) in keys.items():
+        employee_ids = found[(first_name, last_name)]
+        if not employee_ids:
+            results[employee_name] = EmployeeNotFound('Employee not found')
+        elif len(employee_ids) > 1:
+            results[employee_name] = AmbiguousEmployeeName(
+                f'{len(employee_ids)} employees are named {first_name} {last_name}; '
+                'use the employee ID instead'
+            )
+        else:
+            results[employee_name] = (employee_ids[0], first_name, last_name)
+    return results
+
+
+def invalidate_employee_name(first_name, last_name):
+    with _lock:
+        _cache.pop((first_name, last_name), None)
+
+
+def clear_employee_cache():
+    """
+    Drop every cached name, e.g. after bulk inserts that bypass ORM events.
+    """
+    with _lock:
+        _cache.clear()
+
+
+def _names_written(target):
+    session = object_session(target)
+    if session is None:
+        return set()
+    return session.info.setdefault(_NAMES_KEY, set())
+
+
+@event.listens_for(Employee, 'after_insert')
+@event.listens_for(Employee, 'after_delete')
+def _current_name_written(mapper, connection, target):
+    _names_written(target).add((target.first_name, target.last_name))
+
+
+@event.listens_for(Employee, 'after_update')
+def _renamed(mapper, connection, target):
+    first_names = set(get_history(target, 'first_name').sum()) | {target.first_name}
+    last_names = set(get_history(target, 'last_name').sum()) | {target.last_name}
+    names = _names_written(target)
+    for first_name in first_names:
+        for last_name in last_names:
+            names.add((first_name, last_name))
+
+
+# Dropped only once the rows are visible, so a lookup between the flush
+# and the commit cannot cache the old result again
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    for first_name, last_name in session.info.pop(_NAMES_KEY, ()):
+        invalidate_employee_name(first_name, last_name)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop(_NAMES_KEY, None)
@@ -0,0 +1,164 @@
+"""
+Leave balance ledger.
+
+LeaveBalance keeps one row per employee and leave type. Every write to a
+Leave is applied to it as a delta in the same transaction, so reading a
+balance is a primary key lookup no matter how much leave history exists.
+Approved leave counts as used, leave in any other active status as
+pending, and rejected or cancelled leave as neither. Entitlements are
+credited monthly by the `flask accrue-leave` command.
+"""
+from calendar import monthrange
+from datetime import date, datetime
+import click
+from sqlalchemy import literal, or_, select
+from models import db, Employee, LeaveBalance
+from Services.leave_intervals import INACTIVE_STATUSES
+from Services.upsert import insert_ignore
+
+APPROVED_STATUS = 'Approved'
+
+# Days credited per year for each leave type, one twelfth every month
+ANNUAL_ENTITLEMENTS = {
+    'Vacation': 21.0,
+    'Sick Leave': 10.0,
+    'Personal Leave': 3.0,
+}
+
+BALANCE_KEY = ['employee_id', 'leave_type']
+
+
+def leave_days(start_date, end_date):
+    """
+    Calendar days covered by a leave, counting both ends.
+    """
+    return (end_date - start_date).days + 1
+
+
+def snapshot(leave):
+    """
+    The fields of a leave that affect balances. Take one before changing a
+    leave and pass it to apply_leave_change together with one taken after.
+    """
+    return (leave.employee_id, leave.leave_type, leave.status, leave.start_date, leave.end_date)
+
+
+def _ensure_balance_rows(keys):
+    if not keys:
+        return
+    db.session.execute(
+        insert_ignore(LeaveBalance.__table__, BALANCE_KEY),
+        [
+            {'employee_id': employee_id, 'leave_type': leave_type,
+             'accrued_days': 0.0, 'used_days': 0.0, 'pending_days': 0.0}
+            for employee_id, leave_type in keys
+        ]
+    )
+
+
+def apply_leave_change(before, after):
+    """
+    Move the balances from the before snapshot of a leave to the after
+    snapshot. Pass None as before for a new leave and as after for a
+    deleted one. Runs in the caller's transaction; the caller commits.
+    """
+    deltas = {}
+    for state, sign in ((before, -1), (after, 1)):
+        if state is None:
+            continue
+        employee_id, leave_type, status, start_date, end_date = state
+        if status in INACTIVE_STATUSES:
+            continue
+        column = 'used_days' if status == APPROVED_STATUS else 'pending_days'
+        columns = deltas.setdefault((employee_id, leave_type), {})
+        columns[column] = columns.get(column, 0) + sign * leave_days(start_date, end_date)
+
+    deltas = {
+        key: {column: days for column, days in columns.items() if days}
+        for key, columns in deltas.items()
+    }
+    deltas = {key: columns for key, columns in deltas.items() if columns}
+    _ensure_balance_rows(list(deltas))
+
+    for (employee_id, leave_type), columns in deltas.items():
+        db.session.execute(
+            db.update(LeaveBalance).where(
+                LeaveBalance.employee_id == employee_id,
+                LeaveBalance.leave_type == leave_type
+            ).values({
+                column: getattr(LeaveBalance, column) + days for column, days in columns.items()
+            })
+        )
+
+
+def get_balance(employee_id, leave_type):
+    """
+    Balance of one employee for one leave type, or None if nothing was
+    ever credited or taken.
+    """
+    return db.session.get(LeaveBalance, (employee_id, leave_type))
+
+
+def accrue_leave(month, entitlements=None):
+    """
+    Credit one month of entitlement to every employee hired by the end of
+    month. Rows already credited for this month are skipped, so running
+    the job twice is harmless. Two statements per leave type; the caller
+    commits. Returns the number of balances credited per leave type.
+    """
+    entitlements = ANNUAL_ENTITLEMENTS if entitlements is None else entitlements
+    month_start = month.replace(day=1)
+    month_end = month_start.replace(day=monthrange(month_start.year, month_start.month)[1])
+    eligible = select(Employee.employee_id).where(Employee.hire_date <= month_end)
+
+    credited = {}
+    for leave_type, annual_days in entitlements.items():
+        new_rows = select(
+            Employee.employee_id, literal(leave_type), literal(0.0), literal(0.0), literal(0.0)
+        ).where(Employee.hire_date <= month_end)
+        db.session.execute(
+            insert_ignore(LeaveBalance.__table__, BALANCE_KEY).from_select(
+                ['employee_id', 'leave_type', 'accrued_days', 'used_days', 'pending_days'], new_rows
+            )
+        )
+        result = db.session.execute(
+            db.update(LeaveBalance).where(
+                LeaveBalance.leave_type == leave_type,
+                LeaveBalance.employee_id.in_(eligible),
+                or_(LeaveBalance.accrued_through.is_(None), LeaveBalance.accrued_through < month_start)
+            ).values(
+                accrued_days=LeaveBalance.accrued_days + round(annual_days / 12, 4),
+                accrued_through=month_start
+            ).execution_options(synchronize_session=False)
+        )
+        credited[leave_type] = result.rowcount
+    return credited
+
+
+@click.command('accrue-leave')
+@click.option('--month', help='Month to credit as YYYY-MM (defaults to the current month)')
+def accrue_leave_command(month):
+    """
+    Credit the monthly leave entitlement to every employee.
+    """
+    try:
+        month = datetime.strptime(month, '%Y-%m').date() if month else date.today()
+    except ValueError:
+        raise click.BadParameter('Month must be in format YYYY-MM', param_hint='--month')
+
+    try:
+        credited = accrue_leave(month)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    for leave_type, count in credited.items():
+        click.echo(f'{leave_type}: credited {count} balances')
+
+
+def init_leave_balance(app):
+    """
+    Register the accrual command on the flask CLI.
+    """
+    app.cli.add_command(accrue_leave_command)
@@ -0,0 +1,74 @@
+"""
+Interval queries over Leave.
+
+Two ranges overlap when each starts on or before the other ends. The
+(employee_id, start_date, end_date) index narrows that to the employee's
+overlapping leaves, and only those rows are read to check their status.
+Leaves in INACTIVE_STATUSES no longer reserve their dates.
+
+An overlap check and the write that follows it must run in one
+transaction after lock_leave_dates(), or two concurrent requests can
+both pass the check.
+"""
+from sqlalchemy import select, update
+from models import db, Employee, Leave
+
+INACTIVE_STATUSES = ('Rejected', 'Cancelled')
+
+
+def overlapping(query, start_date, end_date):
+    """
+    Restrict a Leave query to leaves that share a day with [start_date, end_date].
+    """
+    return query.filter(Leave.start_date <= end_date, Leave.end_date >= start_date)
+
+
+def lock_leave_dates(employee_id):
+    """
+    Serialise leave writes for employee_id until the current transaction
+    ends. Call it before find_overlapping_leave.
+    """
+    employees = Employee.__table__
+    with db.session.no_autoflush:
+        if db.session.get_bind().dialect.name == 'sqlite':
+            # SQLite has no row locks. Writing first takes the database
+            # write lock up front, like BEGIN IMMEDIATE, and holds it until
+            # commit; other writers wait for it through busy_timeout.
+            db.session.execute(
+                update(employees).where(employees.c.employee_id == employee_id)
+                .values(employee_id=employees.c.employee_id)
+            )
+        else:
+            db.session.execute(
+                select(employees.c.employee_id).where(employees.c.employee_id == employee_id).with_for_update()
+            )
+
+
+def find_overlapping_leave(employee_id, start_date, end_date, exclude_leave_id=None):
+    """
+    Return the first active leave of employee_id that overlaps the range, or None.
+    """
+    query = overlapping(Leave.query.filter(Leave.employee_id == employee_id), start_date, end_date)
+    query = query.filter(Leave.status.notin_(INACTIVE_STATUSES))
+    if exclude_leave_id is not None:
+        query = query.filter(Leave.leave_id != exclude_leave_id)
+    return query.order_by(Leave.start_date).first()
+
+
+def leave_calendar(start_date, end_date, department_id=None, status=None):
+    """
+    Every leave overlapping the window, with the employee's name and
+    department, from one query joined to Employee.
+    """
+    query = db.session.query(
+        Leave.leave_id, Leave.employee_id, Employee.first_name, Employee.last_name,
+        Employee.department_id, Leave.leave_type, Leave.start_date, Leave.end_date, Leave.status
+    ).join(Employee, Leave.employee_id == Employee.employee_id)
+    query = overlapping(query, start_date, end_date)
+    if department_id is not None:
+        query = query.filter(Employee.department_id == department_id)
+    if status:
+        query = query.filter(Leave.status == status)
+    else:
+        query = query.filter(Leave.status.notin_(INACTIVE_STATUSES))
+    return query.order_by(Leave.start_date, Leave.employee_id).all()
@@ -0,0 +1,140 @@
+"""
+Prometheus metrics.
+
+GET /metrics serves, in the Prometheus text format:
+
+- payroll_http_requests_total and payroll_http_request_duration_seconds,
+  labelled by Flask-RESTful resource, HTTP method and (for the counter)
+  status code,
+- payroll_db_pool_* gauges from the SQLAlchemy connection pool, updated
+  after every request,
+- payroll_cache_lookups_total per in-process cache and result, with the
+  derived payroll_cache_hit_ratio.
+
+With several worker processes, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory shared by the workers before they start. Every worker then
+writes its samples to memory-mapped files there and /metrics aggregates
+all of them, whichever worker serves the scrape. Clear the directory on
+deploy, and with gunicorn call
+prometheus_client.multiprocess.mark_process_dead(worker.pid) from the
+child_exit hook so gauges of exited workers are dropped.
+
+/metrics is off (404) until METRICS_TOKEN is set, and then every scrape
+has to send "Authorization: Bearer <token>". The samples are collected
+either way.
+"""
+import hmac
+import os
+import time
+from flask import Response, current_app, g, request
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client import generate_latest, multiprocess
+from prometheus_client.core import GaugeMetricFamily
+from models import db
+from Services.query_stats import resource_name
+
+REQUESTS = Counter(
+    'payroll_http_requests', 'HTTP requests handled', ['resource', 'method', 'status']
+)
+REQUEST_DURATION = Histogram(
+    'payroll_http_request_duration_seconds', 'Time to handle an HTTP request', ['resource', 'method']
+)
+CACHE_LOOKUPS = Counter(
+    'payroll_cache_lookups', 'In-process cache lookups', ['cache', 'result']
+)
+
+# Summed over live workers in multiprocess mode
+POOL_SIZE = Gauge('payroll_db_pool_size', 'Connections the pool keeps open', multiprocess_mode='livesum')
+POOL_CHECKED_OUT = Gauge('payroll_db_pool_checked_out', 'Connections in use', multiprocess_mode='livesum')
+POOL_CHECKED_IN = Gauge('payroll_db_pool_checked_in', 'Idle connections in the pool', multiprocess_mode='livesum')
+POOL_OVERFLOW = Gauge('payroll_db_pool_overflow', 'Connections open beyond the pool size',
+                      multiprocess_mode='livesum')
+
+
+def record_cache(cache, hit):
+    """
+    Count one lookup in the named in-process cache.
+    """
+    CACHE_LOOKUPS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+def _pool_gauges():
+    pool = db.engine.pool
+    # SingletonThreadPool and NullPool do not report sizes
+    for gauge, method in ((POOL_SIZE, 'size'), (POOL_CHECKED_OUT, 'checkedout'),
+                          (POOL_CHECKED_IN, 'checkedin'), (POOL_OVERFLOW, 'overflow')):
+        if hasattr(pool, method):
+            gauge.set(getattr(pool, method)())
+
+
+def _observe(response):
+    started = g.get('request_started')
+    if started is not None:
+        resource, method = resource_name(), request.method
+        REQUESTS.labels(resource, method, str(response.status_code)).inc()
+        REQUEST_DURATION.labels(resource, method).observe(time.perf_counter() - started)
+    _pool_gauges()
+    return response
+
+
+class _Snapshot:
+    """
+    Serves already collected metric families to generate_latest.
+    """
+
+    def __init__(self, families):
+        self.families = families
+
+    def collect(self):
+        return self.families
+
+
+def _hit_ratios(families):
+    lookups = {}
+    for family in families:
+        if family.name != 'payroll_cache_lookups':
+            continue
+        for sample in family.samples:
+            if sample.name.endswith('_total'):
+                counts = lookups.setdefault(sample.labels['cache'], {})
+                counts[sample.labels['result']] = counts.get(sample.labels['result'], 0) + sample.value
+
+    ratio = GaugeMetricFamily('payroll_cache_hit_ratio', 'Share of cache lookups that were hits', labels=['cache'])
+    for cache, counts in sorted(lookups.items()):
+        total = counts.get('hit', 0) + counts.get('miss', 0)
+        if total:
+            ratio.add_metric([cache], counts.get('hit', 0) / total)
+    return ratio
+
+
+def metrics_view():
+    token = current_app.config.get('METRICS_TOKEN')
+    if not token:
+        return Response('Not Found\n', status=404, mimetype='text/plain')
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return Response('Unauthorized\n', status=401, mimetype='text/plain')
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    families = list(registry.collect())
+    families.append(_hit_ratios(families))
+
+    snapshot = CollectorRegistry(auto_describe=False)
+    snapshot.register(_Snapshot(families))
+    return Response(generate_latest(snapshot), content_type=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app):
+    """
+    Register the request hooks and the /metrics route.
+    """
+    app.before_request(_start_timer)
+    app.after_request(_observe)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
@@ -0,0 +1,123 @@
+"""
+Org hierarchy queries over Employee.supervisor_id.
+
+A manager's whole subtree is read with one recursive CTE that walks the
+supervisor_id index level by level inside the database, instead of one
+lazy load of `subordinates` per node. Each row carries the path of
+employee ids that led to it, and the walk never steps onto an id already
+on its path, so supervisor links that form a cycle end the walk instead
+of listing (and counting) employees twice. MAX_ORG_DEPTH caps the depth.
+"""
+from sqlalchemy import String, case, cast, func, literal, select
+from models import db, Employee
+
+MAX_ORG_DEPTH = 10000
+
+
+def _subtree(manager_id, max_depth, columns):
+    """
+    Recursive CTE of the manager (depth 0) and every transitive report,
+    each employee exactly once.
+    """
+    # Visited ids as '/1/5/9/', so a revisit is a substring match
+    node_id = cast(Employee.employee_id, String)
+    base = select(
+        Employee.employee_id, Employee.supervisor_id, literal(0).label('depth'),
+        ('/' + node_id + '/').label('path'), *columns
+    ).where(Employee.employee_id == manager_id).cte('subtree', recursive=True)
+    reports = select(
+        Employee.employee_id, Employee.supervisor_id, (base.c.depth + 1).label('depth'),
+        (base.c.path + node_id + '/').label('path'), *columns
+    ).join(base, Employee.supervisor_id == base.c.employee_id).where(
+        base.c.depth < max_depth,
+        base.c.path.notlike('%/' + node_id + '/%')
+    )
+    return base.union_all(reports)
+
+
+def subtree_summary(manager_id, max_depth=MAX_ORG_DEPTH):
+    """
+    Aggregates for a manager's subtree from one query: the number of direct
+    and transitive reports, the depth below the manager and the salary cost
+    of the reports. Returns None if the employee does not exist.
+    """
+    subtree = _subtree(manager_id, max_depth, (Employee.salary,))
+    is_report = subtree.c.depth > 0
+    row = db.session.execute(
+        select(
+            func.count(),
+            func.sum(case((subtree.c.depth == 1, 1), else_=0)),
+            func.sum(case((is_report, 1), else_=0)),
+            func.max(subtree.c.depth),
+            func.sum(case((is_report, subtree.c.salary), else_=0.0)),
+            func.sum(subtree.c.salary)
+        ).select_from(subtree)
+    ).one()
+    nodes, direct, total, depth, reports_salary, total_salary = row
+    if not nodes:
+        return None
+    return {
+        'employee_id': manager_id,
+        'span_of_control': int(direct or 0),
+        'total_reports': int(total or 0),
+        'depth': int(depth or 0),
+        'reports_salary': round(reports_salary or 0.0, 2),
+        'total_salary': round(total_salary or 0.0, 2)
+    }
+
+
+def subtree_reports(manager_id, max_depth=MAX_ORG_DEPTH):
+    """
+    The manager and every transitive report from one query, with depth,
+    span of control and rolled-up salary per node computed from the rows.
+    Returns (summary, reports) or (None, []) if the employee does not exist.
+    """
+    subtree = _subtree(manager_id, max_depth, (
+        Employee.first_name, Employee.last_name, Employee.position,
+        Employee.department_id, Employee.salary
+    ))
+    rows = db.session.execute(
+        select(subtree).order_by(subtree.c.depth, subtree.c.employee_id)
+    ).all()
+    if not rows:
+        return None, []
+
+    nodes = {}
+    for row in rows:
+        nodes[row.employee_id] = {
+            'employee_id': row.employee_id,
+            'supervisor_id': row.supervisor_id,
+            'name': f"{row.first_name} {row.last_name}",
+            'position': row.position,
+            'department_id': row.department_id,
+            'depth': row.depth,
+            'salary': row.salary,
+            'span_of_control': 0,
+            'total_reports': 0,
+            'rolled_up_salary': row.salary
+        }
+
+    # Rows are ordered by depth, so walking them backwards visits every
+    # node after all of its reports
+    for row in reversed(rows):
+        if row.depth == 0:
+            continue
+        node, parent = nodes[row.employee_id], nodes[row.supervisor_id]
+        parent['span_of_control'] += 1
+        parent['total_reports'] += node['total_reports'] + 1
+        parent['rolled_up_salary'] += node['rolled_up_salary']
+
+    manager = nodes[manager_id]
+    summary = {
+        'employee_id': manager_id,
+        'name': manager['name'],
+        'span_of_control': manager['span_of_control'],
+        'total_reports': manager['total_reports'],
+        'depth': rows[-1].depth,
+        'reports_salary': round(manager['rolled_up_salary'] - manager['salary'], 2),
+        'total_salary': round(manager['rolled_up_salary'], 2)
+    }
+    reports = [node for node in nodes.values() if node['depth'] > 0]
+    for node in reports:
+        node['rolled_up_salary'] = round(node['rolled_up_salary'], 2)
+    return summary, reports
@@ -0,0 +1,86 @@
+"""
+Keyset pagination and common filters for list endpoints.
+
+Pages are ordered by the model's primary key and continued with
+`after=<last primary key>`, so every page costs the same index range scan
+no matter how deep into the history the client is.
+"""
+from datetime import datetime
+from flask_restful import reqparse
+from models import db, Employee
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def iso_date(value):
+    """
+    reqparse type for YYYY-MM-DD query parameters.
+    """
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def list_parser():
+    """
+    Parser for the pagination and filter query parameters shared by list endpoints.
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('limit', type=int, location='args', default=DEFAULT_PAGE_SIZE,
+                        help='Page size must be an integer')
+    parser.add_argument('after', type=int, location='args', help='Cursor must be an integer')
+    parser.add_argument('employee_id', type=int, location='args', help='Employee ID must be an integer')
+    parser.add_argument('department_id', type=int, location='args', help='Department ID must be an integer')
+    parser.add_argument('from', type=iso_date, location='args', help='From date must be in format YYYY-MM-DD')
+    parser.add_argument('to', type=iso_date, location='args', help='To date must be in format YYYY-MM-DD')
+    return parser
+
+
+def apply_filters(query, model, date_column, args, date_value=None):
+    """
+    Apply the employee, department and from/to date filters to query.
+    date_value converts the from/to dates for columns that are not dates
+    (e.g. Tax.year).
+    """
+    convert = date_value or (lambda value: value)
+
+    if args.get('employee_id') is not None:
+        query = query.filter(model.employee_id == args['employee_id'])
+    if args.get('department_id') is not None:
+        department_employees = db.session.query(Employee.employee_id).filter(
+            Employee.department_id == args['department_id']
+        )
+        query = query.filter(model.employee_id.in_(department_employees))
+    if args.get('from') is not None:
+        query = query.filter(date_column >= convert(args['from']))
+    if args.get('to') is not None:
+        query = query.filter(date_column <= convert(args['to']))
+    return query
+
+
+def paginate(query, model, pk_column, date_column, args, date_value=None):
+    """
+    Apply filters and keyset pagination to query.
+    Returns the page items and the cursor for the next page, or None when
+    this is the last page.
+    """
+    query = apply_filters(query, model, date_column, args, date_value)
+    if args.get('after') is not None:
+        query = query.filter(pk_column > args['after'])
+
+    limit = min(max(args.get('limit') or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+
+    # Fetch one extra row to know whether another page exists
+    items = query.order_by(pk_column).limit(limit + 1).all()
+    if len(items) > limit:
+        items = items[:limit]
+        return items, getattr(items[-1], pk_column.key)
+    return items, None
+
+
+def page_headers(next_cursor):
+    """
+    Response headers advertising the cursor of the next page.
+    """
+    if next_cursor is None:
+        return {}
+    return {'X-Next-Cursor': str(next_cursor)}
@@ -0,0 +1,130 @@
+"""
+Bcrypt hashing on a bounded worker pool.
+
+Hashing and checking passwords is deliberately slow, so a login burst run
+inline would occupy every request thread with bcrypt. Instead the work
+goes to a small thread pool (bcrypt releases the GIL while it runs):
+
+- PASSWORD_HASH_WORKERS threads do the hashing (default: one per CPU),
+- at most PASSWORD_HASH_QUEUE_SIZE more requests may wait for a thread;
+  beyond that HasherBusy is raised at once, and resources answer 503
+  with Retry-After instead of piling up,
+- callers wait at most PASSWORD_HASH_TIMEOUT seconds for a result.
+
+New hashes use BCRYPT_LOG_ROUNDS. needs_rehash tells whether a stored
+hash was made with a different cost, so logins can upgrade it.
+
+Bulk imports hash many passwords at once with hash_many, which spreads
+them over a separate pool of PASSWORD_HASH_PROCESSES processes so a large
+batch does not hold up the login pool.
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeout
+import multiprocessing
+import os
+from threading import BoundedSemaphore, Lock
+import bcrypt
+
+DEFAULT_LOG_ROUNDS = 12
+
+
+def _hash_password(password, log_rounds):
+    # Runs in a worker process, so it only depends on bcrypt
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(log_rounds)).decode('utf-8')
+
+
+class HasherBusy(Exception):
+    """
+    Raised when the hashing queue is full or a result took too long.
+    """
+    retry_after = 1
+
+
+class PasswordHasher:
+    def __init__(self):
+        self.log_rounds = DEFAULT_LOG_ROUNDS
+        self.workers = os.cpu_count() or 1
+        self.queue_size = self.workers * 4
+        self.timeout = 10
+        self.processes = os.cpu_count() or 1
+        self._executor = None
+        self._slots = None
+        self._processes = None
+        self._processes_lock = Lock()
+
+    def init_app(self, app):
+        self.log_rounds = app.config.get('BCRYPT_LOG_ROUNDS', DEFAULT_LOG_ROUNDS)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS') or os.cpu_count() or 1
+        self.queue_size = app.config.get('PASSWORD_HASH_QUEUE_SIZE', self.workers * 4)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        self.processes = app.config.get('PASSWORD_HASH_PROCESSES') or os.cpu_count() or 1
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+            self._slots = BoundedSemaphore(self.workers + self.queue_size)
+        return self._executor, self._slots
+
+    def _run(self, fn, *args):
+        executor, slots = self._pool()
+        if not slots.acquire(blocking=False):
+            raise HasherBusy('Too many password checks in progress')
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HasherBusy('Password check timed out')
+
+    def hash(self, password, log_rounds=None):
+        """
+        Bcrypt hash of password as text, using BCRYPT_LOG_ROUNDS by default.
+        """
+        salt = bcrypt.gensalt(log_rounds or self.log_rounds)
+        return self._run(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password_hash, password):
+        """
+        True if password matches password_hash. Malformed hashes never match.
+        """
+        try:
+            return self._run(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+        except ValueError:
+            return False
+
+    def hash_many(self, passwords, log_rounds=None):
+        """
+        Hash many passwords in parallel worker processes, in order.
+        The process pool is started on first use and then reused.
+        """
+        passwords = list(passwords)
+        if not passwords:
+            return []
+        with self._processes_lock:
+            if self._processes is None:
+                # spawn, because forking a threaded web worker can copy held locks
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=multiprocessing.get_context('spawn')
+                )
+            executor = self._processes
+        log_rounds = log_rounds or self.log_rounds
+        chunksize = max(1, len(passwords) // (self.processes * 4))
+        return list(executor.map(
+            _hash_password, passwords, [log_rounds] * len(passwords), chunksize=chunksize
+        ))
+
+    def needs_rehash(self, password_hash):
+        """
+        True if password_hash was not made with the configured cost.
+        """
+        try:
+            return int(password_hash.split('$')[2]) != self.log_rounds
+        except (IndexError, ValueError):
+            return True
+
+
+password_hasher = PasswordHasher()
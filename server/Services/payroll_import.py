@@ -0,0 +1,163 @@
+"""
+Bulk payroll import.
+
+Validates a batch of payroll rows, resolves every employee reference with
+set-based queries and inserts the valid rows with one executemany per
+chunk. Rows for an employee and pay date that already has a record, in
+the database or earlier in the batch, are reported instead of inserted.
+Each chunk runs in a savepoint, so a database error only fails the rows
+of that chunk. Every input row gets an entry in the returned report.
+"""
+import csv
+import io
+from datetime import datetime
+from sqlalchemy import tuple_
+from models import db, Employee, Payroll
+from Services.employee_lookup import resolve_employees
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_IMPORT_ROWS = 50000
+
+AMOUNT_FIELDS = ('base_salary', 'overtime', 'deductions', 'bonuses')
+
+
+def parse_csv(text):
+    """
+    Read CSV text with a header row into a list of dicts.
+    """
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _validate(record):
+    """
+    Return (values, None) for a valid record or (None, error message).
+    """
+    if not isinstance(record, dict):
+        return None, 'Row must be an object'
+
+    values = {}
+    if not _blank(record.get('employee_id')):
+        try:
+            values['employee_id'] = int(record['employee_id'])
+        except (TypeError, ValueError):
+            return None, 'Employee ID must be an integer'
+    elif not _blank(record.get('employee_name')):
+        values['employee_name'] = str(record['employee_name'])
+    else:
+        return None, 'Employee name or employee ID is required'
+
+    if _blank(record.get('pay_date')):
+        return None, 'Pay date is required'
+    try:
+        values['pay_date'] = datetime.strptime(str(record['pay_date']).strip(), '%Y-%m-%d').date()
+    except ValueError:
+        return None, 'Pay date must be in format YYYY-MM-DD'
+
+    for field in AMOUNT_FIELDS:
+        raw = record.get(field)
+        if _blank(raw):
+            if field == 'base_salary':
+                return None, 'Base salary is required'
+            values[field] = 0.0
+            continue
+        try:
+            values[field] = float(raw)
+        except (TypeError, ValueError):
+            return None, f'{field} must be a number'
+
+    return values, None
+
+
+def _existing_payrolls(keys, chunk_size):
+    """
+    The (employee_id, pay_date) pairs among keys that already have a record.
+    """
+    keys = list(keys)
+    existing = set()
+    for offset in range(0, len(keys), chunk_size):
+        existing.update(
+            db.session.query(Payroll.employee_id, Payroll.pay_date).filter(
+                tuple_(Payroll.employee_id, Payroll.pay_date).in_(keys[offset:offset + chunk_size])
+            )
+        )
+    return existing
+
+
+def import_payroll(records, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import payroll records. Returns (created count, per-row results).
+    """
+    results = [None] * len(records)
+    valid = []
+    for index, record in enumerate(records):
+        values, error = _validate(record)
+        if error:
+            results[index] = {'row': index, 'status': 'error', 'error': error}
+        else:
+            valid.append((index, values))
+
+    # Resolve names and check IDs for the whole batch at once
+    names = resolve_employees(
+        values['employee_name'] for _, values in valid if 'employee_name' in values
+    )
+    requested_ids = list({values['employee_id'] for _, values in valid if 'employee_id' in values})
+    known_ids = set()
+    for offset in range(0, len(requested_ids), chunk_size):
+        known_ids.update(
+            employee_id for (employee_id,) in db.session.query(Employee.employee_id).filter(
+                Employee.employee_id.in_(requested_ids[offset:offset + chunk_size])
+            )
+        )
+
+    pending = []
+    for index, values in valid:
+        if 'employee_name' in values:
+            resolved = names[values.pop('employee_name')]
+            if isinstance(resolved, Exception):
+                results[index] = {'row': index, 'status': 'error', 'error': resolved.message}
+                continue
+            values['employee_id'] = resolved[0]
+        elif values['employee_id'] not in known_ids:
+            results[index] = {'row': index, 'status': 'error', 'error': 'Employee not found'}
+            continue
+
+        values['total_pay'] = values['base_salary'] + values['overtime'] + values['bonuses'] - values['deductions']
+        pending.append((index, values))
+
+    existing = _existing_payrolls({(values['employee_id'], values['pay_date']) for _, values in pending}, chunk_size)
+    unique = []
+    for index, values in pending:
+        key = (values['employee_id'], values['pay_date'])
+        if key in existing:
+            results[index] = {'row': index, 'status': 'error',
+                              'error': 'A payroll record already exists for this employee and pay date'}
+            continue
+        existing.add(key)
+        unique.append((index, values))
+    pending = unique
+
+    created = 0
+    insert_stmt = Payroll.__table__.insert()
+    try:
+        for offset in range(0, len(pending), chunk_size):
+            chunk = pending[offset:offset + chunk_size]
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert_stmt, [values for _, values in chunk])
+            except Exception as e:
+                for index, _ in chunk:
+                    results[index] = {'row': index, 'status': 'error', 'error': str(e)}
+                continue
+            for index, values in chunk:
+                results[index] = {'row': index, 'status': 'created', 'employee_id': values['employee_id']}
+            created += len(chunk)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return created, results
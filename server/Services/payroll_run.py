@@ -0,0 +1,162 @@
+"""
+Payroll run engine.
+
+Computes a whole pay period for every employee with a fixed number of
+set-based queries (one per input table) instead of one request per
+employee, then writes the results with one bulk insert per chunk. The
+unique (employee_id, pay_date) index makes the insert skip anyone an
+overlapping or retried run has already paid.
+"""
+from calendar import monthrange
+from datetime import date
+from sqlalchemy import case, func
+from models import db, Employee, Payroll, Bonus, Tax, Attendance
+from Services.tax_brackets import get_tax_table
+from Services.upsert import insert_ignore
+
+# Pay assumptions shared with seeding.py
+STANDARD_MONTHLY_HOURS = 160
+STANDARD_DAILY_HOURS = 8
+OVERTIME_MULTIPLIER = 1.5
+
+# Rows per executemany call
+DEFAULT_CHUNK_SIZE = 1000
+
+PAYROLL_KEY = ['employee_id', 'pay_date']
+
+
+def period_bounds(pay_date):
+    """
+    Return the first and last day of the month that contains pay_date.
+    """
+    last_day = monthrange(pay_date.year, pay_date.month)[1]
+    return date(pay_date.year, pay_date.month, 1), date(pay_date.year, pay_date.month, last_day)
+
+
+def _bonus_totals(period_start, period_end):
+    """
+    Sum of bonuses per employee awarded inside the period.
+    """
+    rows = db.session.query(
+        Bonus.employee_id, func.sum(Bonus.bonus_amount)
+    ).filter(
+        Bonus.bonus_date >= period_start,
+        Bonus.bonus_date <= period_end
+    ).group_by(Bonus.employee_id)
+    return {employee_id: total or 0.0 for employee_id, total in rows}
+
+
+def _annual_tax(year):
+    """
+    Annual tax amount per employee for the given year.
+    """
+    rows = db.session.query(
+        Tax.employee_id, func.sum(Tax.tax_amount)
+    ).filter(Tax.year == year).group_by(Tax.employee_id)
+    return {employee_id: total or 0.0 for employee_id, total in rows}
+
+
+def _overtime_hours(period_start, period_end):
+    """
+    Hours worked beyond the standard day, summed per employee over the period.
+    """
+    extra_hours = case(
+        (Attendance.work_hours > STANDARD_DAILY_HOURS, Attendance.work_hours - STANDARD_DAILY_HOURS),
+        else_=0.0
+    )
+    rows = db.session.query(
+        Attendance.employee_id, func.sum(extra_hours)
+    ).filter(
+        Attendance.date >= period_start,
+        Attendance.date <= period_end,
+        Attendance.work_hours.isnot(None)
+    ).group_by(Attendance.employee_id)
+    return {employee_id: total or 0.0 for employee_id, total in rows}
+
+
+def compute_payroll(pay_date, department_id=None):
+    """
+    Build Payroll row dictionaries for every employee employed in the
+    period of pay_date, optionally restricted to one department.
+    Employees with a Tax record for the year have a twelfth of it
+    deducted; everyone else is withheld from the year's tax brackets in
+    one batch call.
+    """
+    period_start, period_end = period_bounds(pay_date)
+
+    employees = db.session.query(Employee.employee_id, Employee.salary).filter(
+        Employee.hire_date <= period_end
+    )
+    if department_id is not None:
+        employees = employees.filter(Employee.department_id == department_id)
+
+    bonuses = _bonus_totals(period_start, period_end)
+    annual_tax = _annual_tax(pay_date.year)
+    overtime_hours = _overtime_hours(period_start, period_end)
+
+    rows = []
+    for employee_id, salary in employees:
+        base_salary = round(salary / 12, 2)
+        hourly_rate = base_salary / STANDARD_MONTHLY_HOURS
+        overtime = round(overtime_hours.get(employee_id, 0.0) * hourly_rate * OVERTIME_MULTIPLIER, 2)
+        bonus_total = round(bonuses.get(employee_id, 0.0), 2)
+        rows.append({
+            'employee_id': employee_id,
+            'pay_date': pay_date,
+            'base_salary': base_salary,
+            'overtime': overtime,
+            'deductions': round(annual_tax[employee_id] / 12, 2) if employee_id in annual_tax else None,
+            'bonuses': bonus_total
+        })
+
+    untaxed = [row for row in rows if row['deductions'] is None]
+    if untaxed:
+        withholding = get_tax_table(pay_date.year).withholding_many(
+            row['base_salary'] + row['overtime'] for row in untaxed
+        )
+        for row, deductions in zip(untaxed, withholding):
+            row['deductions'] = deductions
+
+    for row in rows:
+        row['total_pay'] = round(row['base_salary'] + row['overtime'] + row['bonuses'] - row['deductions'], 2)
+    return rows
+
+
+def run_payroll(pay_date, department_id=None, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+    """
+    Compute and persist a payroll run.
+    Employees that already have a Payroll row for pay_date are skipped so a
+    run can safely be repeated, including while another run for the same
+    date is in flight. All chunks are written in one transaction.
+    Returns the summary and the rows actually written.
+    """
+    rows = compute_payroll(pay_date, department_id)
+
+    already_paid = {
+        employee_id for (employee_id,) in
+        db.session.query(Payroll.employee_id).filter(Payroll.pay_date == pay_date)
+    }
+    pending = [row for row in rows if row['employee_id'] not in already_paid]
+
+    if not dry_run:
+        # Rows a concurrent run inserted after the read above conflict on
+        # the unique key and are dropped by the insert itself
+        insert_stmt = insert_ignore(Payroll.__table__, PAYROLL_KEY).returning(Payroll.employee_id)
+        created_ids = set()
+        try:
+            for offset in range(0, len(pending), chunk_size):
+                created_ids.update(db.session.scalars(insert_stmt, pending[offset:offset + chunk_size]))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        pending = [row for row in pending if row['employee_id'] in created_ids]
+
+    summary = {
+        'pay_date': pay_date.isoformat(),
+        'employees': len(rows),
+        'created': 0 if dry_run else len(pending),
+        'skipped': len(rows) - len(pending),
+        'total_pay': round(sum(row['total_pay'] for row in pending), 2)
+    }
+    return summary, pending
@@ -0,0 +1,129 @@
+"""
+Per-request SQL statistics.
+
+Counts and times every statement executed while handling a request and
+reports them in the X-DB-Queries and X-DB-Time-ms response headers, with
+the duration of the slowest statement in X-DB-Slowest-ms, so N+1
+regressions are visible. Statements slower than DB_SLOW_QUERY_MS are
+logged with their SQL.
+
+Each request is also added to in-process totals per Flask-RESTful
+resource and HTTP method, read with get_query_stats(). Streamed responses
+are counted up to the point the headers are sent.
+"""
+from threading import Lock
+import time
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_SLOW_QUERY_MS = 500
+
+# Longest statement text kept for the slowest statement of a resource
+MAX_STATEMENT_LENGTH = 500
+
+_stats = {}
+_lock = Lock()
+
+
+def _start_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g.db_queries = g.get('db_queries', 0) + 1
+        context._query_started = time.perf_counter()
+
+
+def _finish_query(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_query_started', None)
+    if started is None or not has_request_context():
+        return
+    elapsed = time.perf_counter() - started
+    g.db_time = g.get('db_time', 0.0) + elapsed
+    slowest = g.get('db_slowest')
+    if slowest is None or elapsed > slowest[0]:
+        g.db_slowest = (elapsed, statement)
+
+    slow_query_ms = current_app.config.get('DB_SLOW_QUERY_MS', DEFAULT_SLOW_QUERY_MS)
+    if slow_query_ms is not None and elapsed * 1000 >= slow_query_ms:
+        current_app.logger.warning(
+            'Slow query (%.1f ms) on %s %s: %s', elapsed * 1000, request.method, request.path, statement
+        )
+
+
+def resource_name():
+    """
+    Name of the Flask-RESTful resource serving the current request, or the
+    endpoint name for plain views and '<unmatched>' for unknown URLs.
+    """
+    if request.url_rule is None:
+        return '<unmatched>'
+    view_class = getattr(current_app.view_functions.get(request.url_rule.endpoint), 'view_class', None)
+    return view_class.__name__ if view_class is not None else request.url_rule.endpoint
+
+
+def _record(resource, method, queries, db_time, slowest):
+    with _lock:
+        entry = _stats.get((resource, method))
+        if entry is None:
+            entry = _stats[(resource, method)] = {
+                'requests': 0, 'queries': 0, 'db_time': 0.0, 'max_queries': 0,
+                'max_db_time': 0.0, 'slowest_time': 0.0, 'slowest_statement': None
+            }
+        entry['requests'] += 1
+        entry['queries'] += queries
+        entry['db_time'] += db_time
+        entry['max_queries'] = max(entry['max_queries'], queries)
+        entry['max_db_time'] = max(entry['max_db_time'], db_time)
+        if slowest is not None and slowest[0] > entry['slowest_time']:
+            entry['slowest_time'] = slowest[0]
+            entry['slowest_statement'] = slowest[1][:MAX_STATEMENT_LENGTH]
+
+
+def _add_query_headers(response):
+    queries = g.get('db_queries', 0)
+    db_time = g.get('db_time', 0.0)
+    slowest = g.get('db_slowest')
+    response.headers['X-DB-Queries'] = str(queries)
+    response.headers['X-DB-Time-ms'] = f'{db_time * 1000:.2f}'
+    response.headers['X-DB-Slowest-ms'] = f'{slowest[0] * 1000:.2f}' if slowest else '0.00'
+    _record(resource_name(), request.method, queries, db_time, slowest)
+    return response
+
+
+def get_query_stats():
+    """
+    Totals per (resource, method) since the process started or the last reset.
+    """
+    with _lock:
+        entries = sorted(_stats.items())
+    return [
+        {
+            'resource': resource,
+            'method': method,
+            'requests': entry['requests'],
+            'queries': entry['queries'],
+            'mean_queries': round(entry['queries'] / entry['requests'], 2),
+            'max_queries': entry['max_queries'],
+            'db_time_ms': round(entry['db_time'] * 1000, 2),
+            'mean_db_time_ms': round(entry['db_time'] * 1000 / entry['requests'], 2),
+            'max_db_time_ms': round(entry['max_db_time'] * 1000, 2),
+            'slowest_statement_ms': round(entry['slowest_time'] * 1000, 2),
+            'slowest_statement': entry['slowest_statement']
+        }
+        for (resource, method), entry in entries
+    ]
+
+
+def reset_query_stats():
+    with _lock:
+        _stats.clear()
+
+
+def init_query_stats(app):
+    """
+    Register the statement timers and the response header hook.
+    """
+    if not event.contains(Engine, 'before_cursor_execute', _start_query):
+        event.listen(Engine, 'before_cursor_execute', _start_query)
+    if not event.contains(Engine, 'after_cursor_execute', _finish_query):
+        event.listen(Engine, 'after_cursor_execute', _finish_query)
+    app.after_request(_add_query_headers)
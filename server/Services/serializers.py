@@ -0,0 +1,130 @@
+"""
+Precompiled model serializers.
+
+SerializerMixin.to_dict() rediscovers a model's fields, builds a schema and
+dispatches on every value's type for each row it serializes. The models'
+serialization shape never changes at runtime, so compile_serializer()
+resolves it once per model into a tuple of (key, converter) pairs and
+FastSerializerMixin uses that for plain to_dict() calls.
+"""
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import Date, DateTime, Numeric, Time
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy_serializer import SerializerMixin
+
+
+def _date_converter(model):
+    date_format = model.date_format
+    datetime_format = model.datetime_format
+
+    def convert(value):
+        # Date columns may still hold the datetime they were assigned
+        if isinstance(value, datetime):
+            return value.strftime(datetime_format)
+        return value.strftime(date_format)
+    return convert
+
+
+def _datetime_converter(model):
+    datetime_format = model.datetime_format
+
+    def convert(value):
+        return value.strftime(datetime_format)
+    return convert
+
+
+def _time_converter(model):
+    time_format = model.time_format
+
+    def convert(value):
+        return value.strftime(time_format)
+    return convert
+
+
+def _decimal_converter(model):
+    decimal_format = model.decimal_format
+
+    def convert(value):
+        if isinstance(value, Decimal):
+            return decimal_format.format(value)
+        return value
+    return convert
+
+
+def _converter_for(model, column_type):
+    """
+    Return the converter for a column type, or None when values are
+    already JSON compatible (ints, strings, floats, booleans).
+    """
+    if isinstance(column_type, DateTime):
+        return _datetime_converter(model)
+    if isinstance(column_type, Date):
+        return _date_converter(model)
+    if isinstance(column_type, Time):
+        return _time_converter(model)
+    if isinstance(column_type, Numeric) and column_type.asdecimal:
+        return _decimal_converter(model)
+    return None
+
+
+def compile_serializer(model):
+    """
+    Build a serializer function for model that produces the same output as
+    SerializerMixin.to_dict(). Returns None when the model uses serializer
+    features that are not precompiled (serialize_only, nested relationships,
+    excluded values, custom timezones), in which case to_dict() falls back
+    to the reflective serializer.
+    """
+    if model.serialize_only or model.exclude_values or model.serializable_keys \
+            or model.auto_serialize_properties or model.serialize_columns \
+            or model.get_tzinfo is not SerializerMixin.get_tzinfo:
+        return None
+
+    excluded = {rule[1:] for rule in model.serialize_rules if rule.startswith('-')}
+    mapper = sa_inspect(model)
+
+    # Relationships left in the schema need the recursive serializer
+    if any(relationship.key not in excluded for relationship in mapper.relationships):
+        return None
+
+    fields = tuple(
+        (attr.key, _converter_for(model, attr.columns[0].type))
+        for attr in mapper.column_attrs
+        if attr.key not in excluded
+    )
+
+    def serialize(instance):
+        result = {}
+        for key, convert in fields:
+            value = getattr(instance, key)
+            result[key] = value if convert is None or value is None else convert(value)
+        return result
+
+    # Column order, e.g. for CSV headers
+    serialize.fields = tuple(key for key, _ in fields)
+    return serialize
+
+
+class FastSerializerMixin(SerializerMixin):
+    """
+    SerializerMixin whose argument-less to_dict() uses the serializer
+    compiled by compile_serializers(). Calls with arguments keep the
+    reflective behaviour.
+    """
+    _compiled_serializer = None
+
+    def to_dict(self, *args, **kwargs):
+        serializer = self._compiled_serializer
+        if serializer is None or args or kwargs:
+            return super().to_dict(*args, **kwargs)
+        return serializer(self)
+
+
+def compile_serializers(*models):
+    """
+    Compile and attach serializers for the given models.
+    """
+    for model in models:
+        serializer = compile_serializer(model)
+        model._compiled_serializer = staticmethod(serializer) if serializer else None
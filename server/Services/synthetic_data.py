@@ -0,0 +1,458 @@
+"""
+Synthetic data generator for development and capacity testing.
+
+    flask seed --employees 100000 --months 36 --seed 42 --until 2026-09-30
+
+Clears the database and fills it with departments, employees with user
+accounts, and `months` months of leave, payroll, bonus, tax and leave
+balance history ending at `until`, with daily attendance for the last
+`attendance-months` of them. Every employee draws from its own
+random.Random seeded with (seed, employee number), so the same arguments
+always produce the same data, whatever the chunk sizes.
+
+Employees are generated EMPLOYEE_CHUNK_SIZE at a time and their history
+is written with executemany in batches of INSERT_CHUNK_SIZE rows, one
+transaction per employee chunk, so memory use does not grow with the
+size of the dataset.
+"""
+from bisect import bisect_left
+from calendar import monthrange
+from datetime import date, datetime, time, timedelta
+import random
+import click
+from sqlalchemy import insert
+from models import db, Attendance, Bonus, Department, Employee, Leave, LeaveBalance, Payroll, Tax, User
+from Services.leave_balance import ANNUAL_ENTITLEMENTS, APPROVED_STATUS, leave_days
+from Services.leave_intervals import INACTIVE_STATUSES
+from Services.password_hashing import password_hasher
+from Services.payroll_run import OVERTIME_MULTIPLIER, STANDARD_DAILY_HOURS, STANDARD_MONTHLY_HOURS
+from Services.tax_brackets import get_tax_table
+
+EMPLOYEE_CHUNK_SIZE = 1000
+INSERT_CHUNK_SIZE = 5000
+
+# Daily attendance is by far the largest table (about 21 rows per employee
+# per month), so by default only the most recent months get attendance
+DEFAULT_ATTENDANCE_MONTHS = 3
+
+# Years of hiring before the generated period starts
+HIRING_HISTORY_YEARS = 5
+
+ADMIN_PASSWORD = 'Admin@123'
+EMPLOYEE_PASSWORD = 'Employee@123'
+
+ADMIN_PROFILE = {
+    'first_name': 'David',
+    'last_name': 'Njenga',
+    'date_of_birth': date(1990, 1, 1),
+    'phone': '+254706199926',
+    'email': 'davenjenga098@gmail.com',
+    'gender': 'Male',
+    'address': '123 Main St, New York, NY',
+    'hire_date': date(2021, 1, 1),
+    'position': 'System Administrator',
+    'salary': 50000.0
+}
+
+# Department name, manager title, staff positions
+DEPARTMENTS = (
+    ('Administration', 'System Administrator', ('HR Officer', 'Accountant', 'Administrative Assistant')),
+    ('Produce', 'Produce Manager', ('Produce Clerk', 'Stock Associate')),
+    ('Bakery', 'Head Baker', ('Baker', 'Pastry Chef', 'Bakery Assistant')),
+    ('Pharmacy', 'Pharmacy Manager', ('Pharmacist', 'Pharmacy Technician')),
+    ('Customer Service', 'Customer Service Lead', ('Cashier', 'Customer Service Associate')),
+    ('Electronics', 'Electronics Manager', ('Electronics Specialist', 'Sales Associate')),
+    ('Marketing', 'Marketing Manager', ('Marketing Coordinator', 'Graphic Designer')),
+    ('Beauty', 'Beauty Manager', ('Beauty Consultant', 'Sales Associate')),
+    ('Beverages', 'Beverages Manager', ('Beverage Specialist', 'Stock Associate')),
+)
+
+FIRST_NAMES = (
+    ('Sarah', 'Female'), ('John', 'Male'), ('Mary', 'Female'), ('Peter', 'Male'), ('Grace', 'Female'),
+    ('James', 'Male'), ('Lucy', 'Female'), ('Samuel', 'Male'), ('Faith', 'Female'), ('Brian', 'Male'),
+    ('Mercy', 'Female'), ('Kevin', 'Male'), ('Joy', 'Female'), ('Dennis', 'Male'), ('Esther', 'Female'),
+    ('Collins', 'Male'), ('Ann', 'Female'), ('Daniel', 'Male'), ('Purity', 'Female'), ('Victor', 'Male'),
+)
+LAST_NAMES = (
+    'Kimani', 'Mwangi', 'Wanjiku', 'Ochieng', 'Achieng', 'Otieno', 'Njeri', 'Kamau', 'Wambui', 'Mutua',
+    'Kiprop', 'Chebet', 'Omondi', 'Akinyi', 'Kariuki', 'Mumbi', 'Njoroge', 'Wekesa', 'Nyambura', 'Korir',
+)
+STREETS = ('Market St', 'Baker Ave', 'Health Rd', 'Service Lane', 'Tech Blvd', 'Ad Street', 'Moi Ave', 'Kenyatta Rd')
+CITIES = ('Nairobi', 'Mombasa', 'Nakuru', 'Kisumu', 'Eldoret', 'Thika')
+
+ABSENCE_LEAVE_TYPES = ('Sick Leave', 'Personal Leave', 'Family Emergency')
+PLANNED_LEAVE_TYPES = ('Vacation', 'Personal Leave', 'Training Leave', 'Medical Leave')
+BONUS_REASONS = (
+    'Performance Excellence',
+    'Sales Target Achievement',
+    'Customer Satisfaction Award',
+    'Employee of the Month',
+    'Special Project Completion'
+)
+
+
+def _add_months(month_start, months):
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _month_end(month_start):
+    return month_start.replace(day=monthrange(month_start.year, month_start.month)[1])
+
+
+class _BulkWriter:
+    """
+    Buffers rows per table and writes them with executemany once
+    chunk_size rows are waiting.
+    """
+
+    def __init__(self, chunk_size):
+        self.chunk_size = chunk_size
+        self.buffers = {}
+        self.counts = {}
+
+    def add(self, model, row):
+        buffer = self.buffers.setdefault(model.__table__, [])
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            self._write(model.__table__)
+
+    def _write(self, table):
+        buffer = self.buffers.get(table)
+        if buffer:
+            db.session.execute(table.insert(), buffer)
+            self.counts[table.name] = self.counts.get(table.name, 0) + len(buffer)
+            self.buffers[table] = []
+
+    def flush(self):
+        for table in list(self.buffers):
+            self._write(table)
+
+
+class _Calendar:
+    """
+    Dates of the generated period, shared by every employee.
+    """
+
+    def __init__(self, months, until, attendance_months):
+        self.until = until
+        self.first_month = _add_months(until.replace(day=1), -(months - 1))
+        self.month_starts = [_add_months(self.first_month, offset) for offset in range(months)]
+        # Only months that have ended get a payroll
+        self.pay_dates = [_month_end(month) for month in self.month_starts if _month_end(month) <= until]
+        self.hiring_start = self.first_month.replace(year=self.first_month.year - HIRING_HISTORY_YEARS)
+
+        attendance_start = max(self.first_month, _add_months(until.replace(day=1), -(attendance_months - 1)))
+        self.workdays = []
+        day = attendance_start
+        while day <= until:
+            if day.weekday() < 5:
+                self.workdays.append(day)
+            day += timedelta(days=1)
+
+        self.tax_tables = {year: get_tax_table(year) for year in range(self.first_month.year, until.year + 1)}
+
+
+def _clear_tables():
+    # Departments and employees reference each other, so detach managers first
+    db.session.execute(db.update(Department).values(manager_id=None))
+    for model in (User, LeaveBalance, Payroll, Attendance, Leave, Tax, Bonus, Employee, Department):
+        db.session.execute(db.delete(model))
+
+
+def _profile(rng, number, department_id, position, low, high):
+    first_name, gender = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    return {
+        'first_name': first_name,
+        'last_name': last_name,
+        'phone': f'+2547{number:08d}',
+        'email': f'{first_name}.{last_name}{number}@example.com'.lower(),
+        'gender': gender,
+        'address': f'{rng.randint(1, 999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}',
+        'position': position,
+        'salary': float(rng.randrange(low, high, 100)),
+        'department_id': department_id
+    }
+
+
+def _hire(rng, profile, earliest, latest):
+    hire_date = earliest + timedelta(days=rng.randrange((latest - earliest).days + 1))
+    profile['hire_date'] = hire_date
+    profile['date_of_birth'] = hire_date - timedelta(days=rng.randrange(20 * 365, 55 * 365))
+    return profile
+
+
+def _overlaps(leaves, start_date, end_date):
+    return any(start <= end_date and end >= start_date for start, end, _, _ in leaves)
+
+
+def _write_history(writer, rng, employee_id, profile, calendar):
+    """
+    Generate the leave, attendance, payroll, bonus, tax and balance rows
+    of one employee.
+    """
+    hire_date, salary = profile['hire_date'], profile['salary']
+    active_start = max(hire_date, calendar.first_month)
+    until = calendar.until
+
+    # Roughly one vacation a year, decided before attendance so it is taken
+    leaves = []
+    for month in calendar.month_starts[::12]:
+        if rng.random() >= 0.8:
+            continue
+        block_end = min(_add_months(month, 12) - timedelta(days=1), until)
+        if block_end < active_start:
+            continue
+        start = max(month, active_start) + timedelta(days=rng.randrange((block_end - max(month, active_start)).days + 1))
+        end = start + timedelta(days=rng.randint(3, 10) - 1)
+        if not _overlaps(leaves, start, end):
+            leaves.append((start, end, 'Vacation', APPROVED_STATUS if rng.random() < 0.9 else 'Rejected'))
+
+    on_leave = set()
+    for start, end, _, status in leaves:
+        if status not in INACTIVE_STATUSES:
+            on_leave.update(start + timedelta(days=offset) for offset in range(leave_days(start, end)))
+
+    overtime_hours = {}
+    # rng.random() with arithmetic is several times cheaper than randint on
+    # the per-day path, which dominates generation time
+    uniform = rng.random
+    for day in calendar.workdays[bisect_left(calendar.workdays, active_start):]:
+        if day in on_leave:
+            continue
+        chance = uniform()
+        if chance < 0.95:
+            # 85% in by 08:59, 10% late until 10:30
+            if chance < 0.85:
+                clock_in = time(7 + int(uniform() * 2), int(uniform() * 60))
+            else:
+                late = 1 + int(uniform() * 90)
+                clock_in = time(9 + late // 60, late % 60)
+            clock_out = time(16 + int(uniform() * 3), int(uniform() * 60))
+            work_hours = round((clock_out.hour - clock_in.hour) + (clock_out.minute - clock_in.minute) / 60, 2)
+            writer.add(Attendance, {
+                'employee_id': employee_id,
+                'date': day,
+                'clock_in_time': clock_in,
+                'clock_out_time': clock_out,
+                'work_hours': work_hours,
+                'status': 'Completed'
+            })
+            if work_hours > STANDARD_DAILY_HOURS:
+                key = (day.year, day.month)
+                overtime_hours[key] = overtime_hours.get(key, 0.0) + work_hours - STANDARD_DAILY_HOURS
+        else:
+            end = min(day + timedelta(days=rng.randint(1, 3) - 1), until)
+            if _overlaps(leaves, day, end):
+                continue
+            status = APPROVED_STATUS if rng.random() < 0.7 else 'Pending'
+            leaves.append((day, end, rng.choice(ABSENCE_LEAVE_TYPES), status))
+            on_leave.update(day + timedelta(days=offset) for offset in range(leave_days(day, end)))
+
+    # Planned leave in the month after the period
+    if rng.random() < 0.7:
+        start = until + timedelta(days=rng.randint(1, 30))
+        end = start + timedelta(days=rng.randint(1, 14) - 1)
+        leave_type = rng.choice(PLANNED_LEAVE_TYPES)
+        if start >= hire_date and not _overlaps(leaves, start, end):
+            leaves.append((start, end, leave_type, APPROVED_STATUS if leave_type == 'Vacation' else 'Pending'))
+
+    balances = {leave_type: [0.0, 0.0] for leave_type in ANNUAL_ENTITLEMENTS}
+    for start, end, leave_type, status in leaves:
+        notice = 0 if leave_type in ABSENCE_LEAVE_TYPES else rng.randint(3, 30)
+        writer.add(Leave, {
+            'employee_id': employee_id,
+            'leave_type': leave_type,
+            'application_date': start - timedelta(days=notice),
+            'start_date': start,
+            'end_date': end,
+            'status': status
+        })
+        if status not in INACTIVE_STATUSES:
+            used_pending = balances.setdefault(leave_type, [0.0, 0.0])
+            used_pending[0 if status == APPROVED_STATUS else 1] += leave_days(start, end)
+
+    # Same accrual as `flask accrue-leave` run every month of the period
+    accrued_months = sum(1 for month in calendar.month_starts if hire_date <= _month_end(month))
+    for leave_type, (used_days, pending_days) in balances.items():
+        writer.add(LeaveBalance, {
+            'employee_id': employee_id,
+            'leave_type': leave_type,
+            'accrued_days': accrued_months * round(ANNUAL_ENTITLEMENTS.get(leave_type, 0.0) / 12, 4),
+            'used_days': used_days,
+            'pending_days': pending_days,
+            'accrued_through': calendar.month_starts[-1] if accrued_months and leave_type in ANNUAL_ENTITLEMENTS else None
+        })
+
+    annual_tax = {}
+    for year, tax_table in calendar.tax_tables.items():
+        if hire_date.year <= year:
+            annual_tax[year] = round(tax_table.tax(salary), 2)
+            writer.add(Tax, {
+                'employee_id': employee_id,
+                'tax_percentage': tax_table.effective_percentage(salary),
+                'tax_amount': annual_tax[year],
+                'year': year
+            })
+
+    # Same arithmetic as the payroll run for employees with a Tax record
+    base_salary = round(salary / 12, 2)
+    hourly_rate = base_salary / STANDARD_MONTHLY_HOURS
+    for pay_date in calendar.pay_dates:
+        if hire_date > pay_date:
+            continue
+        overtime = round(
+            overtime_hours.get((pay_date.year, pay_date.month), 0.0) * hourly_rate * OVERTIME_MULTIPLIER, 2
+        )
+        bonus = 0.0
+        if rng.random() < 0.2:
+            bonus = round(rng.uniform(5000, 15000), 2)
+            writer.add(Bonus, {
+                'employee_id': employee_id,
+                'bonus_amount': bonus,
+                'bonus_date': pay_date,
+                'reason': rng.choice(BONUS_REASONS)
+            })
+        deductions = round(annual_tax[pay_date.year] / 12, 2)
+        writer.add(Payroll, {
+            'employee_id': employee_id,
+            'pay_date': pay_date,
+            'base_salary': base_salary,
+            'overtime': overtime,
+            'deductions': deductions,
+            'bonuses': bonus,
+            'total_pay': round(base_salary + overtime + bonus - deductions, 2)
+        })
+
+
+def _insert_employees(profiles, passwords, roles):
+    employee_ids = db.session.scalars(
+        insert(Employee).returning(Employee.employee_id, sort_by_parameter_order=True), profiles
+    ).all()
+    db.session.execute(insert(User), [
+        {
+            'username': f"{profile['first_name'].lower()}.{profile['last_name'].lower()}",
+            'email': profile['email'],
+            'password': password,
+            'role': role,
+            'employee_id': employee_id
+        }
+        for profile, password, role, employee_id in zip(profiles, passwords, roles, employee_ids)
+    ])
+    return employee_ids
+
+
+def generate(employees, months, seed, until=None, attendance_months=DEFAULT_ATTENDANCE_MONTHS,
+             chunk_size=EMPLOYEE_CHUNK_SIZE, echo=None):
+    """
+    Replace the contents of the database with a synthetic dataset and
+    return the number of rows written per table.
+    """
+    echo = echo or (lambda message: None)
+    until = until or date.today()
+    calendar = _Calendar(months, until, attendance_months)
+    writer = _BulkWriter(INSERT_CHUNK_SIZE)
+    admin_hash = password_hasher.hash(ADMIN_PASSWORD)
+    employee_hash = password_hasher.hash(EMPLOYEE_PASSWORD)
+
+    try:
+        _clear_tables()
+        department_ids = db.session.scalars(
+            insert(Department).returning(Department.department_id, sort_by_parameter_order=True),
+            [{'department_name': name} for name, _, _ in DEPARTMENTS]
+        ).all()
+        writer.counts[Department.__tablename__] = len(department_ids)
+
+        # The admin runs Administration and every other department gets a
+        # manager, all hired before the period so they have full history
+        leadership = min(employees, len(DEPARTMENTS))
+        rngs, profiles = [], []
+        for number in range(leadership):
+            rng = random.Random(f'{seed}-{number}')
+            if number == 0:
+                profile = dict(ADMIN_PROFILE, department_id=department_ids[0])
+                profile['hire_date'] = min(profile['hire_date'], calendar.first_month)
+            else:
+                profile = _hire(rng, _profile(
+                    rng, number, department_ids[number], DEPARTMENTS[number][1], 45000, 70000
+                ), calendar.hiring_start, calendar.first_month)
+            rngs.append(rng)
+            profiles.append(profile)
+        leader_ids = _insert_employees(
+            profiles, [admin_hash] + [employee_hash] * (leadership - 1), ['admin'] + ['manager'] * (leadership - 1)
+        )
+        for index, (profile, employee_id) in enumerate(zip(profiles, leader_ids)):
+            if index:
+                db.session.execute(
+                    db.update(Employee).where(Employee.employee_id == employee_id).values(supervisor_id=leader_ids[0])
+                )
+            db.session.execute(
+                db.update(Department).where(Department.department_id == profile['department_id']).values(
+                    manager_id=employee_id
+                )
+            )
+            _write_history(writer, rngs[index], employee_id, profile, calendar)
+        writer.flush()
+        db.session.commit()
+        echo(f'{leadership}/{employees} employees')
+
+        managers = dict(zip(department_ids, leader_ids))
+        for offset in range(leadership, employees, chunk_size):
+            numbers = range(offset, min(offset + chunk_size, employees))
+            rngs, profiles = [], []
+            for number in numbers:
+                rng = random.Random(f'{seed}-{number}')
+                department = rng.randrange(len(DEPARTMENTS))
+                profile = _hire(rng, _profile(
+                    rng, number, department_ids[department], rng.choice(DEPARTMENTS[department][2]), 20000, 45000
+                ), calendar.hiring_start, until)
+                profile['supervisor_id'] = managers.get(department_ids[department])
+                rngs.append(rng)
+                profiles.append(profile)
+
+            employee_ids = _insert_employees(profiles, [employee_hash] * len(profiles), ['employee'] * len(profiles))
+            for rng, employee_id, profile in zip(rngs, employee_ids, profiles):
+                _write_history(writer, rng, employee_id, profile, calendar)
+            writer.flush()
+            db.session.commit()
+            echo(f'{numbers[-1] + 1}/{employees} employees')
+    except Exception:
+        db.session.rollback()
+        raise
+
+    writer.counts[Employee.__tablename__] = employees
+    writer.counts[User.__tablename__] = employees
+    return writer.counts
+
+
+@click.command('seed')
+@click.option('--employees', type=click.IntRange(min=1), default=100, show_default=True,
+              help='Number of employees to generate')
+@click.option('--months', type=click.IntRange(min=1), default=12, show_default=True,
+              help='Months of history to generate')
+@click.option('--seed', type=int, default=42, show_default=True, help='Random seed')
+@click.option('--until', help='Last day of the generated period as YYYY-MM-DD (defaults to today)')
+@click.option('--attendance-months', type=click.IntRange(min=1), default=DEFAULT_ATTENDANCE_MONTHS,
+              show_default=True, help='Generate daily attendance for the last N months of the period only')
+def seed_command(employees, months, seed, until, attendance_months):
+    """
+    Replace the database contents with synthetic data.
+    """
+    try:
+        until = datetime.strptime(until, '%Y-%m-%d').date() if until else None
+    except ValueError:
+        raise click.BadParameter('Date must be in format YYYY-MM-DD', param_hint='--until')
+
+    started = datetime.now()
+    counts = generate(employees, months, seed, until=until, attendance_months=attendance_months, echo=click.echo)
+    for table, count in sorted(counts.items()):
+        click.echo(f'{table}: {count} rows')
+    click.echo(f'Seeded in {(datetime.now() - started).total_seconds():.1f}s')
+
+
+def init_synthetic_data(app):
+    """
+    Register the seed command on the flask CLI.
+    """
+    app.cli.add_command(seed_command)
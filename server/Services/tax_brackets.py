@@ -0,0 +1,165 @@
+"""
+Progressive income tax tables.
+
+A TaxTable keeps a year's brackets as parallel lists: the lower bound of
+each band, its marginal rate, and the tax owed on all income below that
+bound. The cumulative column is computed once when the table is loaded,
+so the tax on any income is a bisect over the bounds plus one
+multiply-add, and a whole payroll is taxed with a single tax_many call.
+
+Brackets come from the tax_bracket table, falling back to DEFAULT_BRACKETS
+for years that have none. Loaded tables are cached per year for
+TAX_TABLE_TTL seconds and dropped when brackets change in this process.
+"""
+from bisect import bisect_right
+from threading import Lock
+import time
+from sqlalchemy import event
+from models import db, TaxBracket
+from Services.metrics import record_cache
+
+# (annual lower bound, tax percentage) used when a year has no brackets
+DEFAULT_BRACKETS = (
+    (0.0, 0.0),
+    (10000.0, 10.0),
+    (40000.0, 20.0),
+    (90000.0, 30.0),
+    (180000.0, 40.0),
+)
+TAX_TABLE_TTL = 300
+
+# Pay periods per year used to annualise a gross pay
+PERIODS_PER_YEAR = 12
+
+_tables = {}
+_lock = Lock()
+
+
+class TaxTable:
+    """
+    The brackets of one tax year with their cumulative tax precomputed.
+    """
+
+    def __init__(self, year, brackets, source='configured'):
+        brackets = sorted((float(lower_bound), float(percentage)) for lower_bound, percentage in brackets)
+        if not brackets or brackets[0][0] != 0:
+            raise ValueError('The first bracket must start at 0')
+        for index, (lower_bound, percentage) in enumerate(brackets):
+            if index and lower_bound == brackets[index - 1][0]:
+                raise ValueError(f'Duplicate bracket lower bound {lower_bound}')
+            if percentage < 0 or percentage > 100:
+                raise ValueError('Tax percentage must be between 0 and 100')
+
+        self.year = year
+        self.source = source
+        self.bounds = [lower_bound for lower_bound, _ in brackets]
+        self.rates = [percentage / 100 for _, percentage in brackets]
+        self.cumulative = [0.0]
+        for index in range(1, len(brackets)):
+            band = self.bounds[index] - self.bounds[index - 1]
+            self.cumulative.append(self.cumulative[-1] + band * self.rates[index - 1])
+
+    def tax(self, income):
+        """
+        Tax owed on one annual income.
+        """
+        if income <= 0:
+            return 0.0
+        index = bisect_right(self.bounds, income) - 1
+        return self.cumulative[index] + (income - self.bounds[index]) * self.rates[index]
+
+    def tax_many(self, incomes):
+        """
+        Tax owed on each of many annual incomes, in order.
+        """
+        bounds, rates, cumulative = self.bounds, self.rates, self.cumulative
+        taxes = []
+        for income in incomes:
+            if income <= 0:
+                taxes.append(0.0)
+                continue
+            index = bisect_right(bounds, income) - 1
+            taxes.append(cumulative[index] + (income - bounds[index]) * rates[index])
+        return taxes
+
+    def withholding_many(self, gross_pays, periods=PERIODS_PER_YEAR):
+        """
+        Tax to withhold from each per-period gross pay, taxing the pay as
+        if it were earned every period of the year.
+        """
+        return [
+            round(tax / periods, 2)
+            for tax in self.tax_many(gross_pay * periods for gross_pay in gross_pays)
+        ]
+
+    def effective_percentage(self, income):
+        """
+        Total tax as a percentage of income.
+        """
+        return round(self.tax(income) / income * 100, 2) if income > 0 else 0.0
+
+    def to_list(self):
+        return [
+            {
+                'lower_bound': lower_bound,
+                'upper_bound': self.bounds[index + 1] if index + 1 < len(self.bounds) else None,
+                'tax_percentage': round(rate * 100, 4),
+                'tax_below': round(self.cumulative[index], 2)
+            }
+            for index, (lower_bound, rate) in enumerate(zip(self.bounds, self.rates))
+        ]
+
+
+def get_tax_table(year):
+    """
+    The TaxTable for year, loaded with one query and then cached.
+    """
+    now = time.monotonic()
+    with _lock:
+        entry = _tables.get(year)
+    hit = entry is not None and entry[1] > now
+    record_cache('tax_tables', hit)
+    if hit:
+        return entry[0]
+
+    rows = db.session.query(TaxBracket.lower_bound, TaxBracket.tax_percentage).filter(
+        TaxBracket.year == year
+    ).all()
+    table = TaxTable(year, rows) if rows else TaxTable(year, DEFAULT_BRACKETS, source='default')
+
+    with _lock:
+        _tables[year] = (table, now + TAX_TABLE_TTL)
+    return table
+
+
+def set_tax_brackets(year, brackets):
+    """
+    Replace the brackets of year. Raises ValueError for an invalid table.
+    Runs in the caller's transaction; the caller commits.
+    """
+    table = TaxTable(year, brackets)
+    db.session.execute(db.delete(TaxBracket).where(TaxBracket.year == year))
+    db.session.execute(TaxBracket.__table__.insert(), [
+        {'year': year, 'lower_bound': lower_bound, 'tax_percentage': round(rate * 100, 4)}
+        for lower_bound, rate in zip(table.bounds, table.rates)
+    ])
+    clear_tax_tables(year)
+    return table
+
+
+def clear_tax_tables(year=None):
+    """
+    Forget cached tables, for one year or for every year.
+    """
+    with _lock:
+        if year is None:
+            _tables.clear()
+        else:
+            _tables.pop(year, None)
+
+
+@event.listens_for(TaxBracket, 'after_insert')
+@event.listens_for(TaxBracket, 'after_update')
+@event.listens_for(TaxBracket, 'after_delete')
+def _invalidate_year(mapper, connection, target):
+    clear_tax_tables(target.year)
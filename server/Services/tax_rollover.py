@@ -0,0 +1,71 @@
+"""
+Year-end tax rollover.
+
+Creates or refreshes the Tax record of every employee hired by the end of
+a year in one pass: salaries are read with one query, taxed with one
+TaxTable.tax_many call and written per chunk with an insert that skips
+conflicts on the unique (employee_id, year) index, then with overwrite an
+upsert of the rows that were not new. Both statements return the rows
+they actually wrote, so the summary counts what this run changed even
+when another writer runs at the same time.
+"""
+from datetime import date
+from models import db, Employee, Tax
+from Services.tax_brackets import get_tax_table
+from Services.upsert import insert_ignore, upsert
+
+ROLLOVER_CHUNK_SIZE = 1000
+
+TAX_KEY = ['employee_id', 'year']
+
+
+def rollover_tax(year, overwrite=True, chunk_size=ROLLOVER_CHUNK_SIZE):
+    """
+    Upsert a Tax record for year for every active employee, derived from
+    the year's tax brackets. With overwrite=False existing records are left
+    alone. All chunks are written in one transaction. Returns a summary.
+    """
+    employees = db.session.query(Employee.employee_id, Employee.salary).filter(
+        Employee.hire_date <= date(year, 12, 31)
+    ).order_by(Employee.employee_id).all()
+
+    tax_table = get_tax_table(year)
+    taxes = tax_table.tax_many(salary for _, salary in employees)
+    rows = [
+        {
+            'employee_id': employee_id,
+            'year': year,
+            'tax_amount': round(tax, 2),
+            'tax_percentage': round(tax / salary * 100, 2) if salary > 0 else 0.0
+        }
+        for (employee_id, salary), tax in zip(employees, taxes)
+    ]
+
+    insert_stmt = insert_ignore(Tax.__table__, TAX_KEY).returning(Tax.employee_id, Tax.tax_amount)
+    # Rows already holding these amounts are not rewritten or counted
+    upsert_stmt = upsert(Tax.__table__, TAX_KEY, ['tax_amount', 'tax_percentage'], only_changed=True).returning(
+        Tax.employee_id, Tax.tax_amount
+    )
+
+    created, updated = {}, {}
+    try:
+        for offset in range(0, len(rows), chunk_size):
+            chunk = rows[offset:offset + chunk_size]
+            created.update(db.session.execute(insert_stmt, chunk).all())
+            remaining = [row for row in chunk if row['employee_id'] not in created]
+            if overwrite and remaining:
+                updated.update(db.session.execute(upsert_stmt, remaining).all())
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return {
+        'year': year,
+        'brackets': tax_table.source,
+        'employees': len(rows),
+        'created': len(created),
+        'updated': len(updated),
+        'skipped': len(rows) - len(created) - len(updated),
+        'total_tax': round(sum(created.values()) + sum(updated.values()), 2)
+    }
@@ -0,0 +1,119 @@
+"""
+In-process cache of revoked JWT IDs.
+
+The token_in_blocklist_loader runs on every authenticated request. Instead
+of querying token_blacklist each time, revoked jtis are held in memory
+and refreshed from the table:
+
+- incrementally every JWT_BLOCKLIST_REFRESH_SECONDS, reading rows revoked
+  since the latest revoked_at seen minus JWT_BLOCKLIST_OVERLAP_SECONDS.
+  Ids and timestamps are assigned before commit, so a revocation can
+  commit after a later one was already read; the overlap re-reads that
+  window and also absorbs clock skew between workers,
+- immediately when the signal file's mtime changes. Every worker touches
+  that file after revoking a token, so other processes on the host pick
+  up the revocation on their next request,
+- in full every JWT_BLOCKLIST_RELOAD_SECONDS, which also drops rows removed
+  from the table.
+
+Only revocations younger than the longest token lifetime are loaded:
+an older token has expired anyway, so the never-pruned table does not
+have to fit in memory.
+"""
+from datetime import datetime, timedelta
+import os
+from threading import Lock
+import time
+from models import db, TokenBlacklist
+
+
+class TokenBlocklistCache:
+    def __init__(self):
+        self._jtis = set()
+        self._revoked_through = None
+        self._loaded_at = None
+        self._refreshed_at = None
+        self._signal_mtime = None
+        self._lock = Lock()
+        self.refresh_seconds = 30
+        self.reload_seconds = 600
+        self.overlap_seconds = 60
+        self.retention = None
+        self.signal_file = None
+
+    def init_app(self, app):
+        self.refresh_seconds = app.config.get('JWT_BLOCKLIST_REFRESH_SECONDS', 30)
+        self.reload_seconds = app.config.get('JWT_BLOCKLIST_RELOAD_SECONDS', 600)
+        self.overlap_seconds = app.config.get('JWT_BLOCKLIST_OVERLAP_SECONDS', 60)
+        lifetimes = [app.config.get('JWT_ACCESS_TOKEN_EXPIRES'), app.config.get('JWT_REFRESH_TOKEN_EXPIRES')]
+        # False means tokens never expire, and then every revocation matters
+        self.retention = None if False in lifetimes else max(
+            (lifetime for lifetime in lifetimes if isinstance(lifetime, timedelta)), default=None
+        )
+        self.signal_file = app.config.get('JWT_BLOCKLIST_SIGNAL_FILE') or \
+            os.path.join(app.instance_path, 'token_blocklist.signal')
+
+    def _read_signal(self):
+        try:
+            return os.stat(self.signal_file).st_mtime_ns
+        except (OSError, TypeError):
+            return None
+
+    def _touch_signal(self):
+        try:
+            os.makedirs(os.path.dirname(self.signal_file), exist_ok=True)
+            with open(self.signal_file, 'a'):
+                os.utime(self.signal_file, None)
+        except (OSError, TypeError):
+            # Other workers still converge on their next timed refresh
+            pass
+
+    def _revocations(self, since):
+        query = db.session.query(TokenBlacklist.revoked_at, TokenBlacklist.jti)
+        if since is not None:
+            query = query.filter(TokenBlacklist.revoked_at >= since)
+        return query.all()
+
+    def _reload(self, now):
+        started = datetime.utcnow()
+        rows = self._revocations(started - self.retention if self.retention else None)
+        self._jtis = {jti for _, jti in rows if jti}
+        self._revoked_through = max((revoked_at for revoked_at, _ in rows), default=started)
+        self._loaded_at = self._refreshed_at = now
+
+    def _refresh(self, now):
+        rows = self._revocations(self._revoked_through - timedelta(seconds=self.overlap_seconds))
+        for revoked_at, jti in rows:
+            if jti:
+                self._jtis.add(jti)
+            self._revoked_through = max(self._revoked_through, revoked_at)
+        self._refreshed_at = now
+
+    def _sync(self):
+        now = time.monotonic()
+        signal = self._read_signal()
+        with self._lock:
+            if self._loaded_at is None or now - self._loaded_at >= self.reload_seconds:
+                self._reload(now)
+            elif signal != self._signal_mtime or now - self._refreshed_at >= self.refresh_seconds:
+                self._refresh(now)
+            self._signal_mtime = signal
+
+    def is_revoked(self, jti):
+        self._sync()
+        return jti in self._jtis
+
+    def revoke(self, jti, token):
+        """
+        Persist a revoked token and signal the other workers.
+        """
+        entry = TokenBlacklist(jti=jti, token=token)
+        db.session.add(entry)
+        db.session.commit()
+        with self._lock:
+            self._jtis.add(jti)
+        self._touch_signal()
+        return entry
+
+
+token_blocklist = TokenBlocklistCache()
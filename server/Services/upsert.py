@@ -0,0 +1,49 @@
+"""
+Dialect-aware INSERT ... ON CONFLICT helpers.
+
+PostgreSQL and SQLite both support ON CONFLICT, but SQLAlchemy exposes it
+through each dialect's own insert() construct.
+"""
+from sqlalchemy import or_
+from sqlalchemy.dialects import postgresql, sqlite
+from models import db
+
+_DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def dialect_insert(table):
+    """
+    Return an insert() for table that supports on_conflict_* clauses on the
+    current database.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect not in _DIALECT_INSERTS:
+        raise NotImplementedError(f'ON CONFLICT is not supported for {dialect}')
+    return _DIALECT_INSERTS[dialect](table)
+
+
+def insert_ignore(table, index_elements):
+    """
+    INSERT that silently skips rows conflicting on index_elements.
+    """
+    return dialect_insert(table).on_conflict_do_nothing(index_elements=index_elements)
+
+
+def upsert(table, index_elements, update_columns, only_changed=False):
+    """
+    INSERT that overwrites update_columns of rows conflicting on index_elements.
+    With only_changed, rows whose update_columns already hold the new values
+    are left alone and not returned by RETURNING.
+    """
+    insert_stmt = dialect_insert(table)
+    where = None
+    if only_changed:
+        where = or_(*[table.c[column].is_distinct_from(insert_stmt.excluded[column]) for column in update_columns])
+    return insert_stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={column: insert_stmt.excluded[column] for column in update_columns},
+        where=where
+    )
@@ -4,16 +4,26 @@ from flask_cors import CORS
 import os
 from datetime import timedelta
 from flask_restful import Api
-from models import db, TokenBlacklist
+from models import db
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
-from Resources.auth import UserResource, LoginResource
-from Resources.attendance import AttendanceResource, AttendanceSummaryResource
-from Resources.department import DepartmentResource
+from Services.query_stats import init_query_stats
+from Services.metrics import init_metrics
+from Services.db_tuning import init_db_tuning
+from Services.token_blocklist import token_blocklist
+from Services.leave_balance import init_leave_balance
+from Services.synthetic_data import init_synthetic_data
+from Services.password_hashing import password_hasher
+from Resources.auth import UserResource, UserBatchResource, LoginResource, LogoutResource
+from Resources.attendance import AttendanceResource, AttendanceSummaryResource, AttendanceRollupResource
+from Resources.department import DepartmentResource, DepartmentStatsResource
 from Resources.bonus import BonusResource
-from Resources.leave import LeaveResource
-from Resources.payroll import PayrollResource
-from Resources.tax import TaxResource
+from Resources.leave import LeaveResource, LeaveCalendarResource, LeaveBalanceResource
+from Resources.payroll import PayrollResource, PayrollRunResource, PayrollBatchResource
+from Resources.tax import TaxResource, TaxRolloverResource, TaxBracketResource, TaxWithholdingResource
+from Resources.export import ExportResource
+from Resources.org import OrgSubtreeResource
+from Resources.stats import QueryStatsResource
 
 # Load environment variables
 load_dotenv()
@@ -38,7 +48,11 @@ app.config.update(
     JWT_ACCESS_TOKEN_EXPIRES=timedelta(days=2),
     JWT_REFRESH_TOKEN_EXPIRES=timedelta(days=30),
     JWT_BLACKLIST_ENABLED=True,
-    JWT_BLACKLIST_TOKEN_CHECKS=['access', 'refresh']
+    JWT_BLACKLIST_TOKEN_CHECKS=['access', 'refresh'],
+    BCRYPT_LOG_ROUNDS=int(os.environ.get('BCRYPT_LOG_ROUNDS', 12)),  # Stored hashes are upgraded on login when this changes
+    PASSWORD_HASH_WORKERS=int(os.environ.get('PASSWORD_HASH_WORKERS', 0)) or None,  # Defaults to one per CPU
+    DB_SLOW_QUERY_MS=float(os.environ.get('DB_SLOW_QUERY_MS', 500)),  # Statements slower than this are logged
+    METRICS_TOKEN=os.environ.get('METRICS_TOKEN')  # Bearer token for /metrics, which is off while unset
 )
 
 # Initialize extensions
@@ -46,12 +60,19 @@ api = Api(app)
 jwt = JWTManager(app)
 db.init_app(app)
 migrate = Migrate(app, db)
+init_query_stats(app)
+init_metrics(app)
+init_db_tuning(app)
+token_blocklist.init_app(app)
+init_leave_balance(app)
+init_synthetic_data(app)
+password_hasher.init_app(app)
 
 # JWT configuration and error handlers
 @jwt.token_in_blocklist_loader
 def check_if_token_in_blacklist(jwt_header, jwt_payload):
-    jti = jwt_payload['jti']
-    return TokenBlacklist.query.filter_by(jti=jti).first() is not None
+    # Answered from the in-process cache, which refreshes itself from the table
+    return token_blocklist.is_revoked(jwt_payload['jti'])
 
 @jwt.expired_token_loader
 def expired_token_callback(jwt_header, jwt_payload):
@@ -124,15 +145,28 @@ def initialize_database():
 
 # Add resources to API
 api.add_resource(UserResource, '/register')
+api.add_resource(UserBatchResource, '/register/batch')
 api.add_resource(AttendanceResource, '/attendance', '/attendance/<int:id>')
 api.add_resource(LoginResource, '/login')
+api.add_resource(LogoutResource, '/logout')
 api.add_resource(AttendanceSummaryResource, '/summary_attendance')
+api.add_resource(AttendanceRollupResource, '/attendance/rollup')
 api.add_resource(DepartmentResource, '/department', '/department/<int:id>')
+api.add_resource(DepartmentStatsResource, '/department/stats')
 api.add_resource(BonusResource, '/bonus', '/bonus/<int:id>')
 api.add_resource(LeaveResource, '/leave', '/leave/<int:id>')
+api.add_resource(LeaveCalendarResource, '/leave/calendar')
+api.add_resource(LeaveBalanceResource, '/leave/balance')
 api.add_resource(PayrollResource, '/payroll', '/payroll/<int:id>')
+api.add_resource(PayrollRunResource, '/payroll/run')
+api.add_resource(PayrollBatchResource, '/payroll/batch')
 api.add_resource(TaxResource, '/tax', '/tax/<int:id>')
-# api.add_resource(UserLogout, '/logout')
+api.add_resource(TaxRolloverResource, '/tax/rollover')
+api.add_resource(TaxBracketResource, '/tax/brackets/<int:year>')
+api.add_resource(TaxWithholdingResource, '/tax/withholding')
+api.add_resource(ExportResource, '/export/<string:dataset>')
+api.add_resource(OrgSubtreeResource, '/org/<int:employee_id>')
+api.add_resource(QueryStatsResource, '/stats/queries')
 # api.add_resource(TokenRefresh, '/refresh')
 # api.add_resource(EmployeeResource, '/employee/<int:employee_id>')
 # api.add_resource(EmployeeList, '/employees')
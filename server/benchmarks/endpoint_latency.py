@@ -0,0 +1,442 @@
+"""
+Endpoint latency benchmark.
+
+Seeds one SQLite database per --sizes entry with the synthetic data
+generator (kept in --data-dir, so later runs with the same --sizes,
+--months, --seed and --until reuse them), then builds the app from app.py
+against a scratch copy of each and drives every registered Resource
+through the test client with a mix of admin and employee tokens. Each
+endpoint gets --requests requests from --concurrency client threads, and
+the report has p50/p95/p99 latency, throughput, status codes and SQL
+statements and database time per request (from the X-DB-Queries and
+X-DB-Time-ms headers). Results are saved as JSON; pass an earlier result
+file as --compare to print the change:
+
+    python benchmarks/endpoint_latency.py --sizes 100,1000,10000 --output before.json
+    python benchmarks/endpoint_latency.py --sizes 100,1000,10000 --compare before.json
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import count
+import json
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ADMIN = 'admin'
+EMPLOYEE = 'employee'
+MIXED = 'mixed'
+ANONYMOUS = 'anonymous'
+# A new employee token for every request, for endpoints that revoke it
+FRESH = 'fresh'
+
+# Employees whose names are made unique in the scratch copy, so endpoints
+# that take an employee_name resolve them
+SAMPLE_EMPLOYEES = 200
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _employee_name(ctx, rng):
+    return rng.choice(ctx['names'])
+
+
+def _new_pay_date(ctx):
+    # Every created payroll row gets its own date after the seeded history,
+    # so none of them hits the unique (employee_id, pay_date) key
+    return (ctx['until'] + timedelta(days=1 + next(ctx['serial']))).isoformat()
+
+
+def _registration(ctx, rng, index):
+    # Seeded phones start with +2547, so +2549 numbers are always new
+    serial = next(ctx['serial'])
+    first_name = f'Bench{index}'
+    return {
+        'first_name': first_name, 'last_name': f'Hire{rng.randrange(10 ** 6)}', 'date_of_birth': '1995-05-05',
+        'phone': f'+2549{serial:08d}', 'email': f'{first_name.lower()}.{ctx["run"]}.{serial}@example.com',
+        'gender': 'Female', 'address': '1 Bench Rd, Nairobi', 'hire_date': ctx['until'].isoformat(),
+        'position': 'Cashier', 'salary': 30000, 'password': 'Bench@123', 'confirm_password': 'Bench@123'
+    }
+
+
+# (name, token role, build(ctx, rng, index) -> (method, path, json body))
+# Reads come first so they are measured against the seeded data only.
+SCENARIOS = (
+    ('GET /payroll', MIXED, lambda ctx, rng, i: ('GET', '/payroll?limit=50', None)),
+    ('GET /payroll/<id>', MIXED, lambda ctx, rng, i: ('GET', f'/payroll/{rng.choice(ctx["ids"]["payroll"])}', None)),
+    ('GET /attendance', MIXED, lambda ctx, rng, i: ('GET', '/attendance?limit=50', None)),
+    ('GET /attendance/<id>', MIXED,
+     lambda ctx, rng, i: ('GET', f'/attendance/{rng.choice(ctx["employee_ids"])}?limit=50', None)),
+    ('GET /summary_attendance', EMPLOYEE,
+     lambda ctx, rng, i: ('GET', f'/summary_attendance?month={ctx["until"]:%Y-%m}', None)),
+    ('GET /attendance/rollup', ADMIN, lambda ctx, rng, i: (
+        'GET', f'/attendance/rollup?from={ctx["until"] - timedelta(days=30)}&to={ctx["until"]}', None)),
+    ('GET /department', MIXED, lambda ctx, rng, i: ('GET', '/department', None)),
+    ('GET /department/<id>', MIXED,
+     lambda ctx, rng, i: ('GET', f'/department/{rng.choice(ctx["ids"]["departments"])}', None)),
+    ('GET /department/stats', ADMIN, lambda ctx, rng, i: ('GET', '/department/stats', None)),
+    ('GET /bonus', MIXED, lambda ctx, rng, i: ('GET', '/bonus?limit=50', None)),
+    ('GET /bonus/<id>', MIXED, lambda ctx, rng, i: ('GET', f'/bonus/{rng.choice(ctx["ids"]["bonus"])}', None)),
+    ('GET /leave', MIXED, lambda ctx, rng, i: ('GET', '/leave?limit=50', None)),
+    ('GET /leave/<id>', MIXED, lambda ctx, rng, i: ('GET', f'/leave/{rng.choice(ctx["ids"]["leave"])}', None)),
+    ('GET /leave/calendar', MIXED, lambda ctx, rng, i: (
+        'GET', f'/leave/calendar?from={ctx["until"] - timedelta(days=14)}&to={ctx["until"] + timedelta(days=14)}',
+        None)),
+    ('GET /leave/balance', EMPLOYEE, lambda ctx, rng, i: ('GET', '/leave/balance', None)),
+    ('GET /tax', MIXED, lambda ctx, rng, i: ('GET', '/tax?limit=50', None)),
+    ('GET /tax/<id>', ADMIN, lambda ctx, rng, i: ('GET', f'/tax/{rng.choice(ctx["ids"]["tax"])}', None)),
+    ('GET /tax/brackets/<year>', MIXED, lambda ctx, rng, i: ('GET', f'/tax/brackets/{ctx["until"].year}', None)),
+    ('GET /export/<dataset>', ADMIN, lambda ctx, rng, i: (
+        'GET', f'/export/payroll?from={ctx["until"].replace(day=1) - timedelta(days=1):%Y-%m-01}', None)),
+    ('GET /org/<employee_id>', ADMIN, lambda ctx, rng, i: ('GET', f'/org/{rng.choice(ctx["manager_ids"])}', None)),
+    ('POST /tax/withholding', ADMIN, lambda ctx, rng, i: (
+        'POST', '/tax/withholding', {'year': ctx['until'].year, 'gross_pays': [
+            round(rng.uniform(1000, 9000), 2) for _ in range(100)
+        ]})),
+    ('POST /payroll/run (dry run)', ADMIN, lambda ctx, rng, i: (
+        'POST', '/payroll/run', {'pay_date': ctx['pay_date'].isoformat(), 'dry_run': True})),
+    ('POST /login', ANONYMOUS, lambda ctx, rng, i: (
+        'POST', '/login', {'email': rng.choice(ctx['emails']), 'password': ctx['password']})),
+    ('POST /attendance', EMPLOYEE, lambda ctx, rng, i: ('POST', '/attendance', {})),
+    ('POST /leave', MIXED, lambda ctx, rng, i: ('POST', '/leave', {
+        'employee_name': _employee_name(ctx, rng), 'leave_type': 'Vacation',
+        'start_date': (ctx['until'] + timedelta(days=60 + rng.randrange(300))).isoformat(),
+        'end_date': (ctx['until'] + timedelta(days=365)).isoformat()})),
+    ('POST /bonus', ADMIN, lambda ctx, rng, i: ('POST', '/bonus', {
+        'employee_name': _employee_name(ctx, rng), 'bonus_amount': 1000, 'reason': 'Benchmark'})),
+    ('POST /payroll', ADMIN, lambda ctx, rng, i: ('POST', '/payroll', {
+        'employee_name': _employee_name(ctx, rng), 'pay_date': _new_pay_date(ctx), 'base_salary': 3000})),
+    ('POST /payroll/batch', ADMIN, lambda ctx, rng, i: ('POST', '/payroll/batch', [
+        {'employee_name': _employee_name(ctx, rng), 'pay_date': _new_pay_date(ctx), 'base_salary': 3000}
+        for _ in range(20)
+    ])),
+    ('POST /tax', ADMIN, lambda ctx, rng, i: ('POST', '/tax', {
+        'employee_name': _employee_name(ctx, rng), 'year': ctx['until'].year + 1})),
+    ('PUT /tax/brackets/<year>', ADMIN, lambda ctx, rng, i: ('PUT', f'/tax/brackets/{ctx["until"].year + 2}', {
+        'brackets': [{'lower_bound': 0, 'tax_percentage': 0}, {'lower_bound': 12000 + i, 'tax_percentage': 15}]})),
+    ('POST /tax/rollover', ADMIN, lambda ctx, rng, i: ('POST', f'/tax/rollover?year={ctx["until"].year + 1}', None)),
+    ('POST /department', ADMIN, lambda ctx, rng, i: ('POST', '/department', {
+        'department_name': f'Bench {ctx["run"]} {i}'})),
+    ('POST /register', ANONYMOUS, lambda ctx, rng, i: ('POST', '/register', _registration(ctx, rng, i))),
+    ('POST /register/batch', ADMIN, lambda ctx, rng, i: ('POST', '/register/batch', [
+        _registration(ctx, rng, f'{i}x{row}') for row in range(5)
+    ])),
+    ('POST /logout', FRESH, lambda ctx, rng, i: ('POST', '/logout', None)),
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='100,1000,10000', help='comma separated employee counts')
+    parser.add_argument('--months', type=int, default=12, help='months of seeded history')
+    parser.add_argument('--seed', type=int, default=42, help='seed for data and request mix')
+    parser.add_argument('--until', default=None, help='last seeded day as YYYY-MM-DD (default: today)')
+    parser.add_argument('--requests', type=int, default=100, help='measured requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=5, help='unmeasured requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=4, help='client threads')
+    parser.add_argument('--admin-share', type=float, default=0.2,
+                        help='share of admin tokens on endpoints open to every role')
+    parser.add_argument('--rounds', type=int, default=12, help='BCRYPT_LOG_ROUNDS')
+    parser.add_argument('--only', default=None, help='comma separated substrings of endpoint names to run')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'payroll-benchmark-data'),
+                        help='where seeded databases are kept between runs')
+    parser.add_argument('--output', default=None, help='result file (default: endpoint-latency-<time>.json)')
+    parser.add_argument('--compare', default=None, help='earlier result file to compare against')
+    # Internal: benchmark a single size in this process
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--size-output', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def seeded_database(args, until):
+    """
+    Path of the cached seeded database for args.size, building it first if needed.
+    Runs before app.py is imported, so it seeds in a child process.
+    """
+    os.makedirs(args.data_dir, exist_ok=True)
+    path = os.path.join(args.data_dir, f'seed-{args.size}e-{args.months}m-{args.seed}s-{until}.db')
+    if not os.path.exists(path):
+        building = path + '.building'
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(building + suffix):
+                os.remove(building + suffix)
+        started = time.perf_counter()
+        subprocess.run([
+            sys.executable, '-c',
+            'from app import app, initialize_database\n'
+            'from Services.synthetic_data import seed_command\n'
+            'initialize_database()\n'
+            'with app.app_context():\n'
+            '    seed_command(standalone_mode=False)\n',
+            '--employees', str(args.size), '--months', str(args.months), '--seed', str(args.seed),
+            '--until', until.isoformat()
+        ], cwd=SERVER_DIR, check=True, stdout=sys.stderr,
+            env=dict(os.environ, DATABASE_URL=f'sqlite:///{building}', BCRYPT_LOG_ROUNDS=str(args.rounds)))
+        # Fold the WAL into the main file so a plain copy is complete
+        connection = sqlite3.connect(building)
+        connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        connection.execute('PRAGMA journal_mode=DELETE')
+        connection.close()
+        os.replace(building, path)
+        print(f'Seeded {args.size} employees in {time.perf_counter() - started:.1f}s', file=sys.stderr)
+    return path
+
+
+def build_context(args, until, rng):
+    """
+    Sample ids, users and tokens from the scratch database.
+    """
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import func
+    from models import db, Bonus, Department, Employee, Leave, Payroll, Tax, User
+    from Services.synthetic_data import EMPLOYEE_PASSWORD
+
+    def sample_ids(column):
+        ids = [value for (value,) in db.session.query(column).order_by(column).limit(10000)]
+        return rng.sample(ids, min(len(ids), 500)) or [0]
+
+    accounts = db.session.query(
+        User.user_id, User.employee_id, User.email, User.username, User.role, Employee.position
+    ).join(Employee, User.employee_id == Employee.employee_id).order_by(User.user_id)
+    users = accounts.filter(User.role == 'employee').limit(10000).all()
+    users = rng.sample(users, min(len(users), SAMPLE_EMPLOYEES))
+    admin = accounts.filter(User.role == 'admin').first()
+
+    # Seeded names repeat, so give the sampled employees unique last names
+    for user in users:
+        db.session.execute(db.update(Employee).where(Employee.employee_id == user.employee_id).values(
+            last_name=Employee.last_name + f'-{user.employee_id}'
+        ))
+    db.session.commit()
+    names = [f'{first} {last}' for first, last in db.session.query(Employee.first_name, Employee.last_name).filter(
+        Employee.employee_id.in_([user.employee_id for user in users])
+    )]
+
+    def token(user):
+        return create_access_token(identity=user.user_id, additional_claims={
+            'username': user.username, 'position': user.position, 'role': user.role
+        })
+
+    return {
+        'run': datetime.now().strftime('%Y%m%d%H%M%S'),
+        'serial': count(),
+        'until': until,
+        'pay_date': db.session.query(func.max(Payroll.pay_date)).scalar() or until,
+        'password': EMPLOYEE_PASSWORD,
+        'emails': [user.email for user in users],
+        'names': names,
+        'employee_ids': [user.employee_id for user in users],
+        # Employee ids with reports: department managers, else any supervisor,
+        # else the admin's own employee record
+        'manager_ids': [manager_id for (manager_id,) in db.session.query(Department.manager_id).filter(
+            Department.manager_id.isnot(None))] or [supervisor_id for (supervisor_id,) in db.session.query(
+            Employee.supervisor_id).filter(Employee.supervisor_id.isnot(None)).distinct().limit(500)]
+            or [admin.employee_id],
+        'ids': {
+            'payroll': sample_ids(Payroll.payroll_id),
+            'bonus': sample_ids(Bonus.bonus_id),
+            'leave': sample_ids(Leave.leave_id),
+            'tax': sample_ids(Tax.tax_id),
+            'departments': sample_ids(Department.department_id),
+        },
+        'admin_token': token(admin),
+        'employee_tokens': [token(user) for user in users],
+        'fresh_token': lambda: token(rng.choice(users)),
+        'counts': {
+            model.__tablename__: db.session.query(func.count()).select_from(model).scalar()
+            for model in (Employee, Payroll, Leave, Bonus, Tax)
+        }
+    }
+
+
+def run_size(args):
+    until = datetime.strptime(args.until, '%Y-%m-%d').date() if args.until else date.today()
+    seeded = seeded_database(args, until)
+    scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    scratch.close()
+    shutil.copyfile(seeded, scratch.name)
+
+    os.environ['DATABASE_URL'] = f'sqlite:///{scratch.name}'
+    os.environ['BCRYPT_LOG_ROUNDS'] = str(args.rounds)
+    sys.path.insert(0, SERVER_DIR)
+    os.chdir(SERVER_DIR)
+
+    from app import app
+
+    # The app issues tokens with the integer user_id as the subject. The
+    # PyJWT 2.9 pinned in Pipfile.lock accepts that, but PyJWT 2.10+ requires
+    # a string "sub" and rejects every token with 422. Skipping only that
+    # check lets the benchmark run against whichever PyJWT is installed;
+    # tokens are still signed and verified as usual, and the app itself is
+    # unchanged.
+    app.config['JWT_VERIFY_SUB'] = False
+    rng = random.Random(args.seed)
+    with app.app_context():
+        ctx = build_context(args, until, rng)
+
+    # Map each scenario to the Resource serving it, to report uncovered ones
+    adapter = app.url_map.bind('localhost')
+    resources = {
+        view.view_class.__name__ for view in app.view_functions.values() if hasattr(view, 'view_class')
+    }
+    covered = set()
+
+    client = app.test_client()
+    only = [part.strip() for part in args.only.split(',')] if args.only else None
+    endpoints = []
+    for name, role, build in SCENARIOS:
+        if only and not any(part in name for part in only):
+            continue
+
+        requests = []
+        with app.app_context():
+            for index in range(args.warmup + args.requests):
+                method, path, body = build(ctx, rng, index)
+                if role == ADMIN or (role == MIXED and rng.random() < args.admin_share):
+                    token = ctx['admin_token']
+                elif role in (EMPLOYEE, MIXED):
+                    token = rng.choice(ctx['employee_tokens'])
+                elif role == FRESH:
+                    token = ctx['fresh_token']()
+                else:
+                    token = None
+                requests.append((method, path, body, {'Authorization': f'Bearer {token}'} if token else {}))
+        endpoint, _ = adapter.match(requests[0][1].split('?')[0], method=requests[0][0])
+        covered.add(app.view_functions[endpoint].view_class.__name__)
+
+        errors = {}
+
+        def send(request):
+            method, path, body, headers = request
+            started = time.perf_counter()
+            response = client.open(path, method=method, json=body, headers=headers)
+            data = response.get_data()
+            seconds = time.perf_counter() - started
+            if response.status_code >= 400:
+                errors.setdefault(str(response.status_code), data[:200].decode('utf-8', 'replace').strip())
+            return (response.status_code, seconds, response.headers.get('X-DB-Queries'),
+                    response.headers.get('X-DB-Time-ms'))
+
+        for request in requests[:args.warmup]:
+            send(request)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(send, requests[args.warmup:]))
+        elapsed = time.perf_counter() - started
+
+        latencies = [seconds for _, seconds, _, _ in results]
+        queries = [int(count) for _, _, count, _ in results if count is not None]
+        db_times = [float(db_time) for _, _, _, db_time in results if db_time is not None]
+        statuses = {}
+        for status, _, _, _ in results:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        endpoints.append({
+            'endpoint': name,
+            'resource': app.view_functions[endpoint].view_class.__name__,
+            'tokens': role,
+            'requests': len(results),
+            'requests_per_second': round(len(results) / elapsed, 2) if elapsed else None,
+            'status_counts': statuses,
+            'error_samples': errors,
+            'latency_ms': {
+                label: round(percentile(latencies, fraction) * 1000, 2)
+                for label, fraction in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99))
+            },
+            'db_queries': {
+                'mean': round(sum(queries) / len(queries), 2) if queries else None,
+                'max': max(queries) if queries else None
+            },
+            'db_time_ms': {
+                'mean': round(sum(db_times) / len(db_times), 2) if db_times else None,
+                'p95': round(percentile(db_times, 0.95), 2) if db_times else None
+            }
+        })
+        print(f'{args.size:>7} employees  {name:<32} p50 {endpoints[-1]["latency_ms"]["p50"]:>8} ms  '
+              f'{statuses}', file=sys.stderr)
+
+    os.remove(scratch.name)
+    return {
+        'employees': args.size,
+        'rows': ctx['counts'],
+        'endpoints': endpoints,
+        'unbenchmarked_resources': sorted(resources - covered) if not only else []
+    }
+
+
+def compare(previous, current):
+    old = {
+        (dataset['employees'], endpoint['endpoint']): endpoint['latency_ms']
+        for dataset in previous.get('datasets', []) for endpoint in dataset['endpoints']
+    }
+    for dataset in current['datasets']:
+        for endpoint in dataset['endpoints']:
+            before = old.get((dataset['employees'], endpoint['endpoint']))
+            if not before:
+                continue
+            changes = []
+            for label in ('p50', 'p95'):
+                was, now = before[label], endpoint['latency_ms'][label]
+                change = f'{(now - was) / was * 100:+.0f}%' if was else 'n/a'
+                changes.append(f'{label} {was} -> {now} ms ({change})')
+            print(f'{dataset["employees"]:>7} employees  {endpoint["endpoint"]:<32} {"  ".join(changes)}')
+
+
+def main():
+    args = parse_args()
+    if args.size is not None:
+        with open(args.size_output, 'w') as output:
+            json.dump(run_size(args), output)
+        return
+
+    # One process per size, since app.py binds its database when imported
+    datasets = []
+    for size in (int(size) for size in args.sizes.split(',')):
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as size_output:
+            pass
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--size', str(size), '--size-output', size_output.name]
+            + sys.argv[1:],
+            check=True
+        )
+        with open(size_output.name) as result:
+            datasets.append(json.load(result))
+        os.remove(size_output.name)
+
+    report = {
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'settings': {
+            key: value for key, value in vars(args).items()
+            if key not in ('size', 'size_output', 'output', 'compare', 'data_dir')
+        },
+        'datasets': datasets
+    }
+    output = args.output or f'endpoint-latency-{datetime.now():%Y%m%d-%H%M%S}.json'
+    with open(output, 'w') as result:
+        json.dump(report, result, indent=2)
+    print(f'Results written to {output}', file=sys.stderr)
+    for dataset in datasets:
+        if dataset['unbenchmarked_resources']:
+            print(f'Not benchmarked at {dataset["employees"]} employees: '
+                  f'{", ".join(dataset["unbenchmarked_resources"])}', file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as previous:
+            compare(json.load(previous), report)
+
+
+if __name__ == '__main__':
+    main()
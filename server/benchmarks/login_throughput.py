@@ -0,0 +1,116 @@
+"""
+Login throughput benchmark.
+
+Creates a throwaway SQLite database with --users accounts, then fires
+--requests logins from --concurrency client threads at POST /login through
+the app's test client and reports logins/second, latency percentiles and
+how many requests were turned away with 503. Use it to pick
+PASSWORD_HASH_WORKERS and BCRYPT_LOG_ROUNDS for a target login rate:
+
+    python benchmarks/login_throughput.py --rounds 12 --workers 4 --concurrency 32
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import json
+import os
+import sys
+import tempfile
+import time
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = 'benchmark-password'
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=200, help='accounts to create')
+    parser.add_argument('--requests', type=int, default=400, help='logins to attempt')
+    parser.add_argument('--concurrency', type=int, default=16, help='client threads')
+    parser.add_argument('--rounds', type=int, default=12, help='BCRYPT_LOG_ROUNDS')
+    parser.add_argument('--workers', type=int, default=0, help='PASSWORD_HASH_WORKERS (0: one per CPU)')
+    parser.add_argument('--queue-size', type=int, default=None, help='PASSWORD_HASH_QUEUE_SIZE')
+    parser.add_argument('--stored-rounds', type=int, default=None,
+                        help='cost of the stored hashes (default: --rounds); differ to measure rehash-on-login')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    db_file.close()
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_file.name}'
+    os.environ['BCRYPT_LOG_ROUNDS'] = str(args.rounds)
+    os.environ['PASSWORD_HASH_WORKERS'] = str(args.workers)
+    sys.path.insert(0, SERVER_DIR)
+
+    import bcrypt
+    from app import app
+    from models import db, Employee, User
+    from Services.password_hashing import password_hasher
+
+    if args.queue_size is not None:
+        app.config['PASSWORD_HASH_QUEUE_SIZE'] = args.queue_size
+        password_hasher.init_app(app)
+
+    stored_hash = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(args.stored_rounds or args.rounds))
+    with app.app_context():
+        db.create_all()
+        db.session.execute(Employee.__table__.insert(), [
+            {'employee_id': i, 'first_name': 'Bench', 'last_name': f'User{i}', 'date_of_birth': date(1990, 1, 1),
+             'phone': '+254700000000', 'email': f'bench{i}@example.com', 'gender': 'F', 'address': 'Nairobi',
+             'hire_date': date(2020, 1, 1), 'position': 'Clerk', 'salary': 40000.0}
+            for i in range(1, args.users + 1)
+        ])
+        db.session.execute(User.__table__.insert(), [
+            {'user_id': i, 'username': f'Bench User{i}', 'email': f'bench{i}@example.com',
+             'password': stored_hash.decode('utf-8'), 'role': 'employee', 'employee_id': i}
+            for i in range(1, args.users + 1)
+        ])
+        db.session.commit()
+
+    client = app.test_client()
+
+    def login(index):
+        email = f'bench{index % args.users + 1}@example.com'
+        started = time.perf_counter()
+        response = client.post('/login', json={'email': email, 'password': PASSWORD})
+        return response.status_code, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(login, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [seconds for status, seconds in results if status == 200]
+    statuses = {}
+    for status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    print(json.dumps({
+        'rounds': args.rounds,
+        'workers': password_hasher.workers,
+        'queue_size': password_hasher.queue_size,
+        'concurrency': args.concurrency,
+        'requests': args.requests,
+        'elapsed_seconds': round(elapsed, 3),
+        'logins_per_second': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'status_counts': statuses,
+        'latency_ms': {
+            name: round(percentile(latencies, fraction) * 1000, 1) if latencies else None
+            for name, fraction in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99))
+        }
+    }, indent=2))
+
+    os.remove(db_file.name)
+
+
+if __name__ == '__main__':
+    main()
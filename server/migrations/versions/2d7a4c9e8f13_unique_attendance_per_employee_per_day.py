@@ -0,0 +1,35 @@
+"""unique attendance record per employee per day
+
+Revision ID: 2d7a4c9e8f13
+Revises: 8e3f1b6c4a27
+Create Date: 2026-10-17 11:26:03.774512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d7a4c9e8f13'
+down_revision = '8e3f1b6c4a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Remove duplicate punches left by the old read-then-insert clock-in,
+    # keeping the first record of each employee's day
+    op.execute(
+        'DELETE FROM attendance WHERE attendance_id NOT IN ('
+        'SELECT MIN(attendance_id) FROM attendance GROUP BY employee_id, date)'
+    )
+
+    with op.batch_alter_table('attendance', schema=None) as batch_op:
+        batch_op.drop_index('ix_attendance_employee_id_date')
+        batch_op.create_index('uq_attendance_employee_id_date', ['employee_id', 'date'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('attendance', schema=None) as batch_op:
+        batch_op.drop_index('uq_attendance_employee_id_date')
+        batch_op.create_index('ix_attendance_employee_id_date', ['employee_id', 'date'], unique=False)
@@ -0,0 +1,35 @@
+"""unique tax record per employee per year
+
+Revision ID: 4a8d1f6e2b93
+Revises: e7b4c2d9a851
+Create Date: 2026-10-17 15:52:44.091237
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4a8d1f6e2b93'
+down_revision = 'e7b4c2d9a851'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Remove duplicates that slipped past the old check-then-insert,
+    # keeping the most recently entered record of each employee's year
+    op.execute(
+        'DELETE FROM tax WHERE tax_id NOT IN ('
+        'SELECT MAX(tax_id) FROM tax GROUP BY employee_id, year)'
+    )
+
+    with op.batch_alter_table('tax', schema=None) as batch_op:
+        batch_op.drop_index('ix_tax_employee_id_year')
+        batch_op.create_index('uq_tax_employee_id_year', ['employee_id', 'year'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('tax', schema=None) as batch_op:
+        batch_op.drop_index('uq_tax_employee_id_year')
+        batch_op.create_index('ix_tax_employee_id_year', ['employee_id', 'year'], unique=False)
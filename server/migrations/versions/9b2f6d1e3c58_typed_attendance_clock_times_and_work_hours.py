@@ -0,0 +1,126 @@
+"""typed attendance clock times and stored work hours
+
+Revision ID: 9b2f6d1e3c58
+Revises: 2d7a4c9e8f13
+Create Date: 2026-10-17 12:41:37.205819
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b2f6d1e3c58'
+down_revision = '2d7a4c9e8f13'
+branch_labels = None
+depends_on = None
+
+# Rows rewritten per backfill batch
+BACKFILL_CHUNK_SIZE = 5000
+
+
+def _parse_clock(value):
+    # Clock times were stored as HH:MM:SS by the API and HH:MM by the seeder
+    if value is None:
+        return None
+    for fmt in ('%H:%M:%S', '%H:%M'):
+        try:
+            return datetime.strptime(value.strip(), fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def _work_hours(clock_in, clock_out):
+    # Rows where either clock value could not be parsed get no work hours,
+    # so they never feed overtime
+    if clock_in is None or clock_out is None or clock_out < clock_in:
+        return None
+    seconds = (clock_out.hour - clock_in.hour) * 3600 \
+        + (clock_out.minute - clock_in.minute) * 60 \
+        + (clock_out.second - clock_in.second)
+    return round(seconds / 3600, 4)
+
+
+def _backfill(connection):
+    """
+    Normalise the string clock times to HH:MM:SS and compute work_hours,
+    walking the table by primary key in fixed size batches. Clock times
+    that cannot be parsed become NULL rather than a made-up time.
+    """
+    select_batch = sa.text(
+        'SELECT attendance_id, clock_in_time, clock_out_time FROM attendance '
+        'WHERE attendance_id > :last_id ORDER BY attendance_id LIMIT :limit'
+    )
+    update_row = sa.text(
+        'UPDATE attendance SET clock_in_time = :clock_in_time, clock_out_time = :clock_out_time, '
+        'work_hours = :work_hours WHERE attendance_id = :attendance_id'
+    )
+
+    last_id = 0
+    while True:
+        rows = connection.execute(select_batch, {'last_id': last_id, 'limit': BACKFILL_CHUNK_SIZE}).fetchall()
+        if not rows:
+            break
+
+        updates = []
+        for attendance_id, clock_in_value, clock_out_value in rows:
+            clock_in = _parse_clock(clock_in_value)
+            clock_out = _parse_clock(clock_out_value)
+            updates.append({
+                'attendance_id': attendance_id,
+                'clock_in_time': clock_in.strftime('%H:%M:%S') if clock_in else None,
+                'clock_out_time': clock_out.strftime('%H:%M:%S') if clock_out else None,
+                'work_hours': _work_hours(clock_in, clock_out)
+            })
+        connection.execute(update_row, updates)
+        last_id = rows[-1][0]
+
+
+def _retype_clock_columns(column_type, postgresql_cast, clock_in_nullable):
+    if op.get_bind().dialect.name == 'sqlite':
+        # Batch alter_column would CAST the values, and SQLite's numeric
+        # affinity for TIME turns '08:00:00' into 8. Declaring the new type
+        # through reflect_args copies the text unchanged instead.
+        with op.batch_alter_table('attendance', schema=None, recreate='always', reflect_args=[
+            sa.Column('clock_in_time', column_type, nullable=clock_in_nullable),
+            sa.Column('clock_out_time', column_type, nullable=True),
+        ]):
+            pass
+        return
+
+    with op.batch_alter_table('attendance', schema=None) as batch_op:
+        batch_op.alter_column('clock_in_time',
+               type_=column_type,
+               nullable=clock_in_nullable,
+               existing_nullable=not clock_in_nullable,
+               postgresql_using=f'clock_in_time::{postgresql_cast}')
+        batch_op.alter_column('clock_out_time',
+               type_=column_type,
+               existing_nullable=True,
+               postgresql_using=f'clock_out_time::{postgresql_cast}')
+
+
+def upgrade():
+    with op.batch_alter_table('attendance', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('work_hours', sa.Float(), nullable=True))
+        # Unparseable legacy clock-ins are kept as NULL
+        batch_op.alter_column('clock_in_time', existing_type=sa.String(length=100), nullable=True)
+
+    _backfill(op.get_bind())
+
+    _retype_clock_columns(sa.Time(), 'time without time zone', clock_in_nullable=True)
+
+
+def downgrade():
+    _retype_clock_columns(sa.String(length=100), 'text', clock_in_nullable=True)
+
+    # The string column is NOT NULL again; clock-ins that could not be
+    # parsed on upgrade come back empty
+    op.execute("UPDATE attendance SET clock_in_time = '' WHERE clock_in_time IS NULL")
+    with op.batch_alter_table('attendance', schema=None) as batch_op:
+        batch_op.alter_column('clock_in_time', existing_type=sa.String(length=100), nullable=False)
+
+    with op.batch_alter_table('attendance', schema=None) as batch_op:
+        batch_op.drop_column('work_hours')
@@ -0,0 +1,35 @@
+"""unique payroll record per employee per pay date
+
+Revision ID: d5b8e2f4a619
+Revises: 7c5e3a1f9d08
+Create Date: 2026-10-17 18:24:09.513377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5b8e2f4a619'
+down_revision = '7c5e3a1f9d08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Remove double payments left by overlapping or retried payroll runs,
+    # keeping the first record written for each employee and pay date
+    op.execute(
+        'DELETE FROM payroll WHERE payroll_id NOT IN ('
+        'SELECT MIN(payroll_id) FROM payroll GROUP BY employee_id, pay_date)'
+    )
+
+    with op.batch_alter_table('payroll', schema=None) as batch_op:
+        batch_op.drop_index('ix_payroll_employee_id_pay_date')
+        batch_op.create_index('uq_payroll_employee_id_pay_date', ['employee_id', 'pay_date'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('payroll', schema=None) as batch_op:
+        batch_op.drop_index('uq_payroll_employee_id_pay_date')
+        batch_op.create_index('ix_payroll_employee_id_pay_date', ['employee_id', 'pay_date'], unique=False)
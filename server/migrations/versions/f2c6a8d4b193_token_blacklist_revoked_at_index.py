@@ -0,0 +1,26 @@
+"""index token_blacklist.revoked_at for the blocklist refresh
+
+Revision ID: f2c6a8d4b193
+Revises: d5b8e2f4a619
+Create Date: 2026-10-17 16:04:27.530912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6a8d4b193'
+down_revision = 'd5b8e2f4a619'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('token_blacklist', schema=None) as batch_op:
+        batch_op.create_index('ix_token_blacklist_revoked_at', ['revoked_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('token_blacklist', schema=None) as batch_op:
+        batch_op.drop_index('ix_token_blacklist_revoked_at')
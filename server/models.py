@@ -1,6 +1,6 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy_serializer import SerializerMixin
+from Services.serializers import FastSerializerMixin, compile_serializers
 from sqlalchemy import MetaData
 from sqlalchemy.orm import validates
 from datetime import datetime
@@ -10,7 +10,7 @@ import uuid
 metadata = MetaData()
 db = SQLAlchemy(metadata=metadata)
 
-class User(db.Model, SerializerMixin):
+class User(db.Model, FastSerializerMixin):
     """
     User model for system authentication and authorization.
     One-to-One relationship with Employee - each user must be an employee.
@@ -49,7 +49,7 @@ class User(db.Model, SerializerMixin):
             }
             self.role = position_to_role.get(self.employee.position.lower(), 'employee')
 
-class Employee(db.Model, SerializerMixin):
+class Employee(db.Model, FastSerializerMixin):
     """
     Employee model representing staff members.
     Central model with multiple relationships:
@@ -74,6 +74,13 @@ class Employee(db.Model, SerializerMixin):
     department_id = db.Column(db.Integer, db.ForeignKey('departments.department_id'))
     supervisor_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'))
 
+    # Indexes
+    __table_args__ = (
+        db.Index('ix_employees_department_id', 'department_id'),
+        db.Index('ix_employees_first_name_last_name', 'first_name', 'last_name'),
+        db.Index('ix_employees_supervisor_id', 'supervisor_id'),
+    )
+
     # Relationships
     user = db.relationship('User', back_populates='employee')
     department = db.relationship('Department', foreign_keys=[department_id], back_populates='employees')
@@ -82,13 +89,14 @@ class Employee(db.Model, SerializerMixin):
     payrolls = db.relationship('Payroll', back_populates='employee', cascade='all, delete-orphan')
     attendances = db.relationship('Attendance', back_populates='employee', cascade='all, delete-orphan')
     leaves = db.relationship('Leave', back_populates='employee', cascade='all, delete-orphan')
+    leave_balances = db.relationship('LeaveBalance', back_populates='employee', cascade='all, delete-orphan')
     tax_records = db.relationship('Tax', back_populates='employee', cascade='all, delete-orphan')
     bonuses = db.relationship('Bonus', back_populates='employee', cascade='all, delete-orphan')
 
     # Serialize rules to prevent circular references
     serialize_rules = ('-user', '-department', '-supervisor', '-subordinates', 
                       '-payrolls', '-attendances', '-leaves', '-tax_records', 
-                      '-bonuses', '-managed_department')
+                      '-bonuses', '-managed_department', '-leave_balances')
 
     @validates('email', 'phone')
     def validate_fields(self, key, value):
@@ -102,7 +110,7 @@ class Employee(db.Model, SerializerMixin):
                 raise ValueError(f"{value} is not a valid phone number")
         return value
 
-class Department(db.Model, SerializerMixin):
+class Department(db.Model, FastSerializerMixin):
     """
     Department model representing company divisions.
     Has relationships with Employee model:
@@ -124,7 +132,7 @@ class Department(db.Model, SerializerMixin):
     # Serialize rules
     serialize_rules = ('-employees', '-manager')
 
-class Payroll(db.Model, SerializerMixin):
+class Payroll(db.Model, FastSerializerMixin):
     """
     Payroll model for tracking employee compensation.
     Many-to-One relationship with Employee.
@@ -139,6 +147,13 @@ class Payroll(db.Model, SerializerMixin):
     deductions = db.Column(db.Float, nullable=False, default=0.0)
     bonuses = db.Column(db.Float, default=0.0)
     total_pay = db.Column(db.Float, nullable=False)
+
+    # One record per employee per pay date; also backs the list filters
+    # and keyset pagination
+    __table_args__ = (
+        db.Index('uq_payroll_employee_id_pay_date', 'employee_id', 'pay_date', unique=True),
+        db.Index('ix_payroll_pay_date', 'pay_date'),
+    )
     
     # Relationship with Employee
     employee = db.relationship('Employee', back_populates='payrolls')
@@ -146,7 +161,7 @@ class Payroll(db.Model, SerializerMixin):
     # Serialize rules
     serialize_rules = ('-employee',)
 
-class Attendance(db.Model, SerializerMixin):
+class Attendance(db.Model, FastSerializerMixin):
     """
     Attendance model for tracking employee attendance.
     Many-to-One relationship with Employee.
@@ -156,17 +171,26 @@ class Attendance(db.Model, SerializerMixin):
     attendance_id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'), nullable=False)
     date = db.Column(db.Date(), nullable=False)
-    clock_in_time = db.Column(db.String(100), nullable=False)
-    clock_out_time = db.Column(db.String(100), nullable=True)
+    clock_in_time = db.Column(db.Time(), nullable=True)  # NULL only for legacy rows that could not be parsed
+    clock_out_time = db.Column(db.Time(), nullable=True)
     status = db.Column(db.String(100), nullable=False)
+    work_hours = db.Column(db.Float, nullable=True)  # Set at clock-out
+
+    # One record per employee per day; also backs the list filters
+    __table_args__ = (
+        db.Index('uq_attendance_employee_id_date', 'employee_id', 'date', unique=True),
+        db.Index('ix_attendance_date', 'date'),
+    )
     
     # Relationship with Employee
     employee = db.relationship('Employee', back_populates='attendances')
     
     # Serialize rules
     serialize_rules = ('-employee',)
+    # Clock times keep the HH:MM:SS format they had as strings
+    time_format = '%H:%M:%S'
 
-class Leave(db.Model, SerializerMixin):
+class Leave(db.Model, FastSerializerMixin):
     """
     Leave model for managing employee time off.
     Many-to-One relationship with Employee.
@@ -180,6 +204,12 @@ class Leave(db.Model, SerializerMixin):
     start_date = db.Column(db.Date(), nullable=False)
     end_date = db.Column(db.Date(), nullable=False)
     status = db.Column(db.String(100), nullable=False, default='Pending')
+
+    # Indexes backing the list filters and keyset pagination
+    __table_args__ = (
+        db.Index('ix_leave_employee_id_start_date_end_date', 'employee_id', 'start_date', 'end_date'),
+        db.Index('ix_leave_start_date', 'start_date'),
+    )
     
     # Relationship with Employee
     employee = db.relationship('Employee', back_populates='leaves')
@@ -187,7 +217,28 @@ class Leave(db.Model, SerializerMixin):
     # Serialize rules
     serialize_rules = ('-employee',)
 
-class Tax(db.Model, SerializerMixin):
+class LeaveBalance(db.Model, FastSerializerMixin):
+    """
+    Leave balance per employee and leave type.
+    Kept up to date as leaves are created, approved or withdrawn, so a
+    balance is one primary key read instead of a scan of Leave.
+    """
+    __tablename__ = 'leave_balance'
+    
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.employee_id'), primary_key=True)
+    leave_type = db.Column(db.String(100), primary_key=True)
+    accrued_days = db.Column(db.Float, nullable=False, default=0.0)
+    used_days = db.Column(db.Float, nullable=False, default=0.0)  # Approved leave
+    pending_days = db.Column(db.Float, nullable=False, default=0.0)  # Leave awaiting approval
+    accrued_through = db.Column(db.Date(), nullable=True)  # Month of the last accrual credit
+    
+    # Relationship with Employee
+    employee = db.relationship('Employee', back_populates='leave_balances')
+    
+    # Serialize rules
+    serialize_rules = ('-employee',)
+
+class Tax(db.Model, FastSerializerMixin):
     """
     Tax model for managing employee tax records.
     Many-to-One relationship with Employee.
@@ -199,6 +250,12 @@ class Tax(db.Model, SerializerMixin):
     tax_percentage = db.Column(db.Float, nullable=False)
     tax_amount = db.Column(db.Float, nullable=False)
     year = db.Column(db.Integer, nullable=False)
+
+    # Indexes backing the list filters and keyset pagination
+    __table_args__ = (
+        db.Index('uq_tax_employee_id_year', 'employee_id', 'year', unique=True),
+        db.Index('ix_tax_year', 'year'),
+    )
     
     # Relationship with Employee
     employee = db.relationship('Employee', back_populates='tax_records')
@@ -206,7 +263,18 @@ class Tax(db.Model, SerializerMixin):
     # Serialize rules
     serialize_rules = ('-employee',)
 
-class Bonus(db.Model, SerializerMixin):
+class TaxBracket(db.Model, FastSerializerMixin):
+    """
+    One band of a year's progressive income tax table.
+    The band runs from lower_bound up to the next band's lower_bound.
+    """
+    __tablename__ = 'tax_bracket'
+    
+    year = db.Column(db.Integer, primary_key=True)
+    lower_bound = db.Column(db.Float, primary_key=True)
+    tax_percentage = db.Column(db.Float, nullable=False)  # Marginal rate inside the band
+
+class Bonus(db.Model, FastSerializerMixin):
     """
     Bonus model for tracking employee bonuses.
     Many-to-One relationship with Employee.
@@ -218,6 +286,12 @@ class Bonus(db.Model, SerializerMixin):
     bonus_amount = db.Column(db.Float, nullable=False)
     bonus_date = db.Column(db.Date, nullable=False)
     reason = db.Column(db.String(300), nullable=False)
+
+    # Indexes backing the list filters and keyset pagination
+    __table_args__ = (
+        db.Index('ix_bonus_employee_id_bonus_date', 'employee_id', 'bonus_date'),
+        db.Index('ix_bonus_bonus_date', 'bonus_date'),
+    )
     
     # Relationship with Employee
     employee = db.relationship('Employee', back_populates='bonuses')
@@ -227,12 +301,15 @@ class Bonus(db.Model, SerializerMixin):
 
 
 
-class TokenBlacklist(db.Model, SerializerMixin):
+class TokenBlacklist(db.Model, FastSerializerMixin):
     """
     Token blacklist model for managing JWT tokens.
     This model stores tokens that are no longer valid.
     """
     __tablename__ = 'token_blacklist'
+    __table_args__ = (
+        db.Index('ix_token_blacklist_revoked_at', 'revoked_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     jti = db.Column(db.String(36), unique=True, nullable=True)  # Make it nullable initially
@@ -246,4 +323,9 @@ class TokenBlacklist(db.Model, SerializerMixin):
         # If jti is not provided, generate a unique one
         if 'jti' not in kwargs:
             kwargs['jti'] = str(uuid.uuid4())
-        super().__init__(*args, **kwargs)
\ No newline at end of file
+        super().__init__(*args, **kwargs)
+
+
+# Build the column serializers once, now that every model is mapped
+compile_serializers(User, Employee, Department, Payroll, Attendance, Leave, LeaveBalance, Tax, TaxBracket, Bonus,
+                    TokenBlacklist)
@@ -0,0 +1,123 @@
+"""
+Shared fixtures. Every test gets an empty SQLite database in a temporary
+directory and empty in-process caches.
+"""
+from datetime import date
+import glob
+from itertools import count
+import os
+import sys
+import tempfile
+import pytest
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix='payroll-tests-'), 'test.db')
+
+# app.py reads its configuration at import time
+os.environ['DATABASE_URL'] = f'sqlite:///{DATABASE_PATH}'
+os.environ['BCRYPT_LOG_ROUNDS'] = '4'
+sys.path.insert(0, SERVER_DIR)
+
+from app import app as flask_app  # noqa: E402
+from models import db as _db, Department, Employee  # noqa: E402
+from Services.attendance_rollup import clear_rollup_cache  # noqa: E402
+from Services.authz import clear_role_cache  # noqa: E402
+from Services.department_stats import clear_department_stats  # noqa: E402
+from Services.employee_lookup import clear_employee_cache  # noqa: E402
+from Services.password_hashing import password_hasher  # noqa: E402
+from Services.tax_brackets import clear_tax_tables  # noqa: E402
+
+flask_app.config['TESTING'] = True
+# The app puts the integer user_id in "sub", which PyJWT 2.10+ rejects
+# unless this check is off (the pinned PyJWT 2.9 never checks it)
+flask_app.config['JWT_VERIFY_SUB'] = False
+password_hasher.log_rounds = 4
+password_hasher.processes = 1
+
+
+def _clear_caches():
+    clear_rollup_cache()
+    clear_role_cache()
+    clear_department_stats()
+    clear_employee_cache()
+    clear_tax_tables()
+
+
+@pytest.fixture
+def app():
+    return flask_app
+
+
+@pytest.fixture
+def db(app):
+    """
+    An app context over freshly created tables.
+    """
+    with app.app_context():
+        _db.create_all()
+        _clear_caches()
+        yield _db
+        _db.session.remove()
+        # departments and employees reference each other, so drop_all
+        # cannot order them; start the next test from a new file instead
+        _db.engine.dispose()
+    for path in glob.glob(DATABASE_PATH + '*'):
+        os.remove(path)
+    _clear_caches()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_header(app):
+    """
+    Factory for an Authorization header carrying user_id and role.
+    """
+    from flask_jwt_extended import create_access_token
+
+    def header(user_id, role='employee'):
+        with app.app_context():
+            token = create_access_token(identity=user_id, additional_claims={'role': role})
+        return {'Authorization': f'Bearer {token}'}
+    return header
+
+
+@pytest.fixture
+def department(db):
+    department = Department(department_name='Operations')
+    db.session.add(department)
+    db.session.commit()
+    return department
+
+
+@pytest.fixture
+def make_employee(db, department):
+    """
+    Factory for committed employees; keyword arguments override the defaults.
+    """
+    serial = count(1)
+
+    def make(**fields):
+        number = next(serial)
+        values = {
+            'first_name': f'First{number}',
+            'last_name': f'Last{number}',
+            'date_of_birth': date(1990, 1, 1),
+            'phone': f'+2547000{number:05d}',
+            'email': f'employee{number}@example.com',
+            'gender': 'F',
+            'address': 'Nairobi',
+            'hire_date': date(2020, 1, 1),
+            'position': 'Clerk',
+            'salary': 60000.0,
+            'department_id': department.department_id,
+        }
+        values.update(fields)
+        employee = Employee(**values)
+        db.session.add(employee)
+        db.session.commit()
+        return employee
+    return make
@@ -0,0 +1,130 @@
+from datetime import date
+import pytest
+from models import Department, Employee, User
+from Services.employee_import import import_employees
+from Services.password_hashing import password_hasher
+
+
+@pytest.fixture
+def row(department):
+    serial = iter(range(1, 1000))
+
+    def make(**fields):
+        number = next(serial)
+        values = {
+            'first_name': 'new',
+            'last_name': f'hire{number}',
+            'date_of_birth': '1995-05-05',
+            'phone': f'+2547111{number:05d}',
+            'email': f'hire{number}@example.com',
+            'gender': 'M',
+            'address': 'Kisumu',
+            'hire_date': '2026-01-05',
+            'position': 'Clerk',
+            'salary': '45000',
+            'password': 'secret123',
+            'department_id': department.department_id,
+        }
+        values.update(fields)
+        return values
+    return make
+
+
+def errors(results):
+    return [result.get('error') for result in results]
+
+
+def test_valid_rows_get_an_employee_and_a_user(db, row, department):
+    created, results = import_employees([row(), row(position='Manager'), row(department_id=None, role='HR')])
+
+    assert created == 3
+    assert [result['status'] for result in results] == ['created'] * 3
+    assert [result['role'] for result in results] == ['employee', 'manager', 'hr']
+
+    user = db.session.get(User, results[0]['user_id'])
+    assert user.employee_id == results[0]['employee_id']
+    assert user.username == 'New Hire1'
+    assert password_hasher.verify(user.password, 'secret123')
+    employee = db.session.get(Employee, results[0]['employee_id'])
+    assert (employee.hire_date, employee.salary) == (date(2026, 1, 5), 45000.0)
+    assert db.session.get(Department, department.department_id).manager_id == results[1]['employee_id']
+
+
+@pytest.mark.parametrize('fields, error', [
+    ({'email': ' '}, 'email is required'),
+    ({'email': 'not-an-email'}, 'Invalid email address'),
+    ({'phone': '12-34'}, 'Invalid phone number'),
+    ({'hire_date': '05/01/2026'}, 'Invalid date format. Use YYYY-MM-DD'),
+    ({'salary': 'lots'}, 'Salary must be a number'),
+    ({'confirm_password': 'other'}, 'Passwords do not match'),
+    ({'department_id': 'ops'}, 'Department ID must be an integer'),
+    ({'department_id': 999}, 'Invalid department ID'),
+    ({'position': 'Manager', 'department_id': None}, 'Department ID is required for manager position'),
+    ({'role': 'admin'}, 'Admin accounts cannot be registered in bulk'),
+    ({'position': 'Admin'}, 'Admin accounts cannot be registered in bulk'),
+    ({'role': 'owner'}, 'Role must be one of: employee, manager, hr'),
+])
+def test_invalid_row_fails_alone(db, row, fields, error):
+    created, results = import_employees([row(), row(**fields), row()])
+
+    assert created == 2
+    assert errors(results) == [None, error, None]
+    assert results[1] == {'row': 1, 'status': 'error', 'error': error}
+
+
+def test_non_object_row(db, row):
+    _, results = import_employees(['oops', row()])
+
+    assert errors(results) == ['Row must be an object', None]
+
+
+def test_contacts_already_registered(db, row, make_employee):
+    employee = make_employee()
+    db.session.add(User(username='Lone User', email='user.only@example.com', password='x', role='employee'))
+    db.session.commit()
+
+    created, results = import_employees([
+        row(email=employee.email),
+        row(phone=employee.phone),
+        row(email='user.only@example.com'),
+    ])
+
+    assert created == 0
+    assert errors(results) == ['Email address already exists', 'Phone number already exists',
+                               'Email address already exists']
+
+
+def test_duplicates_within_the_batch(db, row):
+    first = row()
+    created, results = import_employees([
+        first,
+        row(email=first['email']),
+        row(phone=first['phone']),
+        # The rejected rows above do not claim their other contact
+        row(email='hire2@example.com'),
+    ])
+
+    assert created == 2
+    assert errors(results) == [None, 'Email address appears earlier in the batch',
+                               'Phone number appears earlier in the batch', None]
+
+
+def test_one_manager_per_department(db, row, make_employee, department):
+    created, results = import_employees([row(position='Manager'), row(position='Manager')])
+    assert created == 1
+    assert errors(results) == [None, 'Department already has a manager']
+
+    _, results = import_employees([row(position='Manager')])
+    assert errors(results) == ['Department already has a manager']
+
+
+def test_small_chunks_and_lookup_batches(db, row, monkeypatch):
+    monkeypatch.setattr('Services.employee_import.LOOKUP_CHUNK_SIZE', 2)
+    rows = [row() for _ in range(5)]
+    rows.append(dict(rows[0]))
+
+    created, results = import_employees(rows, chunk_size=2)
+
+    assert created == 5
+    assert errors(results)[-1] == 'Phone number appears earlier in the batch'
+    assert db.session.query(User).count() == 5
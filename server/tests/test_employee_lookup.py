@@ -0,0 +1,79 @@
+import pytest
+from models import Bonus, Employee
+from Services import employee_lookup
+from Services.employee_lookup import AmbiguousEmployeeName, EmployeeNotFound, InvalidEmployeeName
+from Services.employee_lookup import resolve_employee, resolve_employee_reference, resolve_employees
+
+
+def test_names_that_match_nobody_are_not_cached(db, make_employee):
+    with pytest.raises(EmployeeNotFound):
+        resolve_employee('Jane Doe')
+    assert resolve_employees(['Jane Doe'])['Jane Doe'].status == 404
+    assert ('Jane', 'Doe') not in employee_lookup._cache
+
+    employee = make_employee(first_name='Jane', last_name='Doe')
+
+    assert resolve_employee('Jane Doe') == (employee.employee_id, 'Jane', 'Doe')
+
+
+def test_cached_name_is_dropped_when_the_write_commits(db, make_employee):
+    first = make_employee(first_name='Jane', last_name='Doe')
+    resolve_employee('Jane Doe')
+
+    db.session.add(Employee(
+        first_name='Jane', last_name='Doe', date_of_birth=first.date_of_birth, phone='+254799999999',
+        email='jane.two@example.com', gender='F', address='Nairobi', hire_date=first.hire_date,
+        position='Clerk', salary=60000.0
+    ))
+    db.session.flush()
+    # Not yet committed: other sessions still see a single Jane Doe
+    assert ('Jane', 'Doe') in employee_lookup._cache
+
+    db.session.commit()
+
+    with pytest.raises(AmbiguousEmployeeName):
+        resolve_employee('Jane Doe')
+
+
+def test_rolled_back_write_keeps_the_cache(db, make_employee):
+    employee = make_employee(first_name='Jane', last_name='Doe')
+    resolve_employee('Jane Doe')
+
+    employee.last_name = 'Roe'
+    db.session.flush()
+    db.session.rollback()
+
+    assert ('Jane', 'Doe') in employee_lookup._cache
+    assert resolve_employee('Jane Doe')[0] == employee.employee_id
+
+
+def test_reference_prefers_the_id(db, make_employee):
+    first = make_employee(first_name='Jane', last_name='Doe')
+    make_employee(first_name='Jane', last_name='Doe')
+
+    assert resolve_employee_reference(first.employee_id, 'Jane Doe') == (first.employee_id, 'Jane', 'Doe')
+    with pytest.raises(AmbiguousEmployeeName):
+        resolve_employee_reference(None, 'Jane Doe')
+    with pytest.raises(EmployeeNotFound):
+        resolve_employee_reference(999)
+    with pytest.raises(InvalidEmployeeName, match='Employee ID or employee name is required'):
+        resolve_employee_reference(None, None)
+
+
+def test_namesakes_can_be_given_records_by_id(db, make_employee, client, auth_header):
+    first = make_employee(first_name='Jane', last_name='Doe')
+    second = make_employee(first_name='Jane', last_name='Doe')
+    headers = auth_header(first.employee_id)
+    body = {'bonus_amount': 500.0, 'reason': 'Quarter close'}
+
+    response = client.post('/bonus', json=dict(body, employee_name='Jane Doe'), headers=headers)
+    assert response.status_code == 409
+
+    response = client.post('/bonus', json=dict(body, employee_id=second.employee_id), headers=headers)
+    assert response.status_code == 201
+    assert response.json['employee_name'] == 'Jane Doe'
+    assert db.session.query(Bonus.employee_id).scalar() == second.employee_id
+
+    response = client.post('/bonus', json=body, headers=headers)
+    assert response.status_code == 400
+    assert response.json['message'] == 'Employee ID or employee name is required'
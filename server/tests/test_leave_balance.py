@@ -0,0 +1,134 @@
+from datetime import date
+import pytest
+from models import Leave
+from Services.leave_balance import accrue_leave, apply_leave_change, get_balance, leave_days, snapshot
+
+ENTITLEMENTS = {'Vacation': 24.0}
+
+
+@pytest.fixture
+def leave(db, make_employee):
+    employee = make_employee()
+    return Leave(employee_id=employee.employee_id, leave_type='Vacation', application_date=date(2026, 3, 1),
+                 start_date=date(2026, 3, 10), end_date=date(2026, 3, 12), status='Pending')
+
+
+def balance_of(leave):
+    balance = get_balance(leave.employee_id, leave.leave_type)
+    return balance.accrued_days, balance.used_days, balance.pending_days
+
+
+def test_leave_days_counts_both_ends():
+    assert leave_days(date(2026, 3, 10), date(2026, 3, 10)) == 1
+    assert leave_days(date(2026, 2, 27), date(2026, 3, 2)) == 4
+
+
+def test_leave_moves_from_pending_to_used_to_nothing(db, leave):
+    db.session.add(leave)
+    apply_leave_change(None, snapshot(leave))
+    db.session.commit()
+    assert balance_of(leave) == (0.0, 0.0, 3.0)
+
+    before = snapshot(leave)
+    leave.status = 'Approved'
+    apply_leave_change(before, snapshot(leave))
+    db.session.commit()
+    assert balance_of(leave) == (0.0, 3.0, 0.0)
+
+    before = snapshot(leave)
+    leave.end_date = date(2026, 3, 16)
+    apply_leave_change(before, snapshot(leave))
+    db.session.commit()
+    assert balance_of(leave) == (0.0, 7.0, 0.0)
+
+    before = snapshot(leave)
+    leave.status = 'Cancelled'
+    apply_leave_change(before, snapshot(leave))
+    db.session.commit()
+    assert balance_of(leave) == (0.0, 0.0, 0.0)
+
+
+def test_changing_leave_type_moves_the_days(db, leave):
+    db.session.add(leave)
+    apply_leave_change(None, snapshot(leave))
+    before = snapshot(leave)
+    leave.leave_type = 'Sick Leave'
+    apply_leave_change(before, snapshot(leave))
+    db.session.commit()
+
+    assert get_balance(leave.employee_id, 'Vacation').pending_days == 0.0
+    assert get_balance(leave.employee_id, 'Sick Leave').pending_days == 3.0
+
+
+def test_deleting_leave_releases_the_days(db, leave):
+    leave.status = 'Approved'
+    db.session.add(leave)
+    apply_leave_change(None, snapshot(leave))
+    db.session.commit()
+
+    apply_leave_change(snapshot(leave), None)
+    db.session.delete(leave)
+    db.session.commit()
+
+    assert balance_of(leave) == (0.0, 0.0, 0.0)
+
+
+def test_accrual_is_idempotent_within_a_month(db, make_employee):
+    employee = make_employee()
+
+    assert accrue_leave(date(2026, 3, 5), ENTITLEMENTS) == {'Vacation': 1}
+    assert accrue_leave(date(2026, 3, 28), ENTITLEMENTS) == {'Vacation': 0}
+    db.session.commit()
+
+    balance = get_balance(employee.employee_id, 'Vacation')
+    assert balance.accrued_days == 2.0
+    assert balance.accrued_through == date(2026, 3, 1)
+
+
+def test_accrual_credits_each_new_month(db, make_employee):
+    employee = make_employee()
+
+    accrue_leave(date(2026, 3, 1), ENTITLEMENTS)
+    accrue_leave(date(2026, 4, 1), ENTITLEMENTS)
+    # A late run for an earlier month does not credit it again
+    assert accrue_leave(date(2026, 2, 1), ENTITLEMENTS) == {'Vacation': 0}
+    db.session.commit()
+
+    assert get_balance(employee.employee_id, 'Vacation').accrued_days == 4.0
+
+
+def test_accrual_skips_employees_hired_after_the_month(db, make_employee):
+    hired = make_employee(hire_date=date(2026, 3, 31))
+    not_yet = make_employee(hire_date=date(2026, 4, 1))
+
+    accrue_leave(date(2026, 3, 1), ENTITLEMENTS)
+    db.session.commit()
+
+    assert get_balance(hired.employee_id, 'Vacation').accrued_days == 2.0
+    assert get_balance(not_yet.employee_id, 'Vacation') is None
+
+
+def test_accrual_keeps_used_and_pending_days(db, leave):
+    db.session.add(leave)
+    apply_leave_change(None, snapshot(leave))
+    db.session.commit()
+
+    accrue_leave(date(2026, 3, 1), ENTITLEMENTS)
+    db.session.commit()
+
+    assert balance_of(leave) == (2.0, 0.0, 3.0)
+
+
+def test_only_admins_read_other_balances(db, make_employee, client, auth_header):
+    own, other = make_employee(), make_employee()
+    accrue_leave(date(2026, 3, 1), ENTITLEMENTS)
+    db.session.commit()
+
+    response = client.get('/leave/balance', headers=auth_header(own.employee_id))
+    assert response.status_code == 200
+    assert [row['employee_id'] for row in response.json] == [own.employee_id]
+
+    url = f'/leave/balance?employee_id={other.employee_id}'
+    assert client.get(url, headers=auth_header(own.employee_id)).status_code == 403
+    assert client.get(url + '&leave_type=Vacation', headers=auth_header(own.employee_id)).status_code == 403
+    assert client.get(url, headers=auth_header(own.employee_id, role='admin')).status_code == 200
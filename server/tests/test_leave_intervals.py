@@ -0,0 +1,91 @@
+from datetime import date
+import sqlite3
+import pytest
+from models import Leave
+from Services.leave_intervals import find_overlapping_leave, leave_calendar, lock_leave_dates
+
+
+@pytest.fixture
+def add_leave(db):
+    def add(employee, start_date, end_date, status='Approved', leave_type='Vacation'):
+        leave = Leave(employee_id=employee.employee_id, leave_type=leave_type, application_date=date(2026, 1, 1),
+                      start_date=start_date, end_date=end_date, status=status)
+        db.session.add(leave)
+        db.session.commit()
+        return leave
+    return add
+
+
+@pytest.mark.parametrize('start_date, end_date, overlaps', [
+    (date(2026, 3, 1), date(2026, 3, 9), False),    # ends the day before
+    (date(2026, 3, 1), date(2026, 3, 10), True),    # ends on the first day
+    (date(2026, 3, 12), date(2026, 3, 13), True),   # inside
+    (date(2026, 3, 1), date(2026, 3, 31), True),    # covers it
+    (date(2026, 3, 15), date(2026, 3, 20), True),   # starts on the last day
+    (date(2026, 3, 16), date(2026, 3, 20), False),  # starts the day after
+])
+def test_overlap_boundaries(db, make_employee, add_leave, start_date, end_date, overlaps):
+    employee = make_employee()
+    leave = add_leave(employee, date(2026, 3, 10), date(2026, 3, 15))
+
+    conflict = find_overlapping_leave(employee.employee_id, start_date, end_date)
+
+    assert (conflict.leave_id if conflict else None) == (leave.leave_id if overlaps else None)
+
+
+def test_inactive_leave_and_other_employees_do_not_conflict(db, make_employee, add_leave):
+    employee, colleague = make_employee(), make_employee()
+    add_leave(employee, date(2026, 3, 10), date(2026, 3, 15), status='Rejected')
+    add_leave(employee, date(2026, 3, 10), date(2026, 3, 15), status='Cancelled')
+    add_leave(colleague, date(2026, 3, 10), date(2026, 3, 15))
+
+    assert find_overlapping_leave(employee.employee_id, date(2026, 3, 12), date(2026, 3, 12)) is None
+
+
+def test_pending_leave_conflicts(db, make_employee, add_leave):
+    employee = make_employee()
+    leave = add_leave(employee, date(2026, 3, 10), date(2026, 3, 15), status='Pending')
+
+    assert find_overlapping_leave(employee.employee_id, date(2026, 3, 12), date(2026, 3, 20)) is leave
+
+
+def test_excluded_leave_does_not_conflict_with_itself(db, make_employee, add_leave):
+    employee = make_employee()
+    leave = add_leave(employee, date(2026, 3, 10), date(2026, 3, 15))
+    earlier = add_leave(employee, date(2026, 3, 1), date(2026, 3, 4))
+
+    assert find_overlapping_leave(employee.employee_id, date(2026, 3, 11), date(2026, 3, 16),
+                                  exclude_leave_id=leave.leave_id) is None
+    # The earliest conflicting leave is reported
+    assert find_overlapping_leave(employee.employee_id, date(2026, 3, 1), date(2026, 3, 31)) is earlier
+
+
+def test_calendar_window_department_and_status(db, make_employee, add_leave):
+    employee = make_employee()
+    elsewhere = make_employee(department_id=None)
+    inside = add_leave(employee, date(2026, 3, 30), date(2026, 4, 2))
+    add_leave(employee, date(2026, 4, 10), date(2026, 4, 12))
+    add_leave(employee, date(2026, 3, 1), date(2026, 3, 31), status='Rejected', leave_type='Sick Leave')
+    add_leave(elsewhere, date(2026, 4, 1), date(2026, 4, 1))
+
+    rows = leave_calendar(date(2026, 4, 1), date(2026, 4, 5), department_id=employee.department_id)
+    assert [row.leave_id for row in rows] == [inside.leave_id]
+    assert (rows[0].first_name, rows[0].last_name) == (employee.first_name, employee.last_name)
+
+    rejected = leave_calendar(date(2026, 3, 31), date(2026, 3, 31), status='Rejected')
+    assert [row.leave_type for row in rejected] == ['Sick Leave']
+
+
+def test_lock_blocks_other_writers_until_commit(db, make_employee):
+    employee = make_employee()
+    other = sqlite3.connect(db.engine.url.database, timeout=0)
+    try:
+        lock_leave_dates(employee.employee_id)
+        with pytest.raises(sqlite3.OperationalError, match='locked'):
+            other.execute("UPDATE employees SET address = 'Mombasa'")
+
+        db.session.commit()
+        other.execute("UPDATE employees SET address = 'Mombasa'")
+        other.commit()
+    finally:
+        other.close()
@@ -0,0 +1,122 @@
+from datetime import date, time
+from models import Attendance, Payroll, Tax
+from Services import payroll_run
+from Services.payroll_run import period_bounds, run_payroll
+
+PAY_DATE = date(2026, 3, 31)
+
+
+def payroll_rows(db, pay_date=PAY_DATE):
+    return db.session.query(Payroll.employee_id).filter(Payroll.pay_date == pay_date).order_by(
+        Payroll.employee_id).all()
+
+
+def test_period_bounds():
+    assert period_bounds(date(2024, 2, 10)) == (date(2024, 2, 1), date(2024, 2, 29))
+
+
+def test_run_pays_everyone_hired_by_the_end_of_the_period(db, make_employee):
+    first = make_employee()
+    second = make_employee(hire_date=PAY_DATE)
+    make_employee(hire_date=date(2026, 4, 1))
+
+    summary, rows = run_payroll(PAY_DATE)
+
+    assert summary['employees'] == 2
+    assert summary['created'] == 2
+    assert summary['skipped'] == 0
+    assert {row['employee_id'] for row in rows} == {first.employee_id, second.employee_id}
+    assert payroll_rows(db) == [(first.employee_id,), (second.employee_id,)]
+
+
+def test_repeated_run_skips_employees_already_paid(db, make_employee):
+    make_employee()
+    make_employee()
+    run_payroll(PAY_DATE)
+
+    summary, rows = run_payroll(PAY_DATE)
+
+    assert summary['created'] == 0
+    assert summary['skipped'] == 2
+    assert summary['total_pay'] == 0
+    assert rows == []
+    assert len(payroll_rows(db)) == 2
+
+
+def test_run_skips_an_employee_paid_by_hand(db, make_employee):
+    paid = make_employee()
+    unpaid = make_employee()
+    db.session.add(Payroll(employee_id=paid.employee_id, pay_date=PAY_DATE, base_salary=1.0,
+                           deductions=0.0, total_pay=1.0))
+    db.session.commit()
+
+    summary, rows = run_payroll(PAY_DATE)
+
+    assert summary['created'] == 1
+    assert summary['skipped'] == 1
+    assert [row['employee_id'] for row in rows] == [unpaid.employee_id]
+    assert db.session.query(Payroll.total_pay).filter_by(employee_id=paid.employee_id).scalar() == 1.0
+
+
+def test_rows_written_by_a_concurrent_run_are_not_paid_twice(db, make_employee, monkeypatch):
+    raced = make_employee()
+    other = make_employee()
+    insert_ignore = payroll_run.insert_ignore
+
+    def insert_after_concurrent_run(table, index_elements):
+        # Another run pays one employee after this run read the paid set
+        db.session.add(Payroll(employee_id=raced.employee_id, pay_date=PAY_DATE, base_salary=1.0,
+                               deductions=0.0, total_pay=1.0))
+        db.session.flush()
+        return insert_ignore(table, index_elements)
+
+    monkeypatch.setattr(payroll_run, 'insert_ignore', insert_after_concurrent_run)
+    summary, rows = run_payroll(PAY_DATE)
+
+    assert summary['created'] == 1
+    assert summary['skipped'] == 1
+    assert [row['employee_id'] for row in rows] == [other.employee_id]
+    assert payroll_rows(db) == [(raced.employee_id,), (other.employee_id,)]
+
+
+def test_dry_run_writes_nothing(db, make_employee):
+    make_employee()
+
+    summary, rows = run_payroll(PAY_DATE, dry_run=True)
+
+    assert summary['created'] == 0
+    assert len(rows) == 1
+    assert payroll_rows(db) == []
+
+
+def test_department_filter(db, make_employee, department):
+    included = make_employee()
+    make_employee(department_id=None)
+
+    summary, rows = run_payroll(PAY_DATE, department_id=department.department_id)
+
+    assert summary['employees'] == 1
+    assert [row['employee_id'] for row in rows] == [included.employee_id]
+
+
+def test_overtime_and_tax_record(db, make_employee):
+    employee = make_employee(salary=192000.0)
+    db.session.add_all([
+        Attendance(employee_id=employee.employee_id, date=date(2026, 3, 2), clock_in_time=time(8, 0),
+                   clock_out_time=time(18, 0), work_hours=10.0, status='Completed'),
+        # Outside the period, and without work hours: neither counts
+        Attendance(employee_id=employee.employee_id, date=date(2026, 4, 1), clock_in_time=time(8, 0),
+                   clock_out_time=time(20, 0), work_hours=12.0, status='Completed'),
+        Attendance(employee_id=employee.employee_id, date=date(2026, 3, 3), clock_in_time=time(8, 0),
+                   status='Present'),
+        Tax(employee_id=employee.employee_id, tax_percentage=20.0, tax_amount=24000.0, year=2026),
+    ])
+    db.session.commit()
+
+    _, [row] = run_payroll(PAY_DATE, dry_run=True)
+
+    # 16000 a month over 160 hours is 100 an hour; 2 hours at time and a half
+    assert row['base_salary'] == 16000.0
+    assert row['overtime'] == 300.0
+    assert row['deductions'] == 2000.0
+    assert row['total_pay'] == 14300.0
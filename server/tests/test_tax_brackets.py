@@ -0,0 +1,102 @@
+import pytest
+from Services.tax_brackets import DEFAULT_BRACKETS, TaxTable, get_tax_table, set_tax_brackets
+
+
+@pytest.fixture
+def table():
+    return TaxTable(2026, DEFAULT_BRACKETS)
+
+
+@pytest.mark.parametrize('income, tax', [
+    (-500.0, 0.0),
+    (0.0, 0.0),
+    (9999.0, 0.0),
+    (10000.0, 0.0),           # exactly on a bound: nothing taxed at the new rate yet
+    (10001.0, 0.1),
+    (39999.0, 2999.9),
+    (40000.0, 3000.0),
+    (40001.0, 3000.2),
+    (90000.0, 13000.0),
+    (180000.0, 40000.0),
+    (200000.0, 48000.0),      # beyond the last bound
+])
+def test_tax_at_bracket_boundaries(table, income, tax):
+    assert table.tax(income) == pytest.approx(tax)
+
+
+def test_tax_many_matches_tax(table):
+    incomes = [-1.0, 0.0, 10000.0, 10000.01, 55555.55, 90000.0, 1e7]
+
+    assert table.tax_many(incomes) == [table.tax(income) for income in incomes]
+
+
+def test_withholding_annualises_the_period_pay(table):
+    # 4000 a month is 48000 a year: 3000 + 8000 * 20% = 4600, 383.33 a month
+    assert table.withholding_many([4000.0, 0.0, 500.0]) == [383.33, 0.0, 0.0]
+    assert table.withholding_many([48000.0], periods=1) == [4600.0]
+
+
+def test_brackets_are_sorted_on_load():
+    table = TaxTable(2026, [(40000, 20), (0, 0), (10000, 10)])
+
+    assert table.bounds == [0.0, 10000.0, 40000.0]
+    assert table.tax(50000.0) == pytest.approx(5000.0)
+
+
+@pytest.mark.parametrize('brackets, message', [
+    ([], 'must start at 0'),
+    ([(100, 0), (1000, 10)], 'must start at 0'),
+    ([(0, 0), (1000, 10), (1000, 20)], 'Duplicate bracket lower bound'),
+    ([(0, 0), (1000, 101)], 'between 0 and 100'),
+    ([(0, -1)], 'between 0 and 100'),
+])
+def test_invalid_brackets_are_rejected(brackets, message):
+    with pytest.raises(ValueError, match=message):
+        TaxTable(2026, brackets)
+
+
+def test_effective_percentage_and_listing(table):
+    assert table.effective_percentage(40000.0) == 7.5
+    assert table.effective_percentage(0.0) == 0.0
+
+    listing = table.to_list()
+    assert listing[1] == {'lower_bound': 10000.0, 'upper_bound': 40000.0, 'tax_percentage': 10.0, 'tax_below': 0.0}
+    assert listing[-1]['upper_bound'] is None
+    assert listing[-1]['tax_below'] == 40000.0
+
+
+def test_table_falls_back_to_defaults_until_brackets_are_set(db):
+    assert get_tax_table(2026).source == 'default'
+
+    set_tax_brackets(2026, [(0, 0), (20000, 25)])
+    db.session.commit()
+
+    table = get_tax_table(2026)
+    assert table.source == 'configured'
+    assert table.tax(40000.0) == pytest.approx(5000.0)
+    assert get_tax_table(2025).source == 'default'
+
+
+@pytest.mark.parametrize('body', [
+    {'department_id': '1'},
+    {'department_id': 1.0},
+    {'department_id': True},
+    {'year': True},
+    {'periods': 0},
+])
+def test_withholding_rejects_bad_numbers(db, client, auth_header, body):
+    response = client.post('/tax/withholding', json=body, headers=auth_header(1, role='admin'))
+
+    assert response.status_code == 400
+
+
+def test_withholding_for_one_department(db, make_employee, department, client, auth_header):
+    included = make_employee(salary=40000.0)
+    make_employee(department_id=None)
+
+    response = client.post('/tax/withholding', json={'year': 2026, 'department_id': department.department_id},
+                           headers=auth_header(1, role='admin'))
+
+    assert response.status_code == 200
+    assert response.json['employees'] == [{'employee_id': included.employee_id, 'salary': 40000.0,
+                                           'tax_amount': 3000.0, 'tax_percentage': 7.5}]
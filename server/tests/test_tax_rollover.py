@@ -0,0 +1,48 @@
+from datetime import date
+from models import Tax
+from Services.tax_rollover import rollover_tax
+
+YEAR = 2026
+
+
+def tax_amounts(db):
+    return dict(db.session.query(Tax.employee_id, Tax.tax_amount).filter(Tax.year == YEAR))
+
+
+def test_first_rollover_creates_every_record(db, make_employee):
+    first = make_employee(salary=40000.0)
+    second = make_employee(salary=10000.0)
+    make_employee(hire_date=date(YEAR + 1, 1, 1))
+
+    summary = rollover_tax(YEAR, chunk_size=1)
+
+    assert summary == {'year': YEAR, 'brackets': 'default', 'employees': 2, 'created': 2, 'updated': 0,
+                       'skipped': 0, 'total_tax': 3000.0}
+    assert tax_amounts(db) == {first.employee_id: 3000.0, second.employee_id: 0.0}
+
+
+def test_rerun_counts_only_records_that_changed(db, make_employee):
+    changed = make_employee(salary=40000.0)
+    make_employee(salary=40000.0)
+    rollover_tax(YEAR)
+    db.session.query(Tax).filter_by(employee_id=changed.employee_id).update({'tax_amount': 1.0})
+    db.session.commit()
+
+    summary = rollover_tax(YEAR)
+
+    assert (summary['created'], summary['updated'], summary['skipped']) == (0, 1, 1)
+    assert summary['total_tax'] == 3000.0
+    assert tax_amounts(db)[changed.employee_id] == 3000.0
+
+
+def test_without_overwrite_existing_records_are_kept_and_not_summed(db, make_employee):
+    kept = make_employee(salary=40000.0)
+    new = make_employee(salary=50000.0)
+    db.session.add(Tax(employee_id=kept.employee_id, tax_percentage=1.0, tax_amount=1.0, year=YEAR))
+    db.session.commit()
+
+    summary = rollover_tax(YEAR, overwrite=False)
+
+    assert (summary['created'], summary['updated'], summary['skipped']) == (1, 0, 1)
+    assert summary['total_tax'] == 5000.0
+    assert tax_amounts(db) == {kept.employee_id: 1.0, new.employee_id: 5000.0}
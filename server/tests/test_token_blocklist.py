@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+import pytest
+from models import TokenBlacklist
+from Services.token_blocklist import TokenBlocklistCache
+
+
+@pytest.fixture
+def blocklist(app, tmp_path):
+    cache = TokenBlocklistCache()
+    cache.init_app(app)
+    cache.signal_file = str(tmp_path / 'signal')
+    return cache
+
+
+def add_revocation(db, jti, revoked_at, **fields):
+    db.session.add(TokenBlacklist(jti=jti, token=f'token-{jti}', revoked_at=revoked_at, **fields))
+    db.session.commit()
+
+
+def test_revocation_committed_out_of_order_is_picked_up(db, blocklist):
+    now = datetime.utcnow()
+    add_revocation(db, 'later', now, id=10)
+    assert blocklist.is_revoked('later')
+
+    # Given a lower id and timestamp in another worker, committed only after "later" was read
+    add_revocation(db, 'earlier', now - timedelta(seconds=5), id=5)
+    blocklist._touch_signal()
+
+    assert blocklist.is_revoked('earlier')
+
+
+def test_refresh_on_signal_and_timer(db, blocklist):
+    assert not blocklist.is_revoked('jti-1')
+
+    add_revocation(db, 'jti-1', datetime.utcnow())
+    blocklist.refresh_seconds = 0
+
+    assert blocklist.is_revoked('jti-1')
+
+
+def test_reload_skips_revocations_of_expired_tokens(db, app, blocklist):
+    retention = app.config['JWT_REFRESH_TOKEN_EXPIRES']
+    add_revocation(db, 'expired', datetime.utcnow() - retention - timedelta(days=1))
+    add_revocation(db, 'live', datetime.utcnow() - retention + timedelta(days=1))
+
+    assert blocklist.is_revoked('live')
+    assert 'expired' not in blocklist._jtis
+
+
+def test_revoke_is_seen_at_once(db, blocklist):
+    blocklist.revoke('mine', 'token-mine')
+
+    assert blocklist.is_revoked('mine')
+    assert db.session.query(TokenBlacklist.jti).scalar() == 'mine'